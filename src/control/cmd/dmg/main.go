@@ -1,5 +1,5 @@
 //
-// (C) Copyright 2018-2022 Intel Corporation.
+// (C) Copyright 2018-2023 Intel Corporation.
 //
 // SPDX-License-Identifier: BSD-2-Clause-Patent
 //
@@ -170,12 +170,17 @@ type cliOptions struct {
 	Telemetry      telemCmd       `command:"telemetry" alias:"telem" description:"Perform telemetry operations"`
 	firmwareOption                // build with tag "firmware" to enable
 	ManPage        cmdutil.ManCmd `command:"manpage" hidden:"true"`
+	Session        sessionCmd     `command:"session" hidden:"true" description:"Run dmg commands read from stdin in a single process"`
 }
 
 type versionCmd struct{}
 
 func (cmd *versionCmd) Execute(_ []string) error {
 	fmt.Printf("dmg version %s\n", build.DaosVersion)
+	if inSession {
+		// Exiting here would also end the enclosing session process.
+		return nil
+	}
 	os.Exit(0)
 	return nil
 }
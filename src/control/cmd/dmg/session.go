@@ -0,0 +1,127 @@
+//
+// (C) Copyright 2023 Intel Corporation.
+//
+// SPDX-License-Identifier: BSD-2-Clause-Patent
+//
+
+package main
+
+import (
+	"bufio"
+	"encoding/json"
+	"fmt"
+	"io"
+	"os"
+
+	flags "github.com/jessevdk/go-flags"
+	"github.com/pkg/errors"
+
+	"github.com/daos-stack/daos/src/control/lib/control"
+	"github.com/daos-stack/daos/src/control/logging"
+)
+
+// sessionEndMarker prefixes the line written to stdout after each command
+// executed in a session, followed by the JSON-encoded sessionResult.
+const sessionEndMarker = "DMG_SESSION_END "
+
+// maxSessionLine is the maximum length of a single session command line.
+const maxSessionLine = 1 << 20
+
+type sessionResult struct {
+	ExitStatus int     `json:"exit_status"`
+	Error      *string `json:"error"`
+}
+
+// sessionCmd is a hidden command used by test harnesses to run many dmg
+// commands from a single long-lived process. Each line read from stdin is a
+// JSON array of dmg arguments (excluding the dmg binary). The command output
+// is written to stdout followed by a single line containing sessionEndMarker
+// and the command's exit status. The control client is shared by all commands
+// in the session so that gRPC connections are reused.
+type sessionCmd struct {
+	baseCmd
+	in  io.Reader
+	out io.Writer
+}
+
+var inSession bool
+
+func (cmd *sessionCmd) Execute(_ []string) error {
+	if inSession {
+		return errors.New("a dmg session cannot be started from within a session")
+	}
+	inSession = true
+	defer func() { inSession = false }()
+
+	if cmd.in == nil {
+		cmd.in = os.Stdin
+	}
+	if cmd.out == nil {
+		cmd.out = os.Stdout
+	}
+
+	invoker := control.NewClient(
+		control.WithClientLogger(cmd.Logger),
+		control.WithConnectionReuse(),
+	)
+	defer invoker.Close()
+
+	scanner := bufio.NewScanner(cmd.in)
+	scanner.Buffer(make([]byte, 0, 64*1024), maxSessionLine)
+	for scanner.Scan() {
+		if len(scanner.Bytes()) == 0 {
+			continue
+		}
+
+		var args []string
+		err := json.Unmarshal(scanner.Bytes(), &args)
+		if err == nil {
+			err = runSessionCommand(args, invoker)
+		} else {
+			err = errors.Wrap(err, "invalid session command line")
+		}
+
+		if err := cmd.writeResult(err); err != nil {
+			return err
+		}
+	}
+
+	return scanner.Err()
+}
+
+// runSessionCommand parses and executes a single dmg command using a fresh set
+// of options and logger, as if it were run as a separate dmg process.
+func runSessionCommand(args []string, invoker control.Invoker) error {
+	var opts cliOptions
+	log := logging.NewCommandLineLogger()
+
+	err := parseOpts(args, &opts, invoker, log)
+	if fe, ok := errors.Cause(err).(*flags.Error); ok && fe.Type == flags.ErrHelp {
+		log.Info(fe.Error())
+		return nil
+	}
+	if err != nil {
+		log.Errorf("dmg: %v", err)
+	}
+
+	return err
+}
+
+func (cmd *sessionCmd) writeResult(cmdErr error) error {
+	result := sessionResult{}
+	if cmdErr != nil {
+		result.ExitStatus = 1
+		result.Error = new(string)
+		*result.Error = cmdErr.Error()
+	}
+
+	data, err := json.Marshal(result)
+	if err != nil {
+		return errors.Wrap(err, "unable to marshal session result")
+	}
+	if _, err := fmt.Fprintf(cmd.out, "%s%s\n", sessionEndMarker, data); err != nil {
+		return errors.Wrap(err, "unable to write session result")
+	}
+
+	return nil
+}
@@ -0,0 +1,94 @@
+//
+// (C) Copyright 2023 Intel Corporation.
+//
+// SPDX-License-Identifier: BSD-2-Clause-Patent
+//
+
+package main
+
+import (
+	"bytes"
+	"encoding/json"
+	"strings"
+	"testing"
+
+	"github.com/google/go-cmp/cmp"
+
+	"github.com/daos-stack/daos/src/control/common/test"
+	"github.com/daos-stack/daos/src/control/logging"
+)
+
+func TestDmg_SessionCmd(t *testing.T) {
+	for name, tc := range map[string]struct {
+		input     string
+		expStatus []int
+	}{
+		"no commands": {
+			input:     "",
+			expStatus: []int{},
+		},
+		"blank lines skipped": {
+			input:     "\n\n",
+			expStatus: []int{},
+		},
+		"invalid command line": {
+			input:     "pool query\n",
+			expStatus: []int{1},
+		},
+		"help": {
+			input:     `["--help"]` + "\n",
+			expStatus: []int{0},
+		},
+		"missing argument": {
+			input:     `["pool", "query"]` + "\n",
+			expStatus: []int{1},
+		},
+		"nested session": {
+			input:     `["session"]` + "\n",
+			expStatus: []int{1},
+		},
+		"version does not end session": {
+			input:     `["-i", "version"]` + "\n" + `["--help"]` + "\n",
+			expStatus: []int{0, 0},
+		},
+		"multiple commands": {
+			input:     `["--help"]` + "\n" + `["pool", "query"]` + "\n" + `["--help"]` + "\n",
+			expStatus: []int{0, 1, 0},
+		},
+	} {
+		t.Run(name, func(t *testing.T) {
+			log, buf := logging.NewTestLogger(t.Name())
+			defer test.ShowBufferOnFailure(t, buf)
+
+			out := &bytes.Buffer{}
+			cmd := &sessionCmd{
+				in:  strings.NewReader(tc.input),
+				out: out,
+			}
+			cmd.SetLog(log)
+
+			if err := cmd.Execute(nil); err != nil {
+				t.Fatal(err)
+			}
+
+			gotStatus := []int{}
+			for _, line := range strings.Split(out.String(), "\n") {
+				if !strings.HasPrefix(line, sessionEndMarker) {
+					continue
+				}
+				var result sessionResult
+				if err := json.Unmarshal([]byte(strings.TrimPrefix(line, sessionEndMarker)), &result); err != nil {
+					t.Fatal(err)
+				}
+				if (result.ExitStatus == 0) != (result.Error == nil) {
+					t.Fatalf("unexpected error for exit status %d: %v", result.ExitStatus, result.Error)
+				}
+				gotStatus = append(gotStatus, result.ExitStatus)
+			}
+
+			if diff := cmp.Diff(tc.expStatus, gotStatus); diff != "" {
+				t.Fatalf("unexpected exit statuses (-want, +got):\n%s\n", diff)
+			}
+		})
+	}
+}
@@ -1,5 +1,5 @@
 //
-// (C) Copyright 2020-2022 Intel Corporation.
+// (C) Copyright 2020-2023 Intel Corporation.
 //
 // SPDX-License-Identifier: BSD-2-Clause-Patent
 //
@@ -122,6 +122,13 @@ type (
 	Client struct {
 		config *Config
 		log    debugLogger
+		conns  *connCache
+	}
+
+	// connCache holds gRPC client connections for reuse between requests.
+	connCache struct {
+		sync.Mutex
+		conns map[string]*grpc.ClientConn
 	}
 
 	// ClientOption defines the signature for functional Client options.
@@ -142,6 +149,14 @@ func WithConfig(cfg *Config) ClientOption {
 	}
 }
 
+// WithConnectionReuse enables the reuse of gRPC connections to each host
+// between requests. Connections are held open until the client is closed.
+func WithConnectionReuse() ClientOption {
+	return func(c *Client) {
+		c.conns = &connCache{conns: make(map[string]*grpc.ClientConn)}
+	}
+}
+
 // NewClient returns an initialized Client with its
 // parameters set by the provided ClientOption list.
 func NewClient(opts ...ClientOption) *Client {
@@ -172,9 +187,88 @@ func DefaultClient() *Client {
 // SetConfig sets the client configuration for an
 // existing Client.
 func (c *Client) SetConfig(cfg *Config) {
+	if c.conns != nil && !sameTransport(c.config, cfg) {
+		c.closeConns()
+	}
 	c.config = cfg
 }
 
+// Close releases any gRPC connections held open for reuse.
+func (c *Client) Close() {
+	if c.conns != nil {
+		c.closeConns()
+	}
+}
+
+// sameTransport returns true if both configurations would result in the same
+// gRPC transport credentials.
+func sameTransport(a, b *Config) bool {
+	if a == nil || b == nil || a.TransportConfig == nil || b.TransportConfig == nil {
+		return a == b
+	}
+	ta, tb := a.TransportConfig, b.TransportConfig
+	return ta.AllowInsecure == tb.AllowInsecure &&
+		ta.ServerName == tb.ServerName &&
+		ta.CARootPath == tb.CARootPath &&
+		ta.CertificatePath == tb.CertificatePath &&
+		ta.PrivateKeyPath == tb.PrivateKeyPath
+}
+
+func (c *Client) closeConns() {
+	c.conns.Lock()
+	defer c.conns.Unlock()
+
+	for addr, conn := range c.conns.conns {
+		conn.Close()
+		delete(c.conns.conns, addr)
+	}
+}
+
+// getConn returns a gRPC connection to the given host, along with a function
+// that must be called with the result of the RPC once the connection is no
+// longer needed. Connections are reused between requests if enabled.
+func (c *Client) getConn(ctx context.Context, hostAddr string) (*grpc.ClientConn, func(error), error) {
+	opts, err := c.dialOptions()
+	if err != nil {
+		return nil, nil, err
+	}
+
+	if c.conns == nil {
+		conn, err := grpc.DialContext(ctx, hostAddr, opts...)
+		if err != nil {
+			return nil, nil, err
+		}
+		return conn, func(error) { conn.Close() }, nil
+	}
+
+	c.conns.Lock()
+	defer c.conns.Unlock()
+
+	conn, found := c.conns.conns[hostAddr]
+	if !found {
+		// The connection outlives this request, so don't tie it to the
+		// request context.
+		conn, err = grpc.DialContext(context.Background(), hostAddr, opts...)
+		if err != nil {
+			return nil, nil, err
+		}
+		c.conns.conns[hostAddr] = conn
+	}
+
+	return conn, func(rpcErr error) {
+		if rpcErr == nil {
+			return
+		}
+		// Don't reuse a connection that may be in a bad state.
+		c.conns.Lock()
+		defer c.conns.Unlock()
+		if c.conns.conns[hostAddr] == conn {
+			delete(c.conns.conns, hostAddr)
+		}
+		conn.Close()
+	}, nil
+}
+
 // GetConfig retrieves the system name from the client configuration and
 // implements the sysGetter interface.
 func (c *Client) GetSystem() string {
@@ -269,14 +363,10 @@ func (c *Client) InvokeUnaryRPCAsync(parent context.Context, req UnaryRequest) (
 			wg.Add(1)
 			go func(hostAddr string) {
 				var msg proto.Message
-				opts, err := c.dialOptions()
+				conn, release, err := c.getConn(ctx, hostAddr)
 				if err == nil {
-					var conn *grpc.ClientConn
-					conn, err = grpc.DialContext(ctx, hostAddr, opts...)
-					if err == nil {
-						msg, err = req.getRPC()(ctx, conn)
-						conn.Close()
-					}
+					msg, err = req.getRPC()(ctx, conn)
+					release(err)
 				}
 
 				select {
@@ -1,5 +1,5 @@
 //
-// (C) Copyright 2020-2022 Intel Corporation.
+// (C) Copyright 2020-2023 Intel Corporation.
 //
 // SPDX-License-Identifier: BSD-2-Clause-Patent
 //
@@ -536,3 +536,220 @@ func TestControl_InvokeUnaryRPC(t *testing.T) {
 		})
 	}
 }
+
+func TestControl_sameTransport(t *testing.T) {
+	insecureCfg := func() *Config {
+		cfg := DefaultConfig()
+		cfg.TransportConfig.AllowInsecure = true
+		return cfg
+	}
+	noTransportCfg := &Config{}
+
+	for name, tc := range map[string]struct {
+		a       *Config
+		b       *Config
+		expSame bool
+	}{
+		"both nil": {
+			expSame: true,
+		},
+		"one nil": {
+			a: DefaultConfig(),
+		},
+		"same config without transport": {
+			a:       noTransportCfg,
+			b:       noTransportCfg,
+			expSame: true,
+		},
+		"different configs without transport": {
+			a: &Config{},
+			b: &Config{},
+		},
+		"one without transport": {
+			a: DefaultConfig(),
+			b: &Config{},
+		},
+		"same transport": {
+			a:       DefaultConfig(),
+			b:       DefaultConfig(),
+			expSame: true,
+		},
+		"same transport, different hosts": {
+			a: DefaultConfig(),
+			b: func() *Config {
+				cfg := DefaultConfig()
+				cfg.HostList = []string{"host1:10001"}
+				return cfg
+			}(),
+			expSame: true,
+		},
+		"insecure mismatch": {
+			a: DefaultConfig(),
+			b: insecureCfg(),
+		},
+		"certificate mismatch": {
+			a: DefaultConfig(),
+			b: func() *Config {
+				cfg := DefaultConfig()
+				cfg.TransportConfig.CertificatePath = "/other/admin.crt"
+				return cfg
+			}(),
+		},
+		"server name mismatch": {
+			a: DefaultConfig(),
+			b: func() *Config {
+				cfg := DefaultConfig()
+				cfg.TransportConfig.ServerName = "other"
+				return cfg
+			}(),
+		},
+	} {
+		t.Run(name, func(t *testing.T) {
+			if got := sameTransport(tc.a, tc.b); got != tc.expSame {
+				t.Fatalf("expected sameTransport() to be %t, got %t", tc.expSame, got)
+			}
+		})
+	}
+}
+
+func TestControl_Client_getConn(t *testing.T) {
+	clientCfg := DefaultConfig()
+	clientCfg.TransportConfig.AllowInsecure = true
+
+	getConn := func(t *testing.T, client *Client, addr string) (*grpc.ClientConn, func(error)) {
+		t.Helper()
+		conn, release, err := client.getConn(context.Background(), addr)
+		if err != nil {
+			t.Fatal(err)
+		}
+		return conn, release
+	}
+	cacheLen := func(client *Client) int {
+		client.conns.Lock()
+		defer client.conns.Unlock()
+		return len(client.conns.conns)
+	}
+
+	t.Run("no reuse", func(t *testing.T) {
+		client := NewClient(WithConfig(clientCfg))
+		conn1, release1 := getConn(t, client, "127.0.0.1:1")
+		release1(nil)
+		conn2, release2 := getConn(t, client, "127.0.0.1:1")
+		defer release2(nil)
+
+		if conn1 == conn2 {
+			t.Fatal("expected a new connection for each request")
+		}
+		if client.conns != nil {
+			t.Fatal("unexpected connection cache")
+		}
+	})
+
+	t.Run("cache hit", func(t *testing.T) {
+		client := NewClient(WithConfig(clientCfg), WithConnectionReuse())
+		defer client.Close()
+
+		conn1, release1 := getConn(t, client, "127.0.0.1:1")
+		release1(nil)
+		conn2, release2 := getConn(t, client, "127.0.0.1:1")
+		release2(nil)
+		if conn1 != conn2 {
+			t.Fatal("expected the connection to be reused")
+		}
+
+		conn3, release3 := getConn(t, client, "127.0.0.1:2")
+		release3(nil)
+		if conn3 == conn1 {
+			t.Fatal("expected a different connection for a different host")
+		}
+		if cacheLen(client) != 2 {
+			t.Fatalf("expected 2 cached connections, got %d", cacheLen(client))
+		}
+
+		client.Close()
+		if cacheLen(client) != 0 {
+			t.Fatalf("expected no cached connections after Close(), got %d", cacheLen(client))
+		}
+	})
+
+	t.Run("not reused after error", func(t *testing.T) {
+		client := NewClient(WithConfig(clientCfg), WithConnectionReuse())
+		defer client.Close()
+
+		conn1, release1 := getConn(t, client, "127.0.0.1:1")
+		release1(errors.New("rpc failed"))
+		if cacheLen(client) != 0 {
+			t.Fatal("expected the failed connection to be dropped")
+		}
+
+		conn2, release2 := getConn(t, client, "127.0.0.1:1")
+		release2(nil)
+		if conn1 == conn2 {
+			t.Fatal("expected a new connection after an error")
+		}
+	})
+
+	t.Run("transport mismatch", func(t *testing.T) {
+		client := NewClient(WithConfig(clientCfg), WithConnectionReuse())
+		defer client.Close()
+
+		conn1, release1 := getConn(t, client, "127.0.0.1:1")
+		release1(nil)
+
+		sameCfg := DefaultConfig()
+		sameCfg.TransportConfig.AllowInsecure = true
+		sameCfg.HostList = []string{"127.0.0.1:1"}
+		client.SetConfig(sameCfg)
+		conn2, release2 := getConn(t, client, "127.0.0.1:1")
+		release2(nil)
+		if conn1 != conn2 {
+			t.Fatal("expected the connection to be reused with the same transport")
+		}
+
+		otherCfg := DefaultConfig()
+		otherCfg.TransportConfig.AllowInsecure = true
+		otherCfg.TransportConfig.ServerName = "other"
+		client.SetConfig(otherCfg)
+		if cacheLen(client) != 0 {
+			t.Fatal("expected cached connections to be closed on transport change")
+		}
+		conn3, release3 := getConn(t, client, "127.0.0.1:1")
+		release3(nil)
+		if conn3 == conn1 {
+			t.Fatal("expected a new connection with a different transport")
+		}
+	})
+}
+
+func TestControl_InvokeUnaryRPC_ConnectionReuse(t *testing.T) {
+	clientCfg := DefaultConfig()
+	clientCfg.TransportConfig.AllowInsecure = true
+
+	log, buf := logging.NewTestLogger(t.Name())
+	defer test.ShowBufferOnFailure(t, buf)
+
+	client := NewClient(
+		WithClientLogger(log),
+		WithConfig(clientCfg),
+		WithConnectionReuse(),
+	)
+	defer client.Close()
+
+	var conns []*grpc.ClientConn
+	req := &testRequest{
+		HostList: []string{"127.0.0.1:1"},
+		rpcFn: func(_ context.Context, cc *grpc.ClientConn) (proto.Message, error) {
+			conns = append(conns, cc)
+			return defaultMessage, nil
+		},
+	}
+	for i := 0; i < 2; i++ {
+		if _, err := client.InvokeUnaryRPC(context.Background(), req); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	if len(conns) != 2 || conns[0] != conns[1] {
+		t.Fatalf("expected both requests to use the same connection, got %v", conns)
+	}
+}
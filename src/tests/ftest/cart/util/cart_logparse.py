@@ -96,13 +96,13 @@ class LogLine():
         pid = pidtid.split("/")
         self.pid = int(pid[0])
         self._preamble = line[:idx]
+        self.ts = fields[0]
         self.fac = fields[3]
         try:
             self.level = LOG_LEVELS[fields[4]]
         except KeyError as error:
             raise InvalidLogFile(fields[4]) from error
 
-        # self.time_stamp = fields[0]
         self._fields = fields[5:]
         try:
             if self._fields[1][-2:] == '()':
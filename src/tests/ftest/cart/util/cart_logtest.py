@@ -6,10 +6,15 @@
 
 """This provides consistency checking for CaRT log files."""
 
+import os
 import re
 import sys
 import time
+import heapq
 import argparse
+import functools
+import contextlib
+import multiprocessing
 from collections import OrderedDict, Counter
 
 import cart_logparse
@@ -69,12 +74,23 @@ class RegionContig():
         return self.start == other.start and self.end == other.end
 
 
+@functools.lru_cache(maxsize=1024)
+def _seconds_to_float(seconds):
+    return time.mktime(time.strptime(seconds, '%m/%d-%H:%M:%S'))
+
+
 def _ts_to_float(times):
-    int_part = time.mktime(time.strptime(times[:-3], '%m/%d-%H:%M:%S'))
+    # Parsing the date is slow, so cache it as consecutive lines mostly share the same second.
+    int_part = _seconds_to_float(times[:-3])
     float_part = int(times[-2:]) / 100
     return int_part + float_part
 
 
+def _percentile(samples, pct):
+    """Return a percentile of a sorted list"""
+    return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+
 class RegionCounter():
     """Class to represent regions read/written to a file"""
 
@@ -205,14 +221,89 @@ class HwmCounter():
         self.__val -= val
 
 
+class LogAnalyzer():
+    """Base class for log analyzers
+
+    Analyzers are passed every line of a log, one pid at a time, during the single pass over the
+    log made by LogTest.check_log_file() or LogTest.run_analyzers(), so adding analyzers does not
+    add passes over the log.
+    """
+
+    def start_pid(self, pid):
+        """Called before the first line from a pid"""
+
+    def add_line(self, line):
+        """Called for each line from the current pid"""
+
+    def end_pid(self, pid):
+        """Called after the last line from a pid"""
+
+
+class FunctionTracker(LogAnalyzer):
+    """Record the set of functions which have logged"""
+
+    def __init__(self):
+        self.functions = set()
+
+    def add_line(self, line):
+        """Record the function which logged the line"""
+        try:
+            self.functions.add(line.function)
+        except AttributeError:
+            pass
+
+
+class DfuseIoAnalyzer(LogAnalyzer):
+    """Summarise dfuse I/O by client process"""
+
+    def __init__(self):
+        self._client_pids = OrderedDict()
+
+    def start_pid(self, pid):
+        """Reset the summary for a new pid"""
+        self._client_pids = OrderedDict()
+
+    def add_line(self, line):
+        """Add a dfuse read to the summary"""
+        try:
+            if line.filename != 'src/client/dfuse/ops/read.c':
+                return
+        except AttributeError:
+            return
+        if line.get_field(3) != 'requested':
+            show_line(line, line.mask, "Extra output")
+            return
+        reg = line.re_region.fullmatch(line.get_field(2))
+        start = int(reg.group(1), base=16)
+        end = int(reg.group(2), base=16)
+        reg = line.re_pid.fullmatch(line.get_field(4))
+
+        cpid = reg.group(1)
+
+        if cpid not in self._client_pids:
+            self._client_pids[cpid] = RegionCounter(start, end, line.ts)
+        else:
+            self._client_pids[cpid].add(start, end, line.ts)
+
+    def end_pid(self, pid):
+        """Print the summary"""
+        for (cpid, regions) in self._client_pids.items():
+            print('{}:{}'.format(cpid, regions))
+
+
 # pylint: disable=too-many-statements
 # pylint: disable=too-many-locals
 class LogTest():
-    """Log testing"""
+    """Log testing
+
+    In addition to the consistency checks made by check_log_file() any number of LogAnalyzer
+    objects can be passed in, each of which will see every line of the log.
+    """
 
-    def __init__(self, log_iter, quiet=False):
+    def __init__(self, log_iter, quiet=False, analyzers=None):
         self.quiet = quiet
         self._li = log_iter
+        self.analyzers = list(analyzers or [])
         self.hide_fi_calls = False
         self.fi_triggered = False
         self.fi_location = None
@@ -269,48 +360,48 @@ class LogTest():
     def check_log_file(self, abort_on_warning, show_memleaks=True, leak_wf=None):
         """Check a single log file for consistency"""
         to_raise = None
+        analyzers = list(self.analyzers)
+        if not self.quiet:
+            analyzers.append(RpcReporting())
         for pid in self._li.get_pids():
             if wf:
                 wf.reset_pending()
+            for analyzer in analyzers:
+                analyzer.start_pid(pid)
             try:
-                self._check_pid_from_log_file(pid, abort_on_warning, leak_wf,
+                self._check_pid_from_log_file(pid, abort_on_warning, leak_wf, analyzers,
                                               show_memleaks=show_memleaks)
             except LogCheckError as error:
                 if to_raise is None:
                     to_raise = error
+            finally:
+                for analyzer in analyzers:
+                    analyzer.end_pid(pid)
         self.show_common_logs()
         if to_raise:
             raise to_raise
 
-    def check_dfuse_io(self):
-        """Parse dfuse i/o"""
+    def run_analyzers(self, analyzers=None):
+        """Pass every line of the log to the analyzers, without checking the log"""
+        if analyzers is None:
+            analyzers = self.analyzers
         for pid in self._li.get_pids():
-
-            client_pids = OrderedDict()
+            for analyzer in analyzers:
+                analyzer.start_pid(pid)
             for line in self._li.new_iter(pid=pid):
                 self.save_log_line(line)
-                if line.filename != 'src/client/dfuse/ops/read.c':
-                    continue
-                if line.get_field(3) != 'requested':
-                    show_line(line, line.mask, "Extra output")
-                    continue
-                reg = line.re_region.fullmatch(line.get_field(2))
-                start = int(reg.group(1), base=16)
-                end = int(reg.group(2), base=16)
-                reg = line.re_pid.fullmatch(line.get_field(4))
-
-                pid = reg.group(1)
-
-                if pid not in client_pids:
-                    client_pids[pid] = RegionCounter(start, end, line.ts)
-                else:
-                    client_pids[pid].add(start, end, line.ts)
+                for analyzer in analyzers:
+                    analyzer.add_line(line)
+            for analyzer in analyzers:
+                analyzer.end_pid(pid)
 
-            for cpid in client_pids:
-                print('{}:{}'.format(cpid, client_pids[pid]))
+    def check_dfuse_io(self):
+        """Parse dfuse i/o"""
+        self.run_analyzers([DfuseIoAnalyzer()])
 
     # pylint: disable=too-many-branches,too-many-nested-blocks
-    def _check_pid_from_log_file(self, pid, abort_on_warning, leak_wf, show_memleaks=True):
+    def _check_pid_from_log_file(self, pid, abort_on_warning, leak_wf, analyzers,
+                                 show_memleaks=True):
         """Check a pid from a single log file for consistency"""
         # Dict of active descriptors.
         active_desc = OrderedDict()
@@ -336,14 +427,9 @@ class LogTest():
         trace_lines = 0
         non_trace_lines = 0
 
-        if self.quiet:
-            rpc_r = None
-        else:
-            rpc_r = RpcReporting()
-
         for line in self._li.new_iter(pid=pid, stateful=True):
-            if rpc_r:
-                rpc_r.add_line(line)
+            for analyzer in analyzers:
+                analyzer.add_line(line)
             self.save_log_line(line)
             try:
                 msg = ''.join(line._fields[2:])
@@ -523,8 +609,6 @@ class LogTest():
                             err_count += 1
 
         del active_desc['root']
-        if rpc_r:
-            rpc_r.report()
 
         # This isn't currently used anyway.
         # if not have_debug:
@@ -574,8 +658,20 @@ class LogTest():
 # pylint: enable=too-many-branches,too-many-nested-blocks
 
 
-class RpcReporting():
-    """Class for reporting a summary of RPC states"""
+class RpcReporting(LogAnalyzer):
+    """Class for reporting a summary of RPC states and latencies
+
+    Latencies are measured from the log timestamps of each state change of an RPC, so have the
+    same 10ms resolution as the log.
+    """
+
+    # Latencies reported, as (name, start state, end state).
+    latency_names = (('submit-sent', 'SUBMITTED', 'SENT'),
+                     ('sent-completed', 'SENT', 'COMPLETED'),
+                     ('total', 'SUBMITTED', 'COMPLETED'))
+
+    # Number of the slowest RPCs to report.
+    slowest_count = 10
 
     known_functions = frozenset({'crt_hg_req_send',
                                  'crt_hg_req_destroy',
@@ -591,6 +687,26 @@ class RpcReporting():
         self._c_states = {}
         self._c_state_names = set()
         self._current_opcodes = {}
+        # Timestamps of each state change, indexed by descriptor.
+        self._rpc_times = {}
+        # Lists of latencies, indexed by opcode and then latency name.
+        self._latencies = {}
+        # Heap of the slowest RPCs, as (total latency, opcode, descriptor, allocation time).
+        self._slowest = []
+
+    def start_pid(self, pid):
+        """Reset the counters for a new pid"""
+        self._op_state_counters = {}
+        self._c_states = {}
+        self._c_state_names = set()
+        self._current_opcodes = {}
+        self._rpc_times = {}
+        self._latencies = {}
+        self._slowest = []
+
+    def end_pid(self, pid):
+        """Report the counters for the pid"""
+        self.report()
 
     def add_line(self, line):
         """Parse a output line"""
@@ -629,10 +745,15 @@ class RpcReporting():
 
         if rpc_state == 'ALLOCATED':
             self._current_opcodes[rpc] = opcode
+            self._rpc_times[rpc] = {'ALLOCATED': line.ts}
         else:
             opcode = self._current_opcodes[rpc]
+            self._rpc_times[rpc][rpc_state] = line.ts
+        if rpc_state == 'COMPLETED':
+            self._add_latencies(rpc, opcode)
         if rpc_state == 'DEALLOCATED':
             del self._current_opcodes[rpc]
+            del self._rpc_times[rpc]
 
         if opcode not in self._op_state_counters:
             self._op_state_counters[opcode] = {'ALLOCATED': 0,
@@ -642,6 +763,53 @@ class RpcReporting():
                                                'SUBMITTED': 0}
         self._op_state_counters[opcode][rpc_state] += 1
 
+    def _add_latencies(self, rpc, opcode):
+        """Record the latencies of a completed RPC"""
+        times = self._rpc_times[rpc]
+        latencies = self._latencies.setdefault(opcode, {})
+        for (name, start, end) in self.latency_names:
+            if start in times and end in times:
+                latency = _ts_to_float(times[end]) - _ts_to_float(times[start])
+                latencies.setdefault(name, []).append(latency)
+                if name == 'total':
+                    entry = (latency, opcode, rpc, times['ALLOCATED'])
+                    if len(self._slowest) < self.slowest_count:
+                        heapq.heappush(self._slowest, entry)
+                    else:
+                        heapq.heappushpop(self._slowest, entry)
+
+    def report_latency(self):
+        """Print latency percentiles for each opcode, and the slowest RPCs, to stdout"""
+        if not self._latencies:
+            return
+
+        headers = ['OPCODE', 'COUNT']
+        for (name, _, _) in self.latency_names:
+            headers.extend(['{} p50'.format(name), 'p99', 'max'])
+
+        table = []
+        for (opcode, latencies) in sorted(self._latencies.items()):
+            row = [opcode, max(len(samples) for samples in latencies.values())]
+            for (name, _, _) in self.latency_names:
+                samples = sorted(latencies.get(name, []))
+                if samples:
+                    row.extend(['{:.2f}'.format(_percentile(samples, 50)),
+                                '{:.2f}'.format(_percentile(samples, 99)),
+                                '{:.2f}'.format(samples[-1])])
+                else:
+                    row.extend(['', '', ''])
+            table.append(row)
+
+        slowest = [[opcode, rpc, allocated, '{:.2f}'.format(latency)]
+                   for (latency, opcode, rpc, allocated) in sorted(self._slowest, reverse=True)]
+
+        if HAVE_TABULATE:
+            print('Opcode Latency (seconds)')
+            print(tabulate.tabulate(table, headers=headers, stralign='right'))
+            print('Slowest RPCs')
+            print(tabulate.tabulate(slowest, headers=['OPCODE', 'DESCRIPTOR', 'ALLOCATED',
+                                                      'TOTAL']))
+
     def report(self):
         """Print report to stdout"""
         if not bool(self._op_state_counters):
@@ -691,16 +859,17 @@ class RpcReporting():
         for error in errors:
             print(error)
 
+        self.report_latency()
 
-def run():
-    """Trace a single file"""
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--dfuse', help='Summarise dfuse I/O', action='store_true')
-    parser.add_argument('--warnings', action='store_true')
-    parser.add_argument('file', help='input file')
-    args = parser.parse_args()
+
+def check_file(filename, dfuse=False, warnings=False):
+    """Trace a single file
+
+    Returns:
+        bool: True if the file is corrupt.
+    """
     try:
-        log_iter = cart_logparse.LogIter(args.file)
+        log_iter = cart_logparse.LogIter(filename)
     except UnicodeDecodeError:
         # If there is a unicode error in the log file then retry with checks
         # enabled which should both report the error and run in latin-1 so
@@ -710,18 +879,65 @@ def run():
         # The only possible danger here is the file is simply too big to check
         # the encoding on, in which case this second attempt would fail with
         # an out-of-memory error.
-        log_iter = cart_logparse.LogIter(args.file, check_encoding=True)
-    test_iter = LogTest(log_iter)
-    if args.dfuse:
-        test_iter.check_dfuse_io()
-    else:
-        try:
-            test_iter.check_log_file(args.warnings)
-        except LogError:
-            print('Errors in log file, ignoring')
-        except NotAllFreed:
-            print('Memory leaks, ignoring')
-    if log_iter.file_corrupt:
+        log_iter = cart_logparse.LogIter(filename, check_encoding=True)
+    analyzers = []
+    if dfuse:
+        analyzers.append(DfuseIoAnalyzer())
+    test_iter = LogTest(log_iter, analyzers=analyzers)
+    try:
+        test_iter.check_log_file(warnings)
+    except LogError:
+        print('Errors in log file, ignoring')
+    except NotAllFreed:
+        print('Memory leaks, ignoring')
+    return log_iter.file_corrupt
+
+
+def _check_file_to_output(args):
+    """Trace a single file, saving the output alongside it
+
+    Used as the worker function when checking multiple files in parallel.
+    """
+    (filename, suffix, dfuse, warnings) = args
+    with open(f'{filename}{suffix}', 'w') as output:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                return check_file(filename, dfuse, warnings)
+            except Exception as error:  # pylint: disable=broad-except
+                print(f'Error checking {filename}: {error}')
+                return True
+
+
+def run():
+    """Trace one or more files
+
+    If more than one file is given, or an output suffix is set, then the files are checked in
+    parallel and the output for each saved to a file named after it.  This allows checking all
+    the log files for a test from a single process rather than starting one per file.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dfuse', action='store_true',
+                        help='Summarise dfuse I/O, as well as checking the log')
+    parser.add_argument('--warnings', action='store_true')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of files to check in parallel, 0 for one per cpu')
+    parser.add_argument('--output-suffix', default=None,
+                        help='Save the output for each file to a file with this suffix added')
+    parser.add_argument('file', nargs='+', help='input file')
+    args = parser.parse_args()
+
+    if len(args.file) == 1 and not args.output_suffix:
+        if check_file(args.file[0], args.dfuse, args.warnings):
+            sys.exit(1)
+        return
+
+    suffix = args.output_suffix or '.cart_logtest'
+    jobs = args.jobs or os.cpu_count()
+    work = [(filename, suffix, args.dfuse, args.warnings) for filename in args.file]
+    with multiprocessing.Pool(min(jobs, len(work))) as pool:
+        # Files are given to the workers one at a time so that a large file does not hold up others.
+        corrupt = pool.map(_check_file_to_output, work, chunksize=1)
+    if any(corrupt):
         sys.exit(1)
 
 
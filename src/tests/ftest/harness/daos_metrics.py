@@ -0,0 +1,64 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+from apricot import TestWithoutServers
+
+from daos_metrics_utils import parse_daos_metrics, get_daos_metrics_delta, \
+    get_daos_metrics_summary
+
+POOL = "5d4d6a05-bbb0-4aa6-a0d3-4b3d2a8c6bbb"
+
+# daos_metrics --csv output of an engine before and after some I/O
+BEFORE = [
+    "name,value,min,max,mean,sample_size,std_dev",
+    "ID: 0/started_at,1696000000",
+    "ID: 0/pool/{}/ops/update,10".format(POOL),
+    "ID: 0/pool/{}/ops/fetch,5".format(POOL),
+    "ID: 0/pool/{}/xferred/update,1048576".format(POOL),
+    "ID: 0/io/latency/update/128KB/tgt_0,120,100,150,125.000000,4,20.000000",
+    "ID: 0/io/latency/update/128KB/tgt_1,110,100,130,115.000000,2,",
+]
+AFTER = [
+    "name,value,min,max,mean,sample_size,std_dev",
+    "ID: 0/started_at,1696000000",
+    "ID: 0/pool/{}/ops/update,110".format(POOL),
+    "ID: 0/pool/{}/ops/fetch,25".format(POOL),
+    "ID: 0/pool/{}/xferred/update,3145728".format(POOL),
+    "ID: 0/io/latency/update/128KB/tgt_0,120,100,150,125.000000,24,20.000000",
+    "ID: 0/io/latency/update/128KB/tgt_1,110,100,130,115.000000,52,30.000000",
+]
+
+
+class HarnessDaosMetricsTest(TestWithoutServers):
+    """Harness daos_metrics parsing test cases.
+
+    :avocado: recursive
+    """
+
+    def test_daos_metrics_summary(self):
+        """Verify the engine load and hot targets of real format daos_metrics --csv output.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessDaosMetricsTest,test_daos_metrics_summary
+        """
+        before = parse_daos_metrics(BEFORE)
+        self.assertEqual(before["pool/{}/ops/update".format(POOL)], (10.0, None))
+        self.assertEqual(before["io/latency/update/128KB/tgt_0"], (120.0, 4))
+        self.assertNotIn("name", before)
+
+        delta = get_daos_metrics_delta(
+            {("host1", 0): before, ("host2", 0): before},
+            {("host1", 0): parse_daos_metrics(AFTER), ("host2", 0): before})
+        self.assertNotIn("started_at", delta[("host1", 0)])
+
+        summary = get_daos_metrics_summary(delta)
+        self.log.info("daos_metrics summary: %s", summary)
+        self.assertEqual(summary["engines"]["host1/0"], {"ops": 120.0, "xferred": 2097152.0})
+        self.assertEqual(summary["engines"]["host2/0"], {"ops": 0.0, "xferred": 0.0})
+        self.assertEqual(summary["imbalance"], {"ops": 2.0, "xferred": 2.0})
+        self.assertEqual(
+            summary["hot_targets"], [("host1/0/tgt_1", 50), ("host1/0/tgt_0", 20)])
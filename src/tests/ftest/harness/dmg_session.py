@@ -0,0 +1,81 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import os
+
+from apricot import TestWithoutServers
+
+from dmg_utils import DmgCommand
+from exception_utils import CommandFailure
+
+# Stub dmg command implementing the 'dmg session' protocol: each stdin line is a JSON list of dmg
+# arguments, whose output is followed by a DMG_SESSION_END line with the exit status.
+STUB_DMG = """#!/usr/bin/env python3
+import json
+import os
+import sys
+import time
+
+if sys.argv[-1] != "session":
+    sys.exit("not a session")
+for line in sys.stdin:
+    args = json.loads(line)
+    status = 0
+    if "hang" in args:
+        time.sleep(60)
+    elif "bad" in args:
+        sys.stderr.write("bad pool\\\\n")
+        sys.stderr.flush()
+        status = 1
+    else:
+        print(json.dumps({"response": {"pools": [{"uuid": "a", "pid": os.getpid()}]},
+                          "error": None, "status": 0}))
+    print("DMG_SESSION_END " + json.dumps({"exit_status": status, "error": None}), flush=True)
+"""
+
+
+class HarnessDmgSessionTest(TestWithoutServers):
+    """Harness dmg session test cases.
+
+    :avocado: recursive
+    """
+
+    def test_dmg_session(self):
+        """Verify dmg commands are run in a single dmg session process.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessDmgSessionTest,test_dmg_session
+        """
+        path = os.path.join(self.workdir, "dmg")
+        with open(path, "w", encoding="utf-8") as stub:
+            stub.write(STUB_DMG)
+        os.chmod(path, 0o755)
+        dmg = DmgCommand(self.workdir)
+        dmg.timeout = 10
+        dmg.start_session()
+        try:
+            pid = dmg.pool_list()["response"]["pools"][0]["pid"]
+            self.assertTrue(dmg.session.running)
+            self.assertEqual(dmg.pool_list()["response"]["pools"][0]["pid"], pid)
+
+            self.log.info("Verify a failed command does not end the dmg session")
+            with self.assertRaises(CommandFailure):
+                dmg.pool_query("bad")
+            self.assertEqual(dmg.result.exit_status, 1)
+            self.assertIn("bad pool", dmg.result.stderr_text)
+            self.assertEqual(dmg.pool_list()["response"]["pools"][0]["pid"], pid)
+
+            self.log.info("Verify a command which times out stops the dmg session")
+            dmg.timeout = 2
+            with self.assertRaises(CommandFailure) as context:
+                dmg.pool_query("hang")
+            self.assertIn("Timeout detected", str(context.exception))
+            self.assertFalse(dmg.session.running)
+            self.assertNotEqual(dmg.pool_list()["response"]["pools"][0]["pid"], pid)
+        finally:
+            dmg.stop_session()
+        self.assertIsNone(dmg.session)
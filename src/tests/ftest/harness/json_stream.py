@@ -0,0 +1,87 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import os
+import time
+
+from apricot import TestWithoutServers
+
+from dmg_utils import DmgCommand
+from exception_utils import CommandFailure
+
+# Stub dmg command whose behavior is selected by the STUB_DMG_MODE environment variable
+STUB_DMG = """#!/bin/bash
+case "$STUB_DMG_MODE" in
+    hang)
+        exec sleep 60
+        ;;
+    fail)
+        echo 'bad things' >&2
+        exit 3
+        ;;
+esac
+printf '{"response": {"pools": [{"uuid": "a", "label": "p[0]"},'
+sleep 1
+printf ' {"uuid": "b", "label": "p\\\\"1\\\\""}]}, "error": null, "status": 0}\\n'
+"""
+
+
+class HarnessJsonStreamTest(TestWithoutServers):
+    """Harness streamed JSON command output test cases.
+
+    :avocado: recursive
+    """
+
+    def get_stub_dmg(self, mode):
+        """Get a DmgCommand running a stub dmg command.
+
+        Args:
+            mode (str): stub behavior: "hang", "fail" or "list"
+
+        Returns:
+            DmgCommand: the dmg command object
+
+        """
+        path = os.path.join(self.workdir, "dmg")
+        with open(path, "w", encoding="utf-8") as stub:
+            stub.write(STUB_DMG)
+        os.chmod(path, 0o755)
+        dmg = DmgCommand(self.workdir)
+        dmg.env["STUB_DMG_MODE"] = mode
+        dmg.timeout = 10
+        return dmg
+
+    def test_iter_pool_list(self):
+        """Verify pool entries are read from streamed dmg pool list output.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessJsonStreamTest,test_iter_pool_list
+        """
+        pools = list(self.get_stub_dmg("list").iter_pool_list())
+        self.log.info("pools: %s", pools)
+        self.assertEqual(pools, [{"uuid": "a", "label": "p[0]"}, {"uuid": "b", "label": 'p"1"'}])
+
+        with self.assertRaises(CommandFailure) as context:
+            list(self.get_stub_dmg("fail").iter_pool_list())
+        self.assertIn("bad things", str(context.exception))
+
+    def test_iter_pool_list_timeout(self):
+        """Verify a dmg command which hangs without any output is killed on timeout.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessJsonStreamTest,test_iter_pool_list_timeout
+        """
+        dmg = self.get_stub_dmg("hang")
+        dmg.timeout = 2
+        start = time.time()
+        with self.assertRaises(CommandFailure) as context:
+            list(dmg.iter_pool_list())
+        self.log.info("%s after %.1fs", context.exception, time.time() - start)
+        self.assertIn("timed out", str(context.exception))
+        self.assertLess(time.time() - start, 30)
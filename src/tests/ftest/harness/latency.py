@@ -0,0 +1,51 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import json
+
+from apricot import TestWithoutServers
+
+from latency_utils import get_fio_latency, get_ior_latency, get_latency_metrics
+
+# fio --output-format=json+ output of a job, preceded by a line of other output
+FIO_OUTPUT = "fio: note: some output\n" + json.dumps({
+    "jobs": [{
+        "jobname": "test",
+        "read": {"clat_ns": {"bins": {"1000": 98, "2000": 1, "50000": 1}}},
+        "write": {"clat_ns": {"bins": {"4000": 50, "8000": 50}}},
+        "trim": {"clat_ns": {}}}]})
+
+
+class HarnessLatencyTest(TestWithoutServers):
+    """Harness latency histogram test cases.
+
+    :avocado: recursive
+    """
+
+    def test_latency_metrics(self):
+        """Verify the latency metrics of fio and IOR output.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessLatencyTest,test_latency_metrics
+        """
+        histograms = get_fio_latency(FIO_OUTPUT)
+        self.assertEqual(sorted(histograms), ["read", "write"])
+        histograms["read"].merge(get_fio_latency(FIO_OUTPUT)["read"], 2)
+        self.assertEqual(histograms["read"].count, 300)
+        self.log.info("read latency: %s", histograms["read"])
+
+        self.assertEqual(
+            get_latency_metrics(histograms),
+            {"read_lat_p50": 1.0, "read_lat_p99": 2.0, "read_lat_p999": 50.0,
+             "write_lat_p50": 4.0, "write_lat_p99": 8.0, "write_lat_p999": 8.0})
+
+        document = {"tests": [{"Results": [
+            [{"access": "write", "latency": 0.002}, {"access": "read", "latency": 0.001}],
+            [{"access": "write", "latency": 0.004}, {"access": "read", "latency": None}]]}]}
+        histograms = get_ior_latency(document)
+        self.assertEqual(histograms["write"].get_mean(), 3000000)
+        self.assertEqual(histograms["read"].count, 1)
@@ -0,0 +1,79 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import os
+
+from apricot import TestWithoutServers
+
+from performance_results_utils import PerformanceResult, PerformanceResultsDB
+
+
+class HarnessPerformanceResultsTest(TestWithoutServers):
+    """Harness performance results regression check test cases.
+
+    :avocado: recursive
+    """
+
+    def test_performance_results(self):
+        """Verify regression checks of metrics against their history.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessPerformanceResultsTest,test_performance_results
+        """
+        history = [100.0, 102.0, 98.0, 101.0, 99.0]
+        result = PerformanceResult("write_bw", 80.0, history)
+        self.log.info("%s", result)
+        self.assertAlmostEqual(result.change, -0.2)
+        self.assertTrue(result.is_regression())
+        self.assertFalse(PerformanceResult("write_bw", 99.5, history).is_regression())
+        self.assertFalse(PerformanceResult("write_bw", 120.0, history).is_regression())
+        self.assertTrue(PerformanceResult("write_lat_mean", 120.0, history, True).is_regression())
+        self.assertFalse(PerformanceResult("write_lat_mean", 80.0, history, True).is_regression())
+
+        result = PerformanceResult("write_bw", 80.0, [])
+        self.assertIsNone(result.change)
+        self.assertFalse(result.is_regression())
+        self.assertIn("no history", str(result))
+
+    def test_performance_results_zero_mean(self):
+        """Verify regression checks of metrics whose history mean is 0.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessPerformanceResultsTest,test_performance_results_zero_mean
+        """
+        for value, lower_is_better, regression in ((1.0, False, False), (0.0, False, False),
+                                                   (1.0, True, True), (0.0, True, False)):
+            result = PerformanceResult("score", value, [0.0, 0.0], lower_is_better)
+            self.log.info("%s", result)
+            self.assertIsNone(result.change)
+            self.assertIn("change -", str(result))
+            self.assertEqual(result.is_regression(), regression)
+
+    def test_performance_results_db(self):
+        """Verify the stored history of a metric.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessPerformanceResultsTest,test_performance_results_db
+        """
+        results_db = PerformanceResultsDB(os.path.join(self.workdir, "results.db"))
+        key = {"test": "ior_easy", "git_commit": "abc", "oclass": None, "ppn": 16,
+               "hardware": "hw"}
+        results_db.add(key, {"write_bw": 100.0, "score": 0.0})
+        results_db.add(dict(key, git_commit="def"), {"write_bw": 110.0, "score": 0.0})
+        results_db.add(dict(key, oclass="SX"), {"write_bw": 50.0})
+        self.assertEqual(results_db.get_history(key, "write_bw"), [110.0, 100.0])
+
+        results = {
+            result.metric: result
+            for result in results_db.compare(key, {"write_bw": 40.0, "score": 0.0})}
+        self.assertTrue(results["write_bw"].is_regression())
+        self.assertFalse(results["score"].is_regression())
+        self.log.info("%s", results["score"])
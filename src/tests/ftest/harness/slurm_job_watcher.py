@@ -0,0 +1,150 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import os
+import threading
+import time
+
+from apricot import TestWithoutServers
+
+from slurm_utils import SlurmJobWatcher
+
+# Stub slurm command reporting the contents of its output file, or failing if its fail file exists
+STUB_COMMAND = """#!/bin/bash
+[ -f {0}.fail ] && exit 1
+cat {0}.out 2>/dev/null
+exit 0
+"""
+
+
+class JobRecorder():
+    # pylint: disable=too-few-public-methods
+    """Record the jobs reported by a SlurmJobWatcher."""
+
+    def __init__(self, log):
+        """Initialize a JobRecorder object.
+
+        Args:
+            log (logger): logger for the messages produced by this class
+        """
+        self.log = log
+        self.states = {}
+        self.event = threading.Event()
+
+    def job_done(self, args):
+        """Record a finished job.
+
+        Args:
+            args (dict): handle and state of the job
+        """
+        self.log.info("Job %s done: %s", args["handle"], args["state"])
+        self.states[args["handle"]] = args["state"]
+        self.event.set()
+
+
+class HarnessSlurmJobWatcherTest(TestWithoutServers):
+    """Harness slurm job watcher test cases.
+
+    :avocado: recursive
+    """
+
+    def set_stub(self, name, output=None, fail=False):
+        """Set the output of a stub slurm command.
+
+        Args:
+            name (str): stub command name, e.g. squeue
+            output (list, optional): lines to output. Defaults to None.
+            fail (bool, optional): whether the command fails. Defaults to False.
+        """
+        base = os.path.join(self.workdir, name)
+        with open(base + ".out", "w", encoding="utf-8") as handle:
+            handle.write("".join("{}\n".format(line) for line in output or []))
+        if fail:
+            with open(base + ".fail", "w", encoding="utf-8"):
+                pass
+        elif os.path.exists(base + ".fail"):
+            os.remove(base + ".fail")
+
+    def wait_for_jobs(self, recorder, handles, timeout=30):
+        """Wait for the watcher to report jobs.
+
+        Args:
+            recorder (JobRecorder): the job owner
+            handles (list): job ids to wait for
+            timeout (int, optional): maximum time in seconds to wait. Defaults to 30.
+        """
+        end = time.time() + timeout
+        while not set(handles).issubset(recorder.states) and time.time() < end:
+            recorder.event.wait(1)
+            recorder.event.clear()
+        missing = set(handles) - set(recorder.states)
+        if missing:
+            self.fail("Jobs {} were not reported".format(sorted(missing)))
+
+    def test_slurm_job_watcher(self):
+        """Verify the slurm job watcher against stub squeue and sacct commands.
+
+        :avocado: tags=all
+        :avocado: tags=vm
+        :avocado: tags=harness
+        :avocado: tags=HarnessSlurmJobWatcherTest,test_slurm_job_watcher
+        """
+        commands = {}
+        for name in ("squeue", "sacct"):
+            commands[name] = os.path.join(self.workdir, name)
+            with open(commands[name], "w", encoding="utf-8") as handle:
+                handle.write(STUB_COMMAND.format(commands[name]))
+            os.chmod(commands[name], 0o755)
+        recorder = JobRecorder(self.log)
+        watcher = SlurmJobWatcher(
+            self.log, interval=1, max_interval=2, squeue=commands["squeue"],
+            sacct=commands["sacct"])
+
+        self.log_step("Verify that jobs are kept while squeue and sacct fail")
+        self.set_stub("squeue", fail=True)
+        self.set_stub("sacct", fail=True)
+        watcher.register("100", recorder, 60)
+        watcher.register("101", recorder, 60)
+        time.sleep(4)
+        if recorder.states:
+            self.fail("Jobs reported while squeue and sacct failed: {}".format(recorder.states))
+
+        self.log_step("Verify that jobs are kept while no job states are reported")
+        self.set_stub("squeue")
+        self.set_stub("sacct")
+        time.sleep(4)
+        if recorder.states:
+            self.fail("Jobs reported by an empty poll: {}".format(recorder.states))
+
+        self.log_step("Verify that a completed job is reported")
+        self.set_stub("squeue", ["100 RUNNING", "101 COMPLETED"])
+        self.wait_for_jobs(recorder, ["101"])
+        self.assertEqual(recorder.states, {"101": "COMPLETED"})
+
+        self.log_step("Verify that a job is reported when its maximum wait is reached")
+        self.set_stub("squeue", fail=True)
+        watcher.register("102", recorder, 2)
+        self.wait_for_jobs(recorder, ["102"])
+        self.assertEqual(recorder.states["102"], "MAXWAITREACHED")
+        self.assertNotIn("100", recorder.states)
+
+        self.log_step("Verify that jobs no longer reported by squeue are found with sacct")
+        self.set_stub("squeue", ["103 PENDING"])
+        self.set_stub("sacct", ["100|CANCELLED by 0"])
+        watcher.register("103", recorder, 60)
+        self.wait_for_jobs(recorder, ["100"])
+        self.assertEqual(recorder.states["100"], "CANCELLED")
+
+        self.log_step("Verify that jobs unknown to squeue and sacct are reported")
+        self.set_stub("squeue", ["104 RUNNING"])
+        self.set_stub("sacct")
+        watcher.register("104", recorder, 60)
+        self.wait_for_jobs(recorder, ["103"])
+        self.assertEqual(recorder.states["103"], "UNKNOWN")
+
+        self.set_stub("squeue", ["104 COMPLETED"])
+        self.wait_for_jobs(recorder, ["104"])
+        watcher.join(30)
+        self.log.info("Test passed")
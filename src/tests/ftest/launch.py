@@ -8,8 +8,10 @@
 
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import TemporaryDirectory
 import errno
+import hashlib
 import json
 import logging
 import os
@@ -35,7 +37,7 @@ sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "util")
 from host_utils import get_node_set, get_local_host, HostInfo, HostException  # noqa: E402
 from logger_utils import get_console_handler, get_file_handler                # noqa: E402
 from results_utils import create_html, create_xml, Job, Results, TestResult   # noqa: E402
-from run_utils import run_local, run_remote, find_command, RunException       # noqa: E402
+from run_utils import run_local, run_remote, iter_remote, find_command, RunException  # noqa: E402
 from slurm_utils import show_partition, create_partition, delete_partition    # noqa: E402
 from storage_utils import StorageInfo, StorageException                       # noqa: E402
 from user_utils import get_chown_command, groupadd, useradd, userdel, get_group_id, \
@@ -53,6 +55,9 @@ DEFAULT_LOGS_THRESHOLD = "2150M"    # 2.1G
 FAILURE_TRIGGER = "00_trigger-launch-failure_00"
 LOG_FILE_FORMAT = "%(asctime)s %(levelname)-5s %(funcName)30s: %(message)s"
 MAX_CI_REPETITIONS = 10
+MAX_TEST_INDEX_ENTRIES = 32
+MAX_YAML_SETUP_THREADS = 16
+TEST_INDEX_FILE = os.path.join(DEFAULT_DAOS_TEST_SHARED_DIR, "launch_test_index.json")
 TEST_EXPECT_CORE_FILES = ["./harness/core_files.py"]
 PROVIDER_KEYS = OrderedDict(
     [
@@ -853,7 +858,7 @@ class Launch():
 
         # Process the tags argument to determine which tests to run - populates self.tests
         try:
-            self.list_tests(args.tags)
+            self.list_tests(args.tags, not args.no_cache)
         except RunException:
             message = f"Error detecting tests that match tags: {' '.join(args.tags)}"
             return self.get_exit_status(1, message, "Setup", sys.exc_info())
@@ -1354,7 +1359,7 @@ class Launch():
             os.environ["PYTHONPATH"] = python_path
         logger.debug("Testing with PYTHONPATH=%s", os.environ["PYTHONPATH"])
 
-    def list_tests(self, tags):
+    def list_tests(self, tags, use_cache=True):
         """List the test files matching the tags.
 
         Populates the self.tests list and defines the self.tag_filters list to use when running
@@ -1362,6 +1367,9 @@ class Launch():
 
         Args:
             tags (list): a list of tags or test file names
+            use_cache (bool, optional): whether or not to use the cached test index to avoid running
+                the avocado list command when none of the test files have changed since the same
+                tags were last listed. Defaults to True.
 
         Raises:
             RunException: if there is a problem listing tests
@@ -1397,14 +1405,99 @@ class Launch():
         if not test_files:
             command.append("./")
 
-        # Find all the test files that contain tests matching the tags
-        logger.info("Detecting tests matching tags: %s", " ".join(command))
-        output = run_local(logger, " ".join(command), check=True)
-        unique_test_files = set(re.findall(self.avocado.get_list_regex(), output.stdout))
+        # Use the cached list of test files if the tests have not changed since the last listing
+        index_key = self._get_test_index_key(command, test_files or ["./"])
+        unique_test_files = self._read_test_index(index_key) if use_cache else None
+        if unique_test_files is not None:
+            logger.info("Using cached tests matching tags: %s", " ".join(command))
+        else:
+            # Find all the test files that contain tests matching the tags
+            logger.info("Detecting tests matching tags: %s", " ".join(command))
+            output = run_local(logger, " ".join(command), check=True)
+            unique_test_files = list(set(re.findall(self.avocado.get_list_regex(), output.stdout)))
+            if use_cache:
+                self._write_test_index(index_key, unique_test_files)
         for index, test_file in enumerate(unique_test_files):
             self.tests.append(TestInfo(test_file, index + 1))
             logger.info("  %s", self.tests[-1])
 
+    @staticmethod
+    def _get_test_index_key(command, paths):
+        """Get the test index key for the avocado list command and the current test files.
+
+        The key changes if the command or the modification time of any python file in the paths
+        changes.
+
+        Args:
+            command (list): avocado list command parts
+            paths (list): test files and directories searched by the avocado list command
+
+        Returns:
+            str: the test index key
+
+        """
+        digest = hashlib.sha256(" ".join(command).encode())
+        files = []
+        for path in paths:
+            if os.path.isfile(path):
+                files.append(path)
+                continue
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [name for name in dirs if not name.startswith((".", "__"))]
+                files.extend(
+                    os.path.join(root, name) for name in names if name.endswith(".py"))
+        for name in sorted(files):
+            try:
+                digest.update(f"{name}:{os.stat(name).st_mtime_ns}\n".encode())
+            except OSError:
+                digest.update(f"{name}:missing\n".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _read_test_index(key):
+        """Read the list of test files for the key from the cached test index.
+
+        Args:
+            key (str): test index key
+
+        Returns:
+            list: the cached list of test files or None if not cached
+
+        """
+        try:
+            with open(TEST_INDEX_FILE, "r", encoding="utf-8") as index_file:
+                return json.load(index_file)[key]["tests"]
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logger.debug("No cached test index entry in %s: %s", TEST_INDEX_FILE, error)
+        return None
+
+    @staticmethod
+    def _write_test_index(key, test_files):
+        """Add the list of test files for the key to the cached test index.
+
+        Only the most recently listed MAX_TEST_INDEX_ENTRIES entries are retained.
+
+        Args:
+            key (str): test index key
+            test_files (list): test files matching the key
+        """
+        try:
+            with open(TEST_INDEX_FILE, "r", encoding="utf-8") as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            index = {}
+        index[key] = {"time": time.time(), "tests": test_files}
+        newest = sorted(index, key=lambda item: index[item].get("time", 0), reverse=True)
+        index = {item: index[item] for item in newest[:MAX_TEST_INDEX_ENTRIES]}
+        try:
+            os.makedirs(os.path.dirname(TEST_INDEX_FILE), exist_ok=True)
+            temp_file = ".".join([TEST_INDEX_FILE, str(os.getpid())])
+            with open(temp_file, "w", encoding="utf-8") as index_file:
+                json.dump(index, index_file)
+            os.replace(temp_file, TEST_INDEX_FILE)
+        except OSError as error:
+            logger.debug("Unable to update the cached test index %s: %s", TEST_INDEX_FILE, error)
+
     @staticmethod
     def _faults_enabled():
         """Determine if fault injection is enabled.
@@ -1499,24 +1592,48 @@ class Launch():
         # Generate storage configuration extra yaml files if requested
         self._add_auto_storage_yaml(storage_info, yaml_dir, tier_0_type, scm_size, max_nvme_tiers)
 
-        # Replace any placeholders in the test yaml file
-        for test in self.tests:
-            new_yaml_file = updater.update(test.yaml_file, yaml_dir)
-            if new_yaml_file:
-                if args.verbose > 0:
-                    # Optionally display a diff of the yaml file
-                    run_local(logger, f"diff -y {test.yaml_file} {new_yaml_file}", check=False)
-                test.yaml_file = new_yaml_file
-
-            # Display the modified yaml file variants with debug
-            command = ["avocado", "variants", "--mux-yaml", test.yaml_file]
-            if test.extra_yaml:
-                command.extend(test.extra_yaml)
-            command.extend(["--summary", "3"])
-            run_local(logger, " ".join(command))
-
-            # Collect the host information from the updated test yaml
-            test.set_yaml_info(args.include_localhost)
+        # Replace any placeholders in the test yaml files in parallel
+        if self.tests:
+            workers = min(len(self.tests), MAX_YAML_SETUP_THREADS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._setup_test_file, test, updater, yaml_dir, args)
+                    for test in self.tests]
+                for future in futures:
+                    # Raise any exception from setting up the test yaml file
+                    future.result()
+
+    @staticmethod
+    def _setup_test_file(test, updater, yaml_dir, args):
+        """Set up a single test yaml file with any placeholder replacements.
+
+        Args:
+            test (TestInfo): the test whose yaml file is being updated
+            updater (YamlUpdater): object used to replace placeholders in the test yaml file
+            yaml_dir (str): directory in which to write the modified yaml file
+            args (argparse.Namespace): command line arguments for this program
+
+        Raises:
+            RunException: if there is a problem updating the test yaml file
+            YamlException: if there is an error getting host information from the test yaml file
+
+        """
+        new_yaml_file = updater.update(test.yaml_file, yaml_dir)
+        if new_yaml_file:
+            if args.verbose > 0:
+                # Optionally display a diff of the yaml file
+                run_local(logger, f"diff -y {test.yaml_file} {new_yaml_file}", check=False)
+            test.yaml_file = new_yaml_file
+
+        # Display the modified yaml file variants with debug
+        command = ["avocado", "variants", "--mux-yaml", test.yaml_file]
+        if test.extra_yaml:
+            command.extend(test.extra_yaml)
+        command.extend(["--summary", "3"])
+        run_local(logger, " ".join(command))
+
+        # Collect the host information from the updated test yaml
+        test.set_yaml_info(args.include_localhost)
 
     def _add_auto_storage_yaml(self, storage_info, yaml_dir, tier_0_type, scm_size, max_nvme_tiers):
         """Add extra storage yaml definitions for tests requesting automatic storage configurations.
@@ -2605,8 +2722,10 @@ class Launch():
         cart_logtest = os.path.abspath(os.path.join("cart", "cart_logtest.py"))
         logger.debug("-" * 80)
         logger.debug("Running %s on %s files on %s", cart_logtest, source_files, hosts)
-        other = ["-print0", "|", "xargs", "-0", "-r0", "-n1", "-I", "%", "sh", "-c",
-                 f"'{cart_logtest} % > %.cart_logtest 2>&1'"]
+        # Check all the files on each host from a single process, which checks up to 4 files in
+        # parallel and writes the output for each file to <file>.cart_logtest
+        other = ["-print0", "|", "xargs", "-0", "-r", cart_logtest, "--jobs", "4",
+                 "--output-suffix", ".cart_logtest"]
         result = run_remote(
             logger, hosts, find_command(source, pattern, depth, other), timeout=2700)
         if not result.passed:
@@ -2710,18 +2829,29 @@ class Launch():
             self._fail_test(self.result.tests[-1], "Process", message)
             return 16
 
-        # Move all the source files matching the pattern into the temporary remote directory
+        # Move all the source files matching the pattern into the temporary remote directory. Hosts
+        # report as they complete so that a hung host does not prevent copying files from the rest.
         other = f"-print0 | xargs -0 -r0 -I '{{}}' {sudo_command}mv '{{}}' {tmp_copy_dir}/"
-        if not run_remote(logger, hosts, find_command(source, pattern, depth, other)).passed:
-            message = f"Error moving files to temporary remote copy directory {tmp_copy_dir}"
+        moved_hosts = NodeSet()
+        return_code = 0
+        try:
+            for result in iter_remote(logger, hosts, find_command(source, pattern, depth, other)):
+                if result.passed:
+                    moved_hosts.add(result.host)
+        except RunException:
+            logger.debug("Error running the move command", exc_info=True)
+        if moved_hosts != hosts:
+            message = (f"Error moving files to temporary remote copy directory {tmp_copy_dir} on "
+                       f"{hosts.difference(moved_hosts)}")
             self._fail_test(self.result.tests[-1], "Process", message)
-            return 16
+            return_code = 16
 
         # Clush -rcopy the temporary remote directory to this host
-        command = ["clush", "-w", str(hosts), "-pv", "--rcopy", tmp_copy_dir, "--dest", rcopy_dest]
-        return_code = 0
+        command = [
+            "clush", "-w", str(moved_hosts), "-pv", "--rcopy", tmp_copy_dir, "--dest", rcopy_dest]
         try:
-            run_local(logger, " ".join(command), check=True, timeout=timeout)
+            if moved_hosts:
+                run_local(logger, " ".join(command), check=True, timeout=timeout)
 
         except RunException:
             message = f"Error copying remote files to {destination}"
@@ -3026,6 +3156,11 @@ def main():
         type=str,
         help="avocado job-results directory name in which to place the launch log files."
              "If a directory with this name already exists it will be renamed with a '_old' suffix")
+    parser.add_argument(
+        "-nc", "--no_cache",
+        action="store_true",
+        help="do not use or update the cached index of tests matching the tags, which is reused "
+             "when none of the python test files have changed since the tags were last listed")
     parser.add_argument(
         "-n", "--nvme",
         action="store",
@@ -0,0 +1,35 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+from io500_test_base import Io500TestBase
+
+
+class Io500(Io500TestBase):
+    # pylint: disable=too-many-ancestors
+    # pylint: disable=too-few-public-methods
+    """Test class Description: Run the IO500 phases and compare configurations.
+
+    :avocado: recursive
+    """
+
+    def test_performance_io500_dfs_oclass(self):
+        """Test Description: Run IO500, DFS, compare SX and EC_16P2GX.
+
+        :avocado: tags=all,manual
+        :avocado: tags=hw,medium
+        :avocado: tags=performance,performance_io500,performance_dfs
+        :avocado: tags=Io500,test_performance_io500_dfs_oclass
+        """
+        self.run_io500_configs(["/run/io500_dfs_sx/*", "/run/io500_dfs_ec_16p2gx/*"])
+
+    def test_performance_io500_dfuse_intercept(self):
+        """Test Description: Run IO500, POSIX dfuse, compare with and without interception.
+
+        :avocado: tags=all,manual
+        :avocado: tags=hw,medium
+        :avocado: tags=performance,performance_io500,performance_dfuse
+        :avocado: tags=Io500,test_performance_io500_dfuse_intercept
+        """
+        self.run_io500_configs(["/run/io500_dfuse_sx/*", "/run/io500_dfuse_il_sx/*"])
@@ -0,0 +1,44 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+from performance_sweep_test_base import PerformanceSweepTestBase
+
+
+class PerformanceSweep(PerformanceSweepTestBase):
+    # pylint: disable=too-many-ancestors
+    """Test class Description: Sweep IOR/MDTest parameters and rank the configurations.
+
+    :avocado: recursive
+    """
+
+    def test_performance_sweep_ior_dfs(self):
+        """Test Description: Sweep IOR Easy, DFS, object class, chunk size, transfer size and ppn.
+
+        :avocado: tags=all,manual
+        :avocado: tags=hw,medium
+        :avocado: tags=performance,performance_sweep,performance_ior,performance_dfs
+        :avocado: tags=PerformanceSweep,test_performance_sweep_ior_dfs
+        """
+        self.run_performance_sweep("IOR", "/run/ior_dfs/*", "/run/sweep_ior_dfs/*")
+
+    def test_performance_sweep_ior_dfuse(self):
+        """Test Description: Sweep IOR Easy, POSIX dfuse, object class, ppn and interception.
+
+        :avocado: tags=all,manual
+        :avocado: tags=hw,medium
+        :avocado: tags=performance,performance_sweep,performance_ior,performance_dfuse
+        :avocado: tags=PerformanceSweep,test_performance_sweep_ior_dfuse
+        """
+        self.run_performance_sweep("IOR", "/run/ior_dfuse/*", "/run/sweep_ior_dfuse/*")
+
+    def test_performance_sweep_mdtest_dfs(self):
+        """Test Description: Sweep MDTest Easy, DFS, object class and ppn.
+
+        :avocado: tags=all,manual
+        :avocado: tags=hw,medium
+        :avocado: tags=performance,performance_sweep,performance_mdtest,performance_dfs
+        :avocado: tags=PerformanceSweep,test_performance_sweep_mdtest_dfs
+        """
+        self.run_performance_sweep("MDTEST", "/run/mdtest_dfs/*", "/run/sweep_mdtest_dfs/*")
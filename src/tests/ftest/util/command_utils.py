@@ -1,5 +1,5 @@
 """
-  (C) Copyright 2018-2022 Intel Corporation.
+  (C) Copyright 2018-2023 Intel Corporation.
 
   SPDX-License-Identifier: BSD-2-Clause-Patent
 """
@@ -12,6 +12,11 @@ import time
 import signal
 import os
 import json
+import codecs
+import selectors
+import shlex
+import tempfile
+from subprocess import Popen, PIPE     # nosec
 
 from avocado.utils import process
 from ClusterShell.NodeSet import NodeSet
@@ -27,6 +32,150 @@ from user_utils import get_primary_group
 from run_utils import command_as_user
 
 
+class JsonStreamParser():
+    """Incrementally parse the entries of a single list from a stream of JSON text.
+
+    Only the text of the list entry currently being decoded is buffered, which allows the entries
+    of very large JSON documents, e.g. the 'response' of a dmg command, to be processed one at a
+    time as the document is read.
+    """
+
+    _TOKEN = re.compile(r'["{}\[\],]')
+    _STRING_TOKEN = re.compile(r'["\\]')
+
+    def __init__(self, *keys):
+        """Create a JsonStreamParser object.
+
+        Args:
+            keys (list): JSON object keys leading to the list whose entries should be yielded,
+                e.g. ("response", "pools"). No keys will yield the entries of a top-level list.
+        """
+        self.keys = tuple(keys)
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._key = None
+        self._capture = None
+        self._capture_depth = None
+        self._capture_start = 0
+
+    def _at_target(self):
+        """Determine if the next value will be an entry of the list being parsed.
+
+        Returns:
+            bool: True if the next value is an entry of the list being parsed
+
+        """
+        return bool(self._stack) and self._stack[-1]["target"] and self._capture is None
+
+    def _start_capture(self, index):
+        """Start collecting the text of a list entry.
+
+        Args:
+            index (int): index in the current chunk where the entry starts
+        """
+        self._capture = []
+        self._capture_depth = len(self._stack)
+        self._capture_start = index
+
+    def _end_capture(self, chunk, index, entries):
+        """Decode the collected text of a list entry.
+
+        Args:
+            chunk (str): current chunk of text
+            index (int): index in the current chunk where the entry ends
+            entries (list): list to which to append the decoded entry
+        """
+        self._capture.append(chunk[self._capture_start:index])
+        entries.append(json.loads("".join(self._capture)))
+        self._capture = None
+
+    def feed(self, chunk):
+        """Parse the next chunk of JSON text.
+
+        Args:
+            chunk (str): the next chunk of JSON text
+
+        Returns:
+            list: the list entries completed by this chunk of text
+
+        """
+        entries = []
+        self._capture_start = 0
+        index = 0
+        while index < len(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    if self._key is not None:
+                        self._key.append(chunk[index])
+                    index += 1
+                    continue
+                match = self._STRING_TOKEN.search(chunk, index)
+                end = match.start() if match else len(chunk)
+                if self._key is not None:
+                    self._key.append(chunk[index:end])
+                if not match:
+                    break
+                index = match.end()
+                if match.group() == "\\":
+                    self._escape = True
+                    if self._key is not None:
+                        self._key.append("\\")
+                    continue
+                self._in_string = False
+                if self._key is not None:
+                    self._stack[-1]["key"] = json.loads('"{}"'.format("".join(self._key)))
+                    self._stack[-1]["expect_key"] = False
+                    self._key = None
+                elif self._capture is not None and len(self._stack) == self._capture_depth:
+                    self._end_capture(chunk, index, entries)
+                continue
+
+            match = self._TOKEN.search(chunk, index)
+            end = match.start() if match else len(chunk)
+            if self._at_target():
+                # Detect the start of any number, boolean, or null list entry
+                text = chunk[index:end]
+                if text.strip():
+                    self._start_capture(index + len(text) - len(text.lstrip()))
+            if not match:
+                break
+            token = match.group()
+            index = match.end()
+            if token == '"':
+                if self._stack and self._stack[-1]["kind"] == "{" \
+                        and self._stack[-1]["expect_key"]:
+                    self._key = []
+                elif self._at_target():
+                    self._start_capture(match.start())
+                self._in_string = True
+            elif token in "{[":
+                if self._at_target():
+                    self._start_capture(match.start())
+                target = token == "[" and self._capture is None and all(
+                    frame["kind"] == "{" for frame in self._stack) and tuple(
+                        frame["key"] for frame in self._stack) == self.keys
+                self._stack.append(
+                    {"kind": token, "key": None, "expect_key": True, "target": target})
+            elif token in "}]":
+                if self._capture is not None and len(self._stack) == self._capture_depth:
+                    # End of a number, boolean, or null list entry
+                    self._end_capture(chunk, match.start(), entries)
+                self._stack.pop()
+                if self._capture is not None and len(self._stack) == self._capture_depth:
+                    self._end_capture(chunk, index, entries)
+            elif token == ",":
+                if self._capture is not None and len(self._stack) == self._capture_depth:
+                    self._end_capture(chunk, match.start(), entries)
+                elif self._stack and self._stack[-1]["kind"] == "{":
+                    self._stack[-1]["expect_key"] = True
+
+        if self._capture is not None:
+            self._capture.append(chunk[self._capture_start:])
+        return entries
+
+
 class ExecutableCommand(CommandWithParameters):
     """A class for command with parameters."""
 
@@ -477,6 +626,9 @@ class CommandWithSubCommand(ExecutableCommand):
 
         self.json = None
 
+        # The last command result and its decoded JSON output
+        self._json_cache = None
+
     def get_param_names(self):
         """Get a sorted list of the names of the BasicParameter attributes.
 
@@ -643,7 +795,107 @@ class CommandWithSubCommand(ExecutableCommand):
             self.output_check = prev_output_check
             if json_err:
                 self.exit_status_exception = prev_exit_exception
-        return json.loads(self.result.stdout)
+        return self.json_result
+
+    @property
+    def json_result(self):
+        """Get the decoded JSON output of the last command run.
+
+        The JSON output is only decoded once per command result.
+
+        Returns:
+            dict: the decoded JSON command output or None if the command has not been run
+
+        """
+        if self.result is None:
+            return None
+        if self._json_cache is None or self._json_cache[0] is not self.result:
+            self._json_cache = (self.result, json.loads(self.result.stdout))
+        return self._json_cache[1]
+
+    def iter_json_entries(self, keys, sub_command_list=None, raise_exception=None,
+                          chunk_size=1048576, **kwargs):
+        """Run the command with JSON output and yield the requested list entries as they are read.
+
+        Unlike _get_json_result() the command output is not buffered and decoded in its entirety,
+        which avoids holding multiple copies of very large command output in memory.
+
+        Args:
+            keys (list): JSON object keys leading to the list whose entries should be yielded,
+                e.g. ["response", "pools"].
+            sub_command_list (list, optional): a list of sub commands used to define the command
+                to execute. Defaults to None, which will run the command as it is currently
+                defined.
+            raise_exception (bool, optional): whether or not to raise an exception if the command
+                fails. This overrides the self.exit_status_exception setting if defined. Defaults
+                to None.
+            chunk_size (int, optional): maximum number of bytes to read from the command output at
+                a time. Defaults to 1 MiB.
+            kwargs (dict): Parameters for the command.
+
+        Raises:
+            CommandFailure: if there is an error running the command or it does not complete
+                within self.timeout seconds, in which case it is killed
+
+        Yields:
+            object: each decoded entry of the requested list
+
+        """
+        if self.json is None:
+            raise CommandFailure(
+                f"The {self.command} command doesn't have json option defined!")
+        if raise_exception is None:
+            raise_exception = self.exit_status_exception
+        prev_json_val = self.json.value
+        self.json.update(True)
+        try:
+            # Set the subcommands and their arguments
+            this_command = self
+            if sub_command_list is not None:
+                for sub_command in sub_command_list:
+                    this_command.set_sub_command(sub_command)
+                    this_command = this_command.sub_command_class
+            for name, value in list(kwargs.items()):
+                getattr(this_command, name).value = value
+            command = str(self)
+        finally:
+            self.json.update(prev_json_val)
+
+        env = os.environ.copy()
+        env.update(self.env)
+        if self.verbose:
+            self.log.info("Running (streaming) '%s'", command)
+        parser = JsonStreamParser(*keys)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        end = None if self.timeout is None else time.time() + self.timeout
+        with tempfile.TemporaryFile() as stderr:
+            with Popen(shlex.split(command), stdout=PIPE, stderr=stderr, env=env,
+                       bufsize=0) as proc, selectors.DefaultSelector() as selector:
+                selector.register(proc.stdout, selectors.EVENT_READ)
+                try:
+                    while True:
+                        # Wait for output so that a command which hangs without writing any
+                        # output still times out
+                        if end is not None and not selector.select(max(end - time.time(), 0)):
+                            raise CommandFailure(
+                                "<{}> command timed out after {}s".format(
+                                    self.command, self.timeout))
+                        data = proc.stdout.read(chunk_size)
+                        if not data:
+                            break
+                        for entry in parser.feed(decoder.decode(data)):
+                            yield entry
+                finally:
+                    if proc.poll() is None:
+                        proc.kill()
+                    exit_status = proc.wait()
+            stderr.seek(0)
+            stderr_text = stderr.read().decode("utf-8", "replace")
+
+        if exit_status != 0 and raise_exception:
+            raise CommandFailure(
+                "<{}> command failed with exit status {}: {}".format(
+                    self.command, exit_status, stderr_text.strip()))
 
 
 class SubProcessCommand(CommandWithSubCommand):
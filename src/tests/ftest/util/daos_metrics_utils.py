@@ -0,0 +1,160 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import re
+
+# Counters summed per engine to compare the load of each engine
+ENGINE_LOAD_METRICS = {
+    "ops": re.compile(r"^pool/[^/]+/ops/"),
+    "xferred": re.compile(r"^pool/[^/]+/xferred/"),
+}
+
+# Per-target I/O latency gauges, whose sample counts are the number of I/Os of each target
+TARGET_LATENCY_METRIC = re.compile(r"^io/latency/.*/(tgt_\d+)$")
+
+# Producer root directory prefixed to every metric name, e.g. "ID: 0/pool/..."
+PRODUCER_ROOT = re.compile(r"^ID: \d+/")
+
+
+def parse_daos_metrics(stdout):
+    """Parse the output of a daos_metrics --csv command.
+
+    The "ID: <N>/" producer root is removed from the metric names, e.g. the value of the
+    "ID: 0/pool/<uuid>/ops/update" metric is indexed by "pool/<uuid>/ops/update".
+
+    Args:
+        stdout (list): lines of the daos_metrics --csv output
+
+    Returns:
+        dict: (value, sample size) indexed by metric name. The sample size is None for metrics
+            other than stats gauges.
+
+    """
+    metrics = {}
+    for line in stdout:
+        fields = line.strip().split(",")
+        if len(fields) < 2 or fields[0] == "name":
+            continue
+        try:
+            value = float(fields[1])
+            samples = int(fields[5]) if len(fields) >= 7 and fields[5] else None
+        except ValueError:
+            continue
+        metrics[PRODUCER_ROOT.sub("", fields[0])] = (value, samples)
+    return metrics
+
+
+def get_daos_metrics_snapshot(server_manager):
+    """Get the metrics of every engine of every server.
+
+    Args:
+        server_manager (DaosServerManager): the servers to query
+
+    Returns:
+        dict: metrics from parse_daos_metrics() indexed by (host, engine). Engines whose
+            daos_metrics command failed are not included.
+
+    """
+    snapshot = {}
+    for engine, engine_results in enumerate(server_manager.get_daos_metrics()):
+        for host_results in engine_results:
+            if host_results["exit_status"] != 0:
+                server_manager.log.warning(
+                    "Error collecting daos_metrics for engine %s on %s (exit status %s): %s",
+                    engine, host_results["hosts"], host_results["exit_status"],
+                    "; ".join(host_results["stderr"]))
+                continue
+            metrics = parse_daos_metrics(host_results["stdout"])
+            for host in host_results["hosts"]:
+                snapshot[(str(host), engine)] = metrics
+    return snapshot
+
+
+def get_daos_metrics_delta(before, after):
+    """Get the change of each metric between two snapshots.
+
+    Args:
+        before (dict): snapshot from get_daos_metrics_snapshot()
+        after (dict): snapshot from get_daos_metrics_snapshot()
+
+    Returns:
+        dict: for each (host, engine), the (value, sample size) change of each metric that
+            changed. Metrics that only exist in the after snapshot are compared against zero.
+
+    """
+    delta = {}
+    for key, metrics in after.items():
+        previous = before.get(key, {})
+        delta[key] = {}
+        for name, (value, samples) in metrics.items():
+            old_value, old_samples = previous.get(name, (0.0, 0))
+            change = (
+                value - old_value,
+                None if samples is None else samples - (old_samples or 0))
+            if change[0] or change[1]:
+                delta[key][name] = change
+    return delta
+
+
+def get_daos_metrics_summary(delta, top=5):
+    """Summarize the per-engine imbalance and the hot targets of a snapshot delta.
+
+    Args:
+        delta (dict): delta from get_daos_metrics_delta()
+        top (int, optional): number of hot targets to report. Defaults to 5.
+
+    Returns:
+        dict: the summary, with the keys:
+            "engines": the ENGINE_LOAD_METRICS totals indexed by "<host>/<engine>"
+            "imbalance": max/mean ratio of each ENGINE_LOAD_METRICS total across the engines
+            "hot_targets": the (target, I/O count) of the top targets, as "<host>/<engine>/tgt_N"
+
+    """
+    engines = {}
+    targets = {}
+    for (host, engine), metrics in sorted(delta.items()):
+        name = "{}/{}".format(host, engine)
+        engines[name] = {load: 0.0 for load in ENGINE_LOAD_METRICS}
+        for metric, (value, samples) in metrics.items():
+            for load, regex in ENGINE_LOAD_METRICS.items():
+                if regex.match(metric):
+                    engines[name][load] += value
+            match = TARGET_LATENCY_METRIC.match(metric)
+            if match and samples:
+                target = "{}/{}".format(name, match.group(1))
+                targets[target] = targets.get(target, 0) + samples
+
+    imbalance = {}
+    for load in ENGINE_LOAD_METRICS:
+        totals = [values[load] for values in engines.values()]
+        mean = sum(totals) / len(totals) if totals else 0
+        imbalance[load] = max(totals) / mean if mean else None
+    return {
+        "engines": engines,
+        "imbalance": imbalance,
+        "hot_targets": sorted(targets.items(), key=lambda item: -item[1])[:top],
+    }
+
+
+def format_daos_metrics_summary(summary):
+    """Format a daos_metrics delta summary as a table.
+
+    Args:
+        summary (dict): summary from get_daos_metrics_summary()
+
+    Returns:
+        list: the lines of the table
+
+    """
+    lines = ["{:<32}  {:>16}  {:>20}".format("ENGINE", "OPS", "XFERRED")]
+    for name, values in summary["engines"].items():
+        lines.append("{:<32}  {:>16.0f}  {:>20.0f}".format(
+            name, values["ops"], values["xferred"]))
+    lines.append("Imbalance (max/mean): {}".format(", ".join(
+        "{} {}".format(load, "-" if ratio is None else "{:.2f}".format(ratio))
+        for load, ratio in summary["imbalance"].items())))
+    lines.append("Hot targets: {}".format(", ".join(
+        "{} ({})".format(target, count) for target, count in summary["hot_targets"]) or "-"))
+    return lines
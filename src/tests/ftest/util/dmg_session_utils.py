@@ -0,0 +1,169 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import json
+import os
+import select
+import shlex
+import tempfile
+import time
+from logging import getLogger
+from subprocess import Popen, PIPE     # nosec
+
+from avocado.utils.process import CmdResult
+
+from exception_utils import CommandFailure
+
+
+class DmgSession():
+    """A long-lived 'dmg session' process used to run multiple dmg commands.
+
+    Running commands through a session avoids the cost of starting a new dmg process, loading its
+    configuration and certificates, and connecting to the servers for every command.
+    """
+
+    END_MARKER = "DMG_SESSION_END "
+
+    def __init__(self, command, env=None):
+        """Create a DmgSession object.
+
+        Args:
+            command (str): command used to start the dmg session, e.g. '/usr/bin/dmg session'
+            env (dict, optional): additional environment variables for the dmg session. Defaults
+                to None.
+        """
+        self.log = getLogger()
+        self.command = command
+        self.env = env
+        self._process = None
+        self._stderr = None
+        self._buffer = b""
+
+    @property
+    def running(self):
+        """Determine if the dmg session process is running.
+
+        Returns:
+            bool: True if the dmg session process is running
+
+        """
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Start the dmg session process if it is not already running."""
+        if self.running:
+            return
+        self.stop()
+        env = os.environ.copy()
+        if self.env:
+            env.update(self.env)
+        self.log.info("Starting dmg session: %s", self.command)
+        self._stderr = tempfile.TemporaryFile()
+        self._buffer = b""
+        self._process = Popen(
+            shlex.split(self.command), stdin=PIPE, stdout=PIPE, stderr=self._stderr, env=env)
+
+    def stop(self):
+        """Stop the dmg session process."""
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.stdin.close()
+                try:
+                    self._process.wait(timeout=10)
+                except Exception:     # pylint: disable=broad-except
+                    self._process.kill()
+                    self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    def _read_until_marker(self, timeout):
+        """Read the dmg session output until the end of the current command.
+
+        Args:
+            timeout (int): maximum number of seconds to wait for the command to complete or None
+                to wait indefinitely
+
+        Returns:
+            tuple: the command stdout (bytes) and the decoded end marker data (dict), which is None
+                if the command did not complete
+
+        """
+        marker = self.END_MARKER.encode()
+        fd = self._process.stdout.fileno()
+        start = time.time()
+        output = []
+        while True:
+            # Check for a complete end marker line in the buffered output
+            index = self._buffer.find(marker)
+            if index >= 0:
+                end = self._buffer.find(b"\n", index)
+                if end >= 0:
+                    output.append(self._buffer[:index])
+                    data = json.loads(self._buffer[index + len(marker):end])
+                    self._buffer = self._buffer[end + 1:]
+                    return b"".join(output), data
+
+            remaining = None
+            if timeout is not None:
+                remaining = timeout - (time.time() - start)
+                if remaining <= 0:
+                    break
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                break
+            data = os.read(fd, 1048576)
+            if not data:
+                # The dmg session process has exited
+                break
+            self._buffer += data
+
+        output.append(self._buffer)
+        self._buffer = b""
+        return b"".join(output), None
+
+    def run(self, command, args, timeout=None):
+        """Run a dmg command in the dmg session.
+
+        Args:
+            command (str): the full dmg command being run, used to report the results
+            args (list): dmg command arguments, excluding the dmg executable
+            timeout (int, optional): maximum number of seconds to wait for the command to complete.
+                Defaults to None.
+
+        Returns:
+            CmdResult: result of the command. If the command did not complete the dmg session is
+                stopped and the result is marked as interrupted.
+
+        """
+        self.start()
+        self._stderr.seek(0, os.SEEK_END)
+        stderr_start = self._stderr.tell()
+        start = time.time()
+        try:
+            self._process.stdin.write(json.dumps(args).encode() + b"\n")
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as error:
+            raise CommandFailure(
+                "Error writing to the dmg session running '{}': {}".format(command, error)) \
+                from error
+        stdout, marker = self._read_until_marker(timeout)
+        self._stderr.seek(stderr_start)
+        stderr = self._stderr.read()
+        result = CmdResult(
+            command=command, stdout=stdout, stderr=stderr, duration=time.time() - start,
+            pid=self._process.pid)
+        if marker is None:
+            result.exit_status = -1 if self.running else self._process.returncode
+            result.interrupted = self.running
+            if result.interrupted:
+                # The session is busy with the command, so do not wait for it to exit
+                self._process.kill()
+            self.stop()
+        else:
+            result.exit_status = marker["exit_status"]
+        return result
@@ -817,6 +817,25 @@ class DmgCommand(DmgCommandBase):
         return self._get_json_result(
             ("pool", "list"), no_query=no_query, verbose=verbose)
 
+    def iter_pool_list(self, no_query=False, verbose=False):
+        """List pools, yielding each pool entry as it is read from the command output.
+
+        Useful on large systems where the dmg pool list output is too large to be decoded at once.
+
+        Args:
+            no_query (bool, optional): If True, do not query for pool stats.
+            verbose (bool, optional): If True, use verbose mode.
+
+        Raises:
+            CommandFailure: if the dmg pool pool list command fails.
+
+        Yields:
+            dict: each pool entry from the dmg pool list json 'pools' output
+
+        """
+        yield from self.iter_json_entries(
+            ("response", "pools"), ("pool", "list"), no_query=no_query, verbose=verbose)
+
     def pool_set_prop(self, pool, properties):
         """Set property for a given Pool.
 
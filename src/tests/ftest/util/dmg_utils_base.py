@@ -3,13 +3,18 @@
 
   SPDX-License-Identifier: BSD-2-Clause-Patent
 """
+import os
+import shlex
 from socket import gethostname
 
 from ClusterShell.NodeSet import NodeSet
 
 from command_utils_base import FormattedParameter, CommandWithParameters, BasicParameter
 from command_utils import CommandWithSubCommand, YamlCommand
+from dmg_session_utils import DmgSession
+from exception_utils import CommandFailure
 from general_utils import nodeset_append_suffix
+from run_utils import command_as_user
 
 
 class DmgCommandBase(YamlCommand):
@@ -44,6 +49,104 @@ class DmgCommandBase(YamlCommand):
         self.debug = FormattedParameter("-d", True)
         self.json = FormattedParameter("-j", False)
 
+        # Optional long-lived dmg session process used to run each dmg command
+        self.session = None
+
+    def copy(self):
+        """Get a copy of this dmg command that can be run at the same time as this one.
+
+        The copy uses the same configuration file, host list and settings, but not the same
+        sub-command, result or dmg session, e.g. to run dmg commands from another thread.
+
+        Returns:
+            DmgCommandBase: the copy of this dmg command
+
+        """
+        dmg = type(self)(self._path, self.yaml, self.hostlist_suffix)
+        for name in ("_hostlist", "hostfile", "configpath", "insecure", "debug", "json"):
+            getattr(dmg, name).update(getattr(self, name).value)
+        for name in ("temporary_file", "temporary_file_hosts", "certificate_owner", "timeout",
+                     "exit_status_exception", "output_check", "verbose", "run_user"):
+            setattr(dmg, name, getattr(self, name))
+        dmg.env = self.env.copy()
+        return dmg
+
+    def start_session(self):
+        """Route all subsequent dmg commands through a long-lived dmg session process.
+
+        The dmg session process is started when the next dmg command is run, after its
+        configuration file has been created.
+        """
+        if self.session is None:
+            command = [os.path.join(self._path, self._command)]
+            for param in (self.configpath, self.insecure):
+                if str(param):
+                    command.append(str(param))
+            command.append("session")
+            self.session = DmgSession(command_as_user(" ".join(command), self.run_user), self.env)
+
+    def stop_session(self):
+        """Stop the dmg session process and resume running each dmg command as a new process."""
+        if self.session is not None:
+            self.session.stop()
+            self.session = None
+
+    def _run_process(self, raise_exception=None):
+        """Run the command as a foreground process or through the dmg session if started.
+
+        Args:
+            raise_exception (bool, optional): whether or not to raise an exception if the command
+                fails. This overrides the self.exit_status_exception
+                setting if defined. Defaults to None.
+
+        Raises:
+            CommandFailure: if there is an error running the command
+
+        Returns:
+            CmdResult: result of the command
+
+        """
+        if self.session is None:
+            return super()._run_process(raise_exception)
+
+        # Clear any previous run results
+        self.result = None
+        command = str(self)
+        if raise_exception is None:
+            raise_exception = self.exit_status_exception
+
+        # Only send the arguments following the dmg executable to the session
+        args = shlex.split(command)
+        for index, arg in enumerate(args):
+            if os.path.basename(arg) == self._command:
+                args = args[index + 1:]
+                break
+
+        if self.verbose:
+            self.log.info("Running '%s' in the dmg session", command)
+        self.result = self.session.run(command, args, self.timeout)
+        if self.verbose:
+            self.log.info(
+                "Command '%s' finished with %s after %.3fs",
+                command, self.result.exit_status, self.result.duration)
+            for line in self.result.stdout_text.splitlines():
+                self.log.debug("  [stdout] %s", line)
+            for line in self.result.stderr_text.splitlines():
+                self.log.debug("  [stderr] %s", line)
+
+        if raise_exception and self.result.interrupted:
+            raise CommandFailure(
+                "Timeout detected running '{}' with a {}s timeout".format(command, self.timeout))
+        if raise_exception and self.result.exit_status != 0:
+            raise CommandFailure(
+                "Error occurred running '{}': {}".format(command, self.result))
+        if raise_exception and not self.check_results():
+            # Command failed if its output contains bad keywords
+            raise CommandFailure(
+                "<{}> command failed: Error messages detected in output".format(self.command))
+
+        return self.result
+
     @property
     def hostlist(self):
         """Get the hostlist that was set.
@@ -3,14 +3,25 @@
 
   SPDX-License-Identifier: BSD-2-Clause-Patent
 """
+import os
+
 from dfuse_test_base import DfuseTestBase
 from fio_utils import FioCommand
 from daos_utils import DaosCommand
+from latency_utils import get_latency_metrics
+from performance_results_utils import PerformanceResultsDB
 
 
 class FioBase(DfuseTestBase):
     """Base fio class.
 
+    Optional yaml config values:
+        fio/latency_capture (bool): whether to collect the fio completion latency histograms and
+            record their percentiles. Defaults to False.
+        fio/results_db (str): SQLite database in which to store the latency percentiles and
+            against which they are compared. Defaults to */data/fio_latency.db, which is specific
+            to each test run and so has no history to compare against.
+
     :avocado: recursive
     """
 
@@ -20,6 +31,7 @@ class FioBase(DfuseTestBase):
         self.fio_cmd = None
         self.processes = None
         self.manager = None
+        self.results_db = None
 
     def setUp(self):
         """Set up each test case."""
@@ -34,6 +46,9 @@ class FioBase(DfuseTestBase):
         self.fio_cmd.get_params(self)
         self.processes = self.params.get("np", '/run/fio/client_processes/*')
         self.manager = self.params.get("manager", '/run/fio/*', "MPICH")
+        if self.fio_cmd.latency_capture.value:
+            self.results_db = PerformanceResultsDB(self.params.get(
+                "results_db", '/run/fio/*', os.path.join(self.outputdir, "fio_latency.db")))
 
     def execute_fio(self, directory=None, stop_dfuse=True):
         """Runner method for Fio.
@@ -71,6 +86,24 @@ class FioBase(DfuseTestBase):
         # Run Fio
         self.fio_cmd.hosts = self.hostlist_clients
         self.fio_cmd.run()
+        if self.fio_cmd.latency:
+            self.record_latency()
 
         if stop_dfuse:
             self.stop_dfuse()
+
+    def record_latency(self):
+        """Store the fio latency percentiles and compare them against previous results."""
+        metrics = get_latency_metrics(self.fio_cmd.latency)
+        key = {
+            "test": self.test_id + self.name.str_variant,
+            "git_commit": os.environ.get("GIT_COMMIT", "unknown"),
+            "oclass": None,
+            "ppn": None,
+            "hardware": "{}s{}c".format(len(self.hostlist_servers), len(self.hostlist_clients))}
+        results = self.results_db.compare(key, metrics)
+        self.results_db.add(key, metrics)
+        for result in results:
+            self.log.info("Result %s", result)
+            if result.is_regression():
+                self.log.warning("REGRESSION %s", result)
@@ -3,9 +3,13 @@
 
   SPDX-License-Identifier: BSD-2-Clause-Patent
 """
+import os
+
 from ClusterShell.NodeSet import NodeSet
 
 from general_utils import pcmd
+from latency_utils import LatencyHistogram, get_fio_latency
+from run_utils import run_remote
 from command_utils_base import BasicParameter, FormattedParameter, CommandWithParameters
 from exception_utils import CommandFailure
 from command_utils import ExecutableCommand
@@ -67,6 +71,13 @@ class FioCommand(ExecutableCommand):
         self.names = BasicParameter(None)
         self._jobs = {}
 
+        # Whether to collect the completion latency histograms of every host.  The fio output is
+        # written in the json+ format to the --output file, which defaults to a file in /tmp.
+        self.latency_capture = BasicParameter(None, False)
+
+        # LatencyHistogram of each I/O direction, aggregated across hosts, from the last run
+        self.latency = {}
+
         # List of hosts on which the fio command will run.  If not defined the
         # fio command will run locally
         self._hosts = None
@@ -164,6 +175,12 @@ class FioCommand(ExecutableCommand):
             CommandFailure: if there is an error running the command
 
         """
+        self.latency = {}
+        if self.latency_capture.value:
+            self.output_format.update("json+")
+            if not self.output.value:
+                self.output.update("/tmp/fio_latency_{}.json".format(os.getpid()))
+
         if not self._hosts:
             # Run fio locally
             self.log.debug("Running: %s", str(self))
@@ -183,6 +200,26 @@ class FioCommand(ExecutableCommand):
                     "Error running fio on the following hosts: {}".format(
                         ", ".join(failed)))
 
+        if self.latency_capture.value:
+            self._get_latency()
+
+    def _get_latency(self):
+        """Collect the completion latency histograms from the fio output file of every host."""
+        if not self._hosts:
+            with open(self.output.value, "r", encoding="utf-8") as output:
+                outputs = [(1, output.read())]
+        else:
+            result = run_remote(
+                self.log, self._hosts, "cat {}".format(self.output.value), verbose=False)
+            outputs = [
+                (len(data.hosts), "\n".join(data.stdout)) for data in result.output
+                if data.returncode == 0]
+        for weight, output in outputs:
+            for direction, histogram in get_fio_latency(output).items():
+                self.latency.setdefault(direction, LatencyHistogram()).merge(histogram, weight)
+        for direction, histogram in sorted(self.latency.items()):
+            self.log.info("fio %s completion latency: %s", direction, histogram)
+
     class FioJob(CommandWithParameters):
         # pylint: disable=too-many-instance-attributes
         """Defines a object representing a fio job sub-command."""
@@ -23,7 +23,7 @@ from ClusterShell.Task import task_self
 from ClusterShell.NodeSet import NodeSet
 
 from user_utils import get_chown_command, get_primary_group
-from run_utils import get_clush_command, run_remote, run_local, RunException
+from run_utils import get_clush_command, run_remote, run_local, iter_remote, RunException
 
 
 class DaosTestError(Exception):
@@ -835,6 +835,7 @@ def dump_engines_stacks(hosts, verbose=True, timeout=60, added_filter=None):
                 0   No engine matched the criteria / No engine signaled.
                 1   One or more engine matched the criteria and a signal was
                     sent.
+                None The command timed out on the host.
 
     """
     result = {}
@@ -860,7 +861,12 @@ def dump_engines_stacks(hosts, verbose=True, timeout=60, added_filter=None):
             "fi",
             "exit $rc",
         ]
-        result = pcmd(hosts, "; ".join(commands), verbose, timeout, None)
+        # Report the engines on each host as soon as they have been signaled
+        for host_result in iter_remote(log, hosts, "; ".join(commands), verbose, timeout):
+            return_code = None if host_result.timeout else host_result.returncode
+            if return_code not in result:
+                result[return_code] = NodeSet()
+            result[return_code].add(host_result.host)
 
     return result
 
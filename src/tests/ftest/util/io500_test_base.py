@@ -0,0 +1,182 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import math
+
+from performance_test_base import PerformanceTestBase
+
+
+class Io500TestBase(PerformanceTestBase):
+    # pylint: disable=too-many-ancestors
+    """Base IO500-style composite benchmark class.
+
+    The ior_easy, ior_hard, mdtest_easy and mdtest_hard workloads are run in IO500 order against a
+    single pool, with one container per workload that is kept between its write and read phases.
+    The bandwidth score is the geometric mean of the IOR phases in GiB/s, the metadata score the
+    geometric mean of the MDTest phases in kIOPS and the total score the geometric mean of both.
+
+    The IO500 find phase is not run, as there is no parallel find tool in the test environment.
+
+    Required yaml config values, for each configuration to compare:
+        <config>/ior_easy, <config>/ior_hard (str): IOR namespaces, with stonewalling
+        <config>/mdtest_easy, <config>/mdtest_hard (str): MDTest namespaces, with stonewalling
+            and a separate stonewall_statusfile for each workload
+
+    Optional yaml config values:
+        <config>/use_intercept (bool): whether to use the interception library with dfuse.
+            Defaults to True.
+
+    :avocado: recursive
+    """
+
+    # (phase name, workload, IOR phase or MDTest flag) in IO500 order
+    PHASES = (
+        ("ior-easy-write", "ior_easy", "write"),
+        ("mdtest-easy-write", "mdtest_easy", "-C"),
+        ("ior-hard-write", "ior_hard", "write"),
+        ("mdtest-hard-write", "mdtest_hard", "-C"),
+        ("ior-easy-read", "ior_easy", "read"),
+        ("mdtest-easy-stat", "mdtest_easy", "-T"),
+        ("ior-hard-read", "ior_hard", "read"),
+        ("mdtest-hard-stat", "mdtest_hard", "-T"),
+        ("mdtest-easy-delete", "mdtest_easy", "-r"),
+        ("mdtest-hard-read", "mdtest_hard", "-E"),
+        ("mdtest-hard-delete", "mdtest_hard", "-r"),
+    )
+
+    # MDTest rate reported for each phase flag
+    MDTEST_RATES = {
+        "-C": "file_creation",
+        "-T": "file_stat",
+        "-E": "file_read",
+        "-r": "file_removal",
+    }
+
+    @staticmethod
+    def get_mdtest_phase_flags(flags, phase):
+        """Get the MDTest flags to run a single phase.
+
+        Args:
+            flags (str): MDTest flags from the yaml
+            phase (str): phase flag, e.g. "-C"
+
+        Returns:
+            str: the flags with every other phase flag removed
+
+        """
+        others = set(Io500TestBase.MDTEST_RATES) - {phase}
+        return " ".join([flag for flag in flags.split() if flag not in others] + [phase])
+
+    @staticmethod
+    def get_score(values):
+        """Get the geometric mean of a list of phase results.
+
+        Args:
+            values (list): phase results
+
+        Returns:
+            float: the geometric mean, or 0 if any phase result is not positive
+
+        """
+        if not values or min(values) <= 0:
+            return 0.0
+        return math.exp(sum(math.log(value) for value in values) / len(values))
+
+    def run_io500(self, config):
+        """Run the IO500 phases for a configuration.
+
+        Args:
+            config (str): yaml namespace of the configuration, e.g. "/run/io500_sx/*"
+
+        Returns:
+            dict: the "phases" results and the "bw", "md" and "total" scores
+
+        """
+        namespaces = {
+            workload: self.params.get(workload, config)
+            for workload in ("ior_easy", "ior_hard", "mdtest_easy", "mdtest_hard")}
+        missing = [workload for workload, namespace in namespaces.items() if not namespace]
+        if missing:
+            self.fail("Missing {} namespace(s) for {}".format(", ".join(missing), config))
+        use_intercept = self.params.get("use_intercept", config, True)
+
+        # All of the workloads share the pool created by the first phase
+        pool = None
+        containers = {}
+        phases = {}
+        for name, workload, phase in self.PHASES:
+            self.log_performance("IO500 phase {} ({})".format(name, namespaces[workload]))
+            if workload.startswith("ior"):
+                results = self.run_performance_ior(
+                    namespace=namespaces[workload], use_intercept=use_intercept,
+                    phases=(phase,), pool=pool, container=containers.get(workload),
+                    record=False)
+                # GiB/s
+                phases[name] = results[phase].bw_mean / 1024
+            else:
+                flags = self.params.get("flags", namespaces[workload], "")
+                metrics = self.run_performance_mdtest(
+                    namespace=namespaces[workload],
+                    flags=self.get_mdtest_phase_flags(flags, phase), pool=pool,
+                    container=containers.get(workload), record=False)
+                # kIOPS
+                phases[name] = getattr(metrics.rates, self.MDTEST_RATES[phase]).mean / 1000
+            pool = self.pool
+            containers[workload] = self.container
+            self.log_performance("IO500 phase {}: {:.3f}".format(name, phases[name]))
+
+        # Start the next configuration with an empty pool
+        errors = self.destroy_containers(list(containers.values()))
+        errors.extend(self.destroy_pools(pool))
+        if errors:
+            self.fail("Errors destroying the {} pool and containers: {}".format(config, errors))
+        self.container = None
+        self.pool = None
+
+        bw_score = self.get_score(
+            [value for name, value in phases.items() if name.startswith("ior")])
+        md_score = self.get_score(
+            [value for name, value in phases.items() if name.startswith("mdtest")])
+        return {
+            "phases": phases,
+            "bw": bw_score,
+            "md": md_score,
+            "total": math.sqrt(bw_score * md_score),
+        }
+
+    def run_io500_configs(self, configs):
+        """Run the IO500 phases for each configuration and report them side by side.
+
+        The scores of each configuration are recorded with record_performance() and compared
+        against previous runs.
+
+        Args:
+            configs (list): yaml namespaces of each configuration
+
+        Returns:
+            dict: results from run_io500() indexed by configuration
+
+        """
+        reports = {}
+        for config in configs:
+            reports[config] = self.run_io500(config)
+            self.record_performance(
+                config, {"io500_{}".format(key): reports[config][key]
+                         for key in ("bw", "md", "total")})
+
+        names = [name for name, _, _ in self.PHASES] + ["bw (GiB/s)", "md (kIOPS)", "total"]
+        lines = ["IO500 report", "{:<20}".format("") + "".join(
+            "{:>24}".format(config) for config in configs)]
+        for index, name in enumerate(names):
+            values = []
+            for config in configs:
+                if index < len(self.PHASES):
+                    values.append(reports[config]["phases"][name])
+                else:
+                    values.append(reports[config][("bw", "md", "total")[index - len(self.PHASES)]])
+            lines.append(
+                "{:<20}".format(name) + "".join("{:>24.3f}".format(value) for value in values))
+        self.log_performance(lines)
+        return reports
@@ -3,6 +3,7 @@
 
 SPDX-License-Identifier: BSD-2-Clause-Patent
 """
+import json
 import os
 import re
 import uuid
@@ -13,6 +14,7 @@ from command_utils_base import FormattedParameter, BasicParameter
 from exception_utils import CommandFailure
 from command_utils import SubProcessCommand
 from general_utils import get_log_file
+from latency_utils import get_ior_latency
 
 
 def run_ior(test, manager, log, hosts, path, slots, group, pool, container, processes, ppn=None,
@@ -171,6 +173,7 @@ class IorCommand(SubProcessCommand):
         #                       processing this number of iterations
         #   -O=STRING       stoneWallingStatusFile -- file to keep number of
         #                      iterations from stonewalling during write
+        #   -O=STRING       summaryFormat -- format for the summary [default|JSON|CSV]
         #   -Q=1            taskPerNodeOffset for read tests
         #   -s=1            segmentCount -- number of segments
         #   -t=262144       transferSize -- size of transfer in bytes
@@ -197,6 +200,7 @@ class IorCommand(SubProcessCommand):
             "-O stoneWallingWearOutIterations={}")
         self.sw_status_file = FormattedParameter(
             "-O stoneWallingStatusFile={}")
+        self.summary_format = FormattedParameter("-O summaryFormat={}")
         self.task_offset = FormattedParameter("-Q {}")
         self.segment_count = FormattedParameter("-s {}")
         self.transfer_size = FormattedParameter("-t {}")
@@ -565,3 +569,150 @@ class Ior:
                     pool.display_space()
             if error_message:
                 raise CommandFailure(error_message)
+
+
+class IorResult():
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Summary of a single IOR operation, e.g. write or read.
+
+    Bandwidths are in MiB/s, rates in operations per second and times in seconds.
+    """
+
+    # IOR JSON summary keys for each attribute
+    JSON_KEYS = {
+        "operation": "operation",
+        "api": "API",
+        "bw_max": "bwMaxMIB",
+        "bw_min": "bwMinMIB",
+        "bw_mean": "bwMeanMIB",
+        "bw_stddev": "bwStdMIB",
+        "ops_max": "OPsMax",
+        "ops_min": "OPsMin",
+        "ops_mean": "OPsMean",
+        "ops_stddev": "OPsSD",
+        "mean_time": "MeanTime",
+        "num_tasks": "numTasks",
+        "tasks_per_node": "tasksPerNode",
+        "repetitions": "repetitions",
+        "block_size": "blockSize",
+        "transfer_size": "transferSize",
+    }
+
+    # IorMetrics column for each attribute in the text summary
+    TEXT_COLUMNS = {
+        "operation": IorMetrics.OPERATION,
+        "api": IorMetrics.API,
+        "bw_max": IorMetrics.MAX_MIB,
+        "bw_min": IorMetrics.MIN_MIB,
+        "bw_mean": IorMetrics.MEAN_MIB,
+        "bw_stddev": IorMetrics.STDDEV_MIB,
+        "ops_max": IorMetrics.MAX_OPS,
+        "ops_min": IorMetrics.MIN_OPS,
+        "ops_mean": IorMetrics.MEAN_OPS,
+        "ops_stddev": IorMetrics.STDDEV_OPS,
+        "mean_time": IorMetrics.MEAN_SECONDS,
+        "num_tasks": IorMetrics.NUM_TASKS,
+        "tasks_per_node": IorMetrics.TPN,
+        "repetitions": IorMetrics.REPS,
+        "block_size": IorMetrics.BLKSIZ,
+        "transfer_size": IorMetrics.XSIZE,
+    }
+
+    STR_ATTRS = ("operation", "api")
+    INT_ATTRS = ("num_tasks", "tasks_per_node", "repetitions", "block_size", "transfer_size")
+
+    def __init__(self, values):
+        """Initialize an IorResult object.
+
+        Args:
+            values (dict): value of each attribute in JSON_KEYS; missing values are set to None
+        """
+        for name in self.JSON_KEYS:
+            value = values.get(name)
+            if value is not None and name not in self.STR_ATTRS:
+                value = int(value) if name in self.INT_ATTRS else float(value)
+            setattr(self, name, value)
+        # Change of the server daos_metrics during the operation, if collected
+        self.daos_metrics = None
+        # LatencyHistogram of the operation, only available from the JSON output
+        self.latency = None
+
+    def __repr__(self):
+        """Get the representation of this object.
+
+        Returns:
+            str: the IorResult attributes
+
+        """
+        return "IorResult({})".format(
+            ", ".join("{}={}".format(name, getattr(self, name)) for name in self.JSON_KEYS))
+
+    @classmethod
+    def from_json(cls, summary):
+        """Create an IorResult from an entry in the IOR JSON summary list.
+
+        Args:
+            summary (dict): IOR JSON summary entry
+
+        Returns:
+            IorResult: the result of the operation
+
+        """
+        return cls({name: summary.get(key) for name, key in cls.JSON_KEYS.items()})
+
+    @classmethod
+    def from_text(cls, metrics):
+        """Create an IorResult from a row of the IOR text summary.
+
+        Args:
+            metrics (list): IOR summary row split into columns indexed by IorMetrics
+
+        Returns:
+            IorResult: the result of the operation
+
+        """
+        values = {}
+        for name, column in cls.TEXT_COLUMNS.items():
+            if column < len(metrics):
+                values[name] = metrics[column]
+        return cls(values)
+
+
+def get_ior_results(output):
+    """Get the summary of each operation from IOR output.
+
+    Output produced with summaryFormat=JSON is parsed as JSON, ignoring any text printed before the
+    JSON document, e.g. by the job manager. Otherwise the default text summary is parsed.
+
+    With the JSON output the latency of each operation is also set to a histogram of the mean
+    latency of each iteration.
+
+    Args:
+        output (str): IOR output
+
+    Raises:
+        CommandFailure: if no summary is found in the output
+
+    Returns:
+        list: an IorResult for each operation in the summary
+
+    """
+    start = output.find("{")
+    while start >= 0:
+        try:
+            document = json.JSONDecoder().raw_decode(output, start)[0]
+        except ValueError:
+            document = None
+        if isinstance(document, dict) and "summary" in document:
+            results = [IorResult.from_json(entry) for entry in document["summary"]]
+            latency = get_ior_latency(document)
+            for result in results:
+                result.latency = latency.get(result.operation)
+            return results
+        start = output.find("{", start + 1)
+
+    try:
+        metrics = IorCommand.get_ior_metrics(output)
+    except (ValueError, IndexError) as error:
+        raise CommandFailure("IOR summary not found in the output") from error
+    return [IorResult.from_text(row) for row in metrics if row]
@@ -0,0 +1,205 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import json
+import math
+
+# Percentiles reported for each latency histogram
+LATENCY_PERCENTILES = (50.0, 99.0, 99.9)
+
+
+def get_percentile_name(percentile):
+    """Get the short name of a percentile, e.g. p50, p99 or p999.
+
+    Args:
+        percentile (float): the percentile
+
+    Returns:
+        str: the percentile name
+
+    """
+    return "p{}".format(("{:g}".format(percentile)).replace(".", ""))
+
+
+class LatencyHistogram():
+    """Histogram of operation latencies in nanoseconds.
+
+    Histograms from several clients are combined with merge(), so that the percentiles are those of
+    every operation rather than an average of the percentiles of each client.
+    """
+
+    def __init__(self, bins=None):
+        """Initialize a LatencyHistogram object.
+
+        Args:
+            bins (dict, optional): number of operations indexed by latency. Defaults to None.
+        """
+        self.bins = {}
+        for latency, count in (bins or {}).items():
+            self.add(latency, count)
+
+    @property
+    def count(self):
+        """Get the number of operations in the histogram.
+
+        Returns:
+            int: the number of operations
+
+        """
+        return sum(self.bins.values())
+
+    def add(self, latency, count=1):
+        """Add operations to the histogram.
+
+        Args:
+            latency (int): latency of the operations in nanoseconds
+            count (int, optional): number of operations. Defaults to 1.
+        """
+        latency = int(latency)
+        self.bins[latency] = self.bins.get(latency, 0) + int(count)
+
+    def merge(self, other, weight=1):
+        """Add the operations of another histogram to this one.
+
+        Args:
+            other (LatencyHistogram): the histogram to add
+            weight (int, optional): number of times to add it, e.g. when several clients reported
+                the same output. Defaults to 1.
+        """
+        for latency, count in other.bins.items():
+            self.add(latency, count * weight)
+
+    def get_mean(self):
+        """Get the mean latency of the operations.
+
+        Returns:
+            float: the mean latency in nanoseconds or None if the histogram is empty
+
+        """
+        total = self.count
+        if not total:
+            return None
+        return sum(latency * count for latency, count in self.bins.items()) / total
+
+    def get_percentile(self, percentile):
+        """Get the latency below which a percentage of the operations completed.
+
+        Args:
+            percentile (float): the percentage, e.g. 99.9
+
+        Returns:
+            int: the latency in nanoseconds or None if the histogram is empty
+
+        """
+        total = self.count
+        if not total:
+            return None
+        rank = max(1, math.ceil(total * percentile / 100))
+        seen = 0
+        for latency in sorted(self.bins):
+            seen += self.bins[latency]
+            if seen >= rank:
+                return latency
+        return max(self.bins)
+
+    def get_percentiles(self, percentiles=LATENCY_PERCENTILES):
+        """Get the latency of each percentile.
+
+        Args:
+            percentiles (tuple, optional): the percentiles. Defaults to LATENCY_PERCENTILES.
+
+        Returns:
+            dict: latency in nanoseconds indexed by percentile name, e.g. "p99"
+
+        """
+        return {
+            get_percentile_name(percentile): self.get_percentile(percentile)
+            for percentile in percentiles}
+
+    def __str__(self):
+        """Get a description of the histogram percentiles.
+
+        Returns:
+            str: the number of operations and the latency of each percentile in microseconds
+
+        """
+        if not self.count:
+            return "no operations"
+        return "{} ops, {}".format(self.count, ", ".join(
+            "{} {:.1f}us".format(name, value / 1000)
+            for name, value in self.get_percentiles().items()))
+
+
+def get_latency_metrics(histograms, percentiles=LATENCY_PERCENTILES):
+    """Get the latency percentiles of each operation as performance metrics.
+
+    Args:
+        histograms (dict): a LatencyHistogram indexed by operation, e.g. "write" or "read"
+        percentiles (tuple, optional): the percentiles. Defaults to LATENCY_PERCENTILES.
+
+    Returns:
+        dict: latency in microseconds indexed by metric name, e.g. "write_lat_p99"
+
+    """
+    metrics = {}
+    for operation, histogram in histograms.items():
+        for name, value in histogram.get_percentiles(percentiles).items():
+            if value is not None:
+                metrics["{}_lat_{}".format(operation, name)] = value / 1000
+    return metrics
+
+
+def get_fio_latency(output):
+    """Get the completion latency histogram of each I/O direction from fio json+ output.
+
+    The per-bucket counts in the clat_ns "bins" are only reported with --output-format=json+.
+
+    Args:
+        output (str): fio output
+
+    Returns:
+        dict: a LatencyHistogram indexed by I/O direction, e.g. "read" or "write"
+
+    """
+    histograms = {}
+    start = output.find("{")
+    document = None
+    while start >= 0 and document is None:
+        try:
+            document = json.JSONDecoder().raw_decode(output, start)[0]
+        except ValueError:
+            start = output.find("{", start + 1)
+    for job in (document or {}).get("jobs", []):
+        for direction in ("read", "write", "trim", "sync"):
+            bins = job.get(direction, {}).get("clat_ns", {}).get("bins")
+            if bins:
+                histograms.setdefault(direction, LatencyHistogram()).merge(
+                    LatencyHistogram(bins))
+    return histograms
+
+
+def get_ior_latency(document):
+    """Get a histogram of the mean operation latency of each IOR iteration.
+
+    IOR only reports the mean latency of each iteration rather than that of each operation, so the
+    histogram only describes the mean latency; use LatencyHistogram.get_mean().
+
+    Args:
+        document (dict): IOR output produced with summaryFormat=JSON
+
+    Returns:
+        dict: a LatencyHistogram indexed by operation, e.g. "write" or "read"
+
+    """
+    histograms = {}
+    entries = [test.get("Results", []) for test in document.get("tests", [])]
+    while entries:
+        entry = entries.pop()
+        if isinstance(entry, list):
+            entries.extend(entry)
+        elif isinstance(entry, dict) and entry.get("latency") is not None:
+            histograms.setdefault(entry.get("access"), LatencyHistogram()).add(
+                float(entry["latency"]) * 1e9)
+    return histograms
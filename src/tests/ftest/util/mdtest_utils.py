@@ -208,6 +208,8 @@ class MdtestMetrics():
         """
         self.rates = MdtestMetrics.MdtestMetricsGroup()
         self.times = MdtestMetrics.MdtestMetricsGroup()
+        # Change of the server daos_metrics during the run, if collected
+        self.daos_metrics = None
         if output is not None:
             self.parse_output(output)
 
@@ -221,6 +223,32 @@ class MdtestMetrics():
         self._parse_output_group(output, self.rates, "rate")
         self._parse_output_group(output, self.times, "time")
 
+    # Metric row, e.g. "   File creation   :   1234.567   1000.000   1100.000   50.000"
+    _METRIC_RE = re.compile(
+        r"^\s*(\w+) (\w+)\s*:?\s+([-+.\deE]+)\s+([-+.\deE]+)\s+([-+.\deE]+)"
+        r"\s+([-+.\deE]+)\s*$")
+
+    def get_results(self):
+        """Get the parsed metrics as a flat dictionary.
+
+        Operations that were not reported by mdtest are omitted.
+
+        Returns:
+            dict: metric values indexed by "<group>.<operation>.<stat>", e.g.
+                "rates.file_creation.max"
+
+        """
+        results = {}
+        for group_name in ("rates", "times"):
+            group = getattr(self, group_name)
+            for operation_name, operation in vars(group).items():
+                if not any((operation.max, operation.min, operation.mean, operation.stddev)):
+                    continue
+                for stat in ("max", "min", "mean", "stddev"):
+                    results[".".join((group_name, operation_name, stat))] = getattr(
+                        operation, stat)
+        return results
+
     @staticmethod
     def _parse_output_group(output, group_obj, group_suffix):
         """Parse an output group.
@@ -237,22 +265,16 @@ class MdtestMetrics():
         if not match:
             return
 
-        # Split into individual metric lines, skipping over headers
-        for metric_line in match.group(0).splitlines()[3:]:
-            if not metric_line:
-                continue
-            metric_vals = metric_line.split()
-            if not metric_vals:
+        # Only parse the metric rows, skipping over headers and separators
+        for metric_line in match.group(0).splitlines():
+            metric_match = MdtestMetrics._METRIC_RE.match(metric_line)
+            if not metric_match:
                 continue
             # Name is, for example, "File" + " " + "creation"
             # Convert to "file_creation"
-            operation_name = metric_vals[0] + ' ' + metric_vals[1]
-            operation_name = operation_name.lower().replace(" ", "_")
-            try:
-                operation = getattr(group_obj, operation_name)
-                operation.max = float(metric_vals[2])
-                operation.min = float(metric_vals[3])
-                operation.mean = float(metric_vals[4])
-                operation.stddev = float(metric_vals[5])
-            except AttributeError:
-                pass
+            operation_name = "_".join(metric_match.group(1, 2)).lower()
+            operation = getattr(group_obj, operation_name, None)
+            if not isinstance(operation, MdtestMetrics.MdtestMetricsOperation):
+                continue
+            operation.max, operation.min, operation.mean, operation.stddev = map(
+                float, metric_match.group(3, 4, 5, 6))
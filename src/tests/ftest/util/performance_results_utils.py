@@ -0,0 +1,223 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import math
+import sqlite3
+import time
+
+# One-sided 95% Student's t critical values indexed by degrees of freedom
+T_CRITICAL_95 = {
+    1: 6.314, 2: 2.920, 3: 2.353, 4: 2.132, 5: 2.015, 6: 1.943, 7: 1.895, 8: 1.860, 9: 1.833,
+    10: 1.812, 12: 1.782, 15: 1.753, 20: 1.725, 25: 1.708, 30: 1.697, 40: 1.684, 60: 1.671,
+    120: 1.658}
+T_CRITICAL_95_INF = 1.645
+
+# Metric name fragment of lower-is-better metrics, e.g. write_lat_mean
+LOWER_IS_BETTER = "_lat_"
+
+
+def get_t_critical(dof):
+    """Get the one-sided 95% Student's t critical value.
+
+    Degrees of freedom between the tabulated values use the next lower entry, which errs on the
+    side of not reporting a regression.
+
+    Args:
+        dof (int): degrees of freedom
+
+    Returns:
+        float: the critical value
+
+    """
+    if dof > max(T_CRITICAL_95):
+        return T_CRITICAL_95_INF
+    return T_CRITICAL_95[max(key for key in T_CRITICAL_95 if key <= dof)]
+
+
+class PerformanceResult():
+    # pylint: disable=too-few-public-methods
+    """Regression check of one metric against its history."""
+
+    def __init__(self, metric, value, history, lower_is_better=False):
+        """Initialize a PerformanceResult object.
+
+        Args:
+            metric (str): metric name
+            value (float): the new value of the metric
+            history (list): previous values of the metric
+            lower_is_better (bool, optional): whether lower values are better, e.g. for a
+                latency. Defaults to False.
+        """
+        self.metric = metric
+        self.value = value
+        self.lower_is_better = lower_is_better
+        self.samples = len(history)
+        self.mean = sum(history) / len(history) if history else None
+        self.stddev = None
+        self.threshold = None
+        if len(history) > 1:
+            self.stddev = math.sqrt(
+                sum((item - self.mean) ** 2 for item in history) / (len(history) - 1))
+            # Bound of the one-sided prediction interval for a new sample
+            margin = get_t_critical(len(history) - 1) * self.stddev * \
+                math.sqrt(1 + 1 / len(history))
+            self.threshold = self.mean + margin if lower_is_better else self.mean - margin
+
+    @property
+    def change(self):
+        """Get the change of the value relative to the history mean.
+
+        Returns:
+            float: fractional change or None if there is no history or its mean is 0
+
+        """
+        if not self.mean:
+            return None
+        return (self.value - self.mean) / self.mean
+
+    def is_regression(self, min_change=0.05):
+        """Determine if the value is a significant regression.
+
+        The value is a regression if it is below the 95% prediction interval of the history and
+        lower than the history mean by at least min_change, so that a very stable history does not
+        flag negligible differences. For lower-is-better metrics it must be above the interval and
+        higher than the mean by at least min_change. If the history mean is 0 there is no relative
+        change and only the interval is checked.
+
+        Args:
+            min_change (float, optional): minimum fractional drop. Defaults to 0.05.
+
+        Returns:
+            bool: True if the value is a regression
+
+        """
+        if self.threshold is None:
+            return False
+        change = self.change
+        if self.lower_is_better:
+            return self.value > self.threshold and (change is None or change > min_change)
+        return self.value < self.threshold and (change is None or change < -min_change)
+
+    def __str__(self):
+        """Get a description of the result.
+
+        Returns:
+            str: the result description
+
+        """
+        if self.mean is None:
+            return "{}: {} (no history)".format(self.metric, self.value)
+        return "{}: {} vs mean {:.3f} of {} (change {}, threshold {})".format(
+            self.metric, self.value, self.mean, self.samples,
+            "-" if self.change is None else "{:+.1%}".format(self.change),
+            "-" if self.threshold is None else "{:.3f}".format(self.threshold))
+
+
+class PerformanceResultsDB():
+    """Store of performance test results keyed by test, commit, oclass, ppn and hardware.
+
+    Metrics are assumed to be higher-is-better, e.g. a bandwidth or an operation rate, except for
+    latencies, whose names contain LOWER_IS_BETTER.
+    """
+
+    KEYS = ("test", "git_commit", "oclass", "ppn", "hardware")
+
+    def __init__(self, path):
+        """Initialize a PerformanceResultsDB object.
+
+        Args:
+            path (str): SQLite database file, which is created if needed
+        """
+        self.path = path
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "id INTEGER PRIMARY KEY, time REAL, test TEXT, git_commit TEXT, "
+                    "oclass TEXT, ppn INTEGER, hardware TEXT, metric TEXT, value REAL)")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS results_key ON results "
+                    "(test, oclass, ppn, hardware, metric)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        """Open a connection to the database.
+
+        Returns:
+            sqlite3.Connection: the connection, which commits when used as a context manager
+
+        """
+        return sqlite3.connect(self.path, timeout=60)
+
+    def add(self, key, metrics):
+        """Add the metrics of a test run.
+
+        Args:
+            key (dict): value of each of the KEYS
+            metrics (dict): metric values indexed by metric name
+        """
+        now = time.time()
+        rows = [
+            (now, *[key[name] for name in self.KEYS], metric, float(value))
+            for metric, value in metrics.items()]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO results (time, {}, metric, value) VALUES ({})".format(
+                        ", ".join(self.KEYS), ", ".join("?" * (len(self.KEYS) + 3))),
+                    rows)
+        finally:
+            conn.close()
+
+    def get_history(self, key, metric, limit=20):
+        """Get the most recent stored values of a metric.
+
+        Key values may be None, e.g. for a test without an oclass, and only match stored None
+        values.
+
+        Args:
+            key (dict): value of each of the KEYS; git_commit is not used so that the history
+                spans commits
+            metric (str): metric name
+            limit (int, optional): maximum number of values. Defaults to 20.
+
+        Returns:
+            list: the metric values, most recent first
+
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                # Use IS rather than = so that NULL key values match
+                "SELECT value FROM results WHERE test IS ? AND oclass IS ? AND ppn IS ? AND "
+                "hardware IS ? AND metric = ? ORDER BY time DESC LIMIT ?",
+                (key["test"], key["oclass"], key["ppn"], key["hardware"], metric,
+                 limit)).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def compare(self, key, metrics, limit=20):
+        """Compare the metrics of a test run against the stored history.
+
+        This should be called before the metrics are added.
+
+        Args:
+            key (dict): value of each of the KEYS
+            metrics (dict): metric values indexed by metric name
+            limit (int, optional): maximum number of historical values to compare against.
+                Defaults to 20.
+
+        Returns:
+            list: a PerformanceResult for each metric
+
+        """
+        return [
+            PerformanceResult(
+                metric, value, self.get_history(key, metric, limit), LOWER_IS_BETTER in metric)
+            for metric, value in metrics.items()]
@@ -0,0 +1,287 @@
+"""
+  (C) Copyright 2023 Intel Corporation.
+
+  SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import itertools
+import json
+import math
+import os
+
+from performance_test_base import PerformanceTestBase
+
+# Sweep dimensions and whether changing them requires a different container
+SWEEP_DIMENSIONS = {
+    "dfs_oclass": True,
+    "dfs_dir_oclass": True,
+    "dfs_chunk": True,
+    "transfer_size": False,
+    "ppn": False,
+    "intercept": False,
+}
+
+
+def get_sweep_configs(values):
+    """Get every combination of the swept values.
+
+    Configurations are ordered so that the ones sharing a container are adjacent.
+
+    Args:
+        values (dict): list of values indexed by sweep dimension; dimensions that are not swept
+            may be omitted
+
+    Returns:
+        list: a dictionary of the value of each swept dimension for each configuration
+
+    """
+    names = sorted(
+        (name for name in SWEEP_DIMENSIONS if values.get(name)),
+        key=lambda name: not SWEEP_DIMENSIONS[name])
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*(values[name] for name in names))]
+
+
+def get_container_key(config):
+    """Get the values of a configuration that determine its container.
+
+    Args:
+        config (dict): sweep configuration
+
+    Returns:
+        tuple: the container-level values
+
+    """
+    return tuple(
+        (name, value) for name, value in sorted(config.items()) if SWEEP_DIMENSIONS[name])
+
+
+def get_config_name(config):
+    """Get a short name for a sweep configuration.
+
+    Args:
+        config (dict): sweep configuration
+
+    Returns:
+        str: the configuration name
+
+    """
+    return ",".join("{}={}".format(name, value) for name, value in config.items())
+
+
+def get_geometric_mean(values):
+    """Get the geometric mean of a list of positive values.
+
+    Args:
+        values (list): the values
+
+    Returns:
+        float: the geometric mean, or 0 if any value is not positive
+
+    """
+    if not values or min(values) <= 0:
+        return 0.0
+    return math.exp(sum(math.log(value) for value in values) / len(values))
+
+
+def rank_sweep_results(results):
+    """Rank sweep results by score, listing aborted and failed configurations last.
+
+    Args:
+        results (list): dictionaries with "name", "status", "screen" and "score" keys
+
+    Returns:
+        list: the ranked results
+
+    """
+    return sorted(
+        results,
+        key=lambda result: (result["status"] != "complete", -(result["score"] or 0),
+                            -(result["screen"] or 0)))
+
+
+class PerformanceSweepTestBase(PerformanceTestBase):
+    # pylint: disable=too-many-ancestors
+    """Base class for sweeping IOR/MDTest parameters to find the best configuration.
+
+    Every configuration is first run for a short, stonewalled screening run: the IOR write phase
+    or the MDTest create phase, followed by an unmeasured remove phase. Configurations whose
+    screening result is below abort_fraction of the best one are not run any further. The
+    remaining configurations are run in full and ranked by their score: the geometric mean of the
+    IOR write and read bandwidths or of the MDTest rates. Configurations that only differ by
+    transfer size, ppn or interception mode reuse the same container.
+
+    Yaml config values, under the sweep namespace:
+        dfs_oclass, dfs_dir_oclass, dfs_chunk, transfer_size, ppn (list, optional): values to
+            sweep. Dimensions that are not listed use the value from the IOR/MDTest namespace.
+        intercept (list, optional): whether to use the interception library with dfuse, e.g.
+            [false, true]. Only used with the POSIX api.
+        screen_deadline (int, optional): stonewall time in seconds of the screening runs.
+            Defaults to 10.
+        abort_fraction (float, optional): fraction of the best screening result below which a
+            configuration is aborted. Defaults to 0.5.
+
+    Outputs:
+        */data/sweep_<group>.json: the ranked results
+
+    :avocado: recursive
+    """
+
+    def _apply_sweep_config(self, group, namespace, config, deadline=None):
+        """Load the IOR or MDTest parameters for a sweep configuration.
+
+        Args:
+            group (str): IOR or MDTEST
+            namespace (str): IOR or MDTest yaml namespace
+            config (dict): sweep configuration
+            deadline (int, optional): stonewall time override. Defaults to None.
+
+        """
+        command = self.ior_cmd if group == "IOR" else self.mdtest_cmd
+        command.namespace = namespace
+        command.get_params(self)
+        self.set_processes_ppn(namespace)
+        for name, value in config.items():
+            if name == "ppn":
+                self.ppn = self.perf_params.ppn = value
+            elif name != "intercept":
+                getattr(command, name).update(value)
+        if deadline is not None:
+            if group == "IOR":
+                command.sw_deadline.update(deadline)
+            else:
+                command.stonewall_timer.update(deadline)
+
+    def _run_sweep_config(self, group, namespace, config, phase, container, deadline=None):
+        """Run one phase of a sweep configuration.
+
+        Args:
+            group (str): IOR or MDTEST
+            namespace (str): IOR or MDTest yaml namespace
+            config (dict): sweep configuration
+            phase (str): "screen" or "full"
+            container (TestContainer): container to use or None to create one
+            deadline (int, optional): stonewall time override. Defaults to None.
+
+        Returns:
+            list: the result values of the phase, higher is better
+
+        """
+        self._apply_sweep_config(group, namespace, config, deadline)
+        if group == "IOR":
+            phases = ("write",) if phase == "screen" else ("write", "read")
+            results = self.run_performance_ior(
+                use_intercept=config.get("intercept", False), phases=phases,
+                pool=self.pool, container=container, record=False)
+            return [results[name].bw_mean for name in phases]
+
+        flags = self.mdtest_cmd.flags.value or ""
+        if phase == "screen":
+            # Only measure the create phase, but remove the files so the container can be reused
+            flags = " ".join(
+                [flag for flag in flags.split() if flag not in ("-C", "-T", "-E", "-r")]
+                + ["-C", "-r"])
+        metrics = self.run_performance_mdtest(
+            flags=flags, pool=self.pool, container=container, record=False)
+        if phase == "screen":
+            return [metrics.rates.file_creation.mean]
+        return [value for name, value in metrics.get_results().items()
+                if name.startswith("rates.") and name.endswith(".mean") and value > 0]
+
+    def run_performance_sweep(self, group, namespace, sweep_namespace):
+        """Run and rank every configuration of a parameter sweep.
+
+        Args:
+            group (str): IOR or MDTEST
+            namespace (str): IOR or MDTest yaml namespace providing the base parameters
+            sweep_namespace (str): yaml namespace of the values to sweep
+
+        Returns:
+            list: the ranked results
+
+        """
+        if group not in ("IOR", "MDTEST"):
+            self.fail("Invalid group: {}".format(group))
+        values = {name: self.params.get(name, sweep_namespace) for name in SWEEP_DIMENSIONS}
+        screen_deadline = self.params.get("screen_deadline", sweep_namespace, 10)
+        abort_fraction = self.params.get("abort_fraction", sweep_namespace, 0.5)
+        api = self.params.get("api", namespace)
+        if api != "POSIX" and values["intercept"]:
+            self.log.info("Not sweeping intercept with the %s api", api)
+            values["intercept"] = None
+
+        results = []
+        for config in get_sweep_configs(values):
+            result = {"name": get_config_name(config), "config": config, "status": "pending",
+                      "screen": None, "values": [], "score": None}
+            for name in ("dfs_oclass", "dfs_dir_oclass"):
+                if config.get(name) and not self.verify_oclass_engine_count(config[name], False):
+                    result["status"] = "skipped"
+            results.append(result)
+        self._log_performance_params(group, [["SWEEP_CONFIGS", len(results)]])
+
+        # Short screening runs, sharing a container between configurations where possible
+        self.pool = None
+        containers = {}
+        for result in results:
+            if result["status"] != "pending":
+                continue
+            key = get_container_key(result["config"])
+            self.log_performance("Sweep screening {}".format(result["name"]))
+            try:
+                result["screen"] = get_geometric_mean(
+                    self._run_sweep_config(
+                        group, namespace, result["config"], "screen", containers.get(key),
+                        screen_deadline))
+            except Exception as error:      # pylint: disable=broad-except
+                self.log.error("Sweep configuration %s failed: %s", result["name"], error)
+                result["status"] = "failed"
+                continue
+            containers[key] = self.container
+            result["status"] = "screened"
+
+        # Abort the configurations that are clearly worse than the best one
+        best = max([result["screen"] or 0 for result in results] or [0])
+        for result in results:
+            if result["status"] == "screened" and result["screen"] < best * abort_fraction:
+                result["status"] = "aborted"
+
+        for result in results:
+            if result["status"] != "screened":
+                continue
+            key = get_container_key(result["config"])
+            self.log_performance("Sweep full run {}".format(result["name"]))
+            try:
+                result["values"] = self._run_sweep_config(
+                    group, namespace, result["config"], "full", containers.get(key))
+            except Exception as error:      # pylint: disable=broad-except
+                self.log.error("Sweep configuration %s failed: %s", result["name"], error)
+                result["status"] = "failed"
+                continue
+            result["score"] = get_geometric_mean(result["values"])
+            result["status"] = "complete"
+
+        ranked = rank_sweep_results(results)
+        self.log_sweep_results(group, ranked)
+        return ranked
+
+    def log_sweep_results(self, group, ranked):
+        """Log the ranked sweep results as a table and save them as JSON.
+
+        Args:
+            group (str): IOR or MDTEST
+            ranked (list): results from rank_sweep_results()
+
+        """
+        width = max([len(result["name"]) for result in ranked] + [len("CONFIG")])
+        lines = ["{} sweep ranking".format(group), "{:>4}  {:<{}}  {:>10}  {:>14}  {:>14}".format(
+            "RANK", "CONFIG", width, "STATUS", "SCREEN", "SCORE")]
+        for rank, result in enumerate(ranked, 1):
+            lines.append("{:>4}  {:<{}}  {:>10}  {:>14}  {:>14}".format(
+                rank if result["status"] == "complete" else "-", result["name"], width,
+                result["status"],
+                "{:.3f}".format(result["screen"]) if result["screen"] is not None else "-",
+                "{:.3f}".format(result["score"]) if result["score"] is not None else "-"))
+        self.log_performance(lines)
+        path = os.path.join(self._performance_log_dir, "sweep_{}.json".format(group.lower()))
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(ranked, handle, indent=2)
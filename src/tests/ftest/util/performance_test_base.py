@@ -12,7 +12,10 @@ from ior_test_base import IorTestBase
 from mdtest_test_base import MdtestBase
 from mdtest_utils import MdtestMetrics
 from general_utils import get_subprocess_stdout
-from ior_utils import IorMetrics
+from ior_utils import get_ior_results
+from daos_metrics_utils import get_daos_metrics_snapshot, get_daos_metrics_delta, \
+    get_daos_metrics_summary, format_daos_metrics_summary
+from performance_results_utils import PerformanceResultsDB
 import oclass_utils
 from exception_utils import CommandFailure
 
@@ -23,6 +26,16 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
     Optional yaml config values:
         performance/phase_barrier_s (int): seconds to wait between IOR write/read phases.
         performance/env (list): list of env vars to set for IOR/MDTest.
+        performance/results_db (str): SQLite database in which to store the results and against
+            which they are compared. This must be a persistent location shared by the runs to
+            compare, e.g. on a shared file system. Defaults to */data/performance.db, which is
+            specific to each test run and so has no history to compare against.
+        performance/git_commit (str): commit recorded with the results. Defaults to the
+            GIT_COMMIT environment variable.
+        performance/fail_on_regression (bool): whether to fail the test if a result is a
+            significant regression. Defaults to False.
+        performance/phase_metrics (bool): whether to collect the daos_metrics before and after
+            each IOR/MDTest phase and attach their change to its results. Defaults to True.
 
     Outputs:
         */data/performance.log: Contains input parameters and output metrics.
@@ -55,6 +68,10 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
         self._performance_log_name = os.path.join(self._performance_log_dir, "performance.log")
         self.phase_barrier_s = 0
         self.daos_metrics_num = 0
+        self.results_db = None
+        self.git_commit = None
+        self.fail_on_regression = False
+        self.phase_metrics = True
 
         # For tracking various configuration params
         self.perf_params = PerformanceTestBase.PerfParams()
@@ -73,6 +90,18 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
         self.perf_params.num_clients = len(self.hostlist_clients)
         self.perf_params.provider = self.server_managers[0].get_config_value("provider")
         self.phase_barrier_s = self.params.get("phase_barrier_s", '/run/performance/*', 0)
+        results_db = self.params.get("results_db", '/run/performance/*')
+        if results_db is None:
+            results_db = os.path.join(self._performance_log_dir, "performance.db")
+            self.log.info(
+                "No performance/results_db set; results will not be compared against previous "
+                "runs. Set it to a persistent location to track the results over time.")
+        self.results_db = PerformanceResultsDB(results_db)
+        self.git_commit = self.params.get(
+            "git_commit", '/run/performance/*', os.environ.get("GIT_COMMIT", "unknown"))
+        self.fail_on_regression = self.params.get(
+            "fail_on_regression", '/run/performance/*', False)
+        self.phase_metrics = self.params.get("phase_metrics", '/run/performance/*', True)
 
     def log_performance(self, msg, log_to_info=True, file_path=None):
         """Log a performance-related message to self.log.info and self._performance_log_name.
@@ -104,6 +133,34 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
         with open(file_path, "a") as log:
             log.write(combined_msg + "\n")
 
+    def record_performance(self, oclass, metrics):
+        """Store performance metrics and compare them against previous results.
+
+        Args:
+            oclass (str): object class used by the test
+            metrics (dict): metric values indexed by metric name. Metrics are higher-is-better,
+                except for latencies named "<operation>_lat_<statistic>", e.g. write_lat_mean.
+
+        """
+        key = {
+            "test": self.test_id,
+            "git_commit": self.git_commit,
+            "oclass": oclass,
+            "ppn": self.perf_params.ppn,
+            "hardware": "{}s{}e{}t{}c_{}".format(
+                self.perf_params.num_servers, self.perf_params.num_engines,
+                self.perf_params.num_targets, self.perf_params.num_clients,
+                self.perf_params.provider)}
+        results = self.results_db.compare(key, metrics)
+        self.results_db.add(key, metrics)
+        regressions = [result for result in results if result.is_regression()]
+        self.log_performance(["Result {}".format(result) for result in results])
+        if regressions:
+            self.log_performance(["REGRESSION {}".format(result) for result in regressions])
+            if self.fail_on_regression:
+                self.fail("Performance regression in {}".format(
+                    ", ".join(result.metric for result in regressions)))
+
     def _log_daos_metrics(self):
         """Get and log the daos_metrics for each server."""
         self.daos_metrics_num += 1
@@ -114,9 +171,46 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
         per_engine_results = self.server_managers[0].get_daos_metrics()
         for engine_idx, engine_results in enumerate(per_engine_results):
             for host_results in engine_results:
-                log_name = "{}_engine{}.csv".format(host_results["hosts"], engine_idx)
-                log_path = os.path.join(metrics_dir, log_name)
-                self.log_performance(host_results["stdout"], False, log_path)
+                if host_results["exit_status"] != 0:
+                    self.log.warning(
+                        "Error collecting daos_metrics for engine %s on %s (exit status %s): %s",
+                        engine_idx, host_results["hosts"], host_results["exit_status"],
+                        "; ".join(host_results["stderr"]))
+                for host in host_results["hosts"]:
+                    log_name = "{}_engine{}.csv".format(host, engine_idx)
+                    with open(os.path.join(metrics_dir, log_name), "w") as log:
+                        log.write("\n".join(host_results["stdout"]) + "\n")
+
+    def _get_phase_metrics(self):
+        """Get a daos_metrics snapshot of every engine, if enabled with phase_metrics.
+
+        Returns:
+            dict: the snapshot from get_daos_metrics_snapshot() or None if not enabled
+
+        """
+        if not self.phase_metrics:
+            return None
+        return get_daos_metrics_snapshot(self.server_managers[0])
+
+    def _log_phase_metrics(self, name, before):
+        """Get and log the change of the daos_metrics during a phase.
+
+        Args:
+            name (str): phase name
+            before (dict): snapshot from _get_phase_metrics() taken before the phase
+
+        Returns:
+            dict: the delta from get_daos_metrics_delta() and its summary, or None if the
+                snapshot was not taken
+
+        """
+        if before is None:
+            return None
+        delta = get_daos_metrics_delta(before, self._get_phase_metrics())
+        summary = get_daos_metrics_summary(delta)
+        self.log_performance(
+            ["{} daos_metrics".format(name)] + format_daos_metrics_summary(summary))
+        return {"delta": delta, "summary": summary}
 
     @property
     def unique_id(self):
@@ -267,6 +361,29 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
             self.fail("Failed to start servers")
         self.server_managers[0].detect_engine_start()
 
+    def _create_performance_container(self, pool, oclass, chunk_size, cont_rf):
+        """Create the container used by an IOR or MDTest performance run.
+
+        Args:
+            pool (TestPool): pool in which to create the container. A new pool is created if None.
+            oclass (str): object class
+            chunk_size (str): chunk size
+            cont_rf (int): container redundancy factor
+
+        """
+        self.pool = pool or self.get_pool(connect=False)
+        params = {}
+        if oclass:
+            params['oclass'] = oclass
+        if chunk_size:
+            params['chunk_size'] = chunk_size
+        self.container = self.get_container(self.pool, create=False, **params)
+        rf_prop = "rd_fac:{}".format(cont_rf)
+        current_properties = self.container.properties.value
+        new_properties = ','.join(filter(None, (current_properties, rf_prop)))
+        self.container.properties.update(new_properties)
+        self.container.create()
+
     def _run_performance_ior_single(self, stop_rank_s=None, intercept=None):
         """Run a single IOR execution.
 
@@ -275,10 +392,14 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
                 Default is None, which does not stop a rank.
             intercept (str, optional): path to interception library.
 
+        Returns:
+            list: an IorResult for each operation
+
         """
         # Always run as a subprocess so we can stop ranks during IO
         self.subprocess = True
 
+        metrics_before = self._get_phase_metrics()
         self.run_ior_with_pool(
             create_pool=False,
             create_cont=False,
@@ -294,12 +415,19 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
             if ior_returncode != 0:
                 self.fail("IOR failed")
             ior_output = get_subprocess_stdout(self.job_manager.process)
-            ior_metrics = self.ior_cmd.get_ior_metrics(ior_output)
-            for metrics in ior_metrics:
-                if metrics[0] == "write":
-                    self.log_performance("Max Write: {}".format(metrics[IorMetrics.MAX_MIB]))
-                elif metrics[0] == "read":
-                    self.log_performance("Max Read: {}".format(metrics[IorMetrics.MAX_MIB]))
+            ior_results = get_ior_results(ior_output)
+            daos_metrics = self._log_phase_metrics(
+                "IOR {}".format(self.ior_cmd.flags.value), metrics_before)
+            for result in ior_results:
+                result.daos_metrics = daos_metrics
+                if result.operation == "write":
+                    self.log_performance("Max Write: {}".format(result.bw_max))
+                elif result.operation == "read":
+                    self.log_performance("Max Read: {}".format(result.bw_max))
+                if result.latency:
+                    self.log_performance("{} latency: mean {:.1f}us of {} iterations".format(
+                        result.operation.capitalize(), result.latency.get_mean() / 1000,
+                        result.latency.count))
         except (CommandFailure, TestFail):
             try:
                 self._log_daos_metrics()
@@ -309,10 +437,12 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
         finally:
             # Try this even if IOR failed because it could give us useful info
             self.verify_system_status(self.pool, self.container)
+        return ior_results
 
     def run_performance_ior(self, namespace=None, use_intercept=True, stop_delay_write=None,
                             stop_delay_read=None, num_iterations=1,
-                            restart_between_iterations=True):
+                            restart_between_iterations=True, phases=("write", "read"),
+                            pool=None, container=None, record=True):
         """Run an IOR performance test.
 
         Write and Read are ran separately.
@@ -330,6 +460,16 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
                 Default is 1.
             restart_between_iterations (int, optional): whether to restart the servers between
                 iterations. Default is True.
+            phases (tuple, optional): IOR phases to run. Defaults to ("write", "read").
+            pool (TestPool, optional): pool in which to create the container. Defaults to None,
+                which creates a new pool.
+            container (TestContainer, optional): existing container to use, e.g. from a previous
+                write phase. Defaults to None, which creates a new container.
+            record (bool, optional): whether to record the results with record_performance().
+                Defaults to True.
+
+        Returns:
+            dict: IorResult of each operation of the last iteration indexed by operation
 
         """
         if stop_delay_write is not None and (stop_delay_write < 0 or stop_delay_write > 1):
@@ -374,56 +514,74 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
 
         self.verify_oclass_engine_count(self.ior_cmd.dfs_oclass.value)
 
+        # Use the JSON summary, which is simpler to parse reliably
+        if not self.ior_cmd.summary_format.value:
+            self.ior_cmd.summary_format.update("JSON")
+
         # Set the container redundancy factor to match the oclass
         cont_rf = oclass_utils.extract_redundancy_factor(self.ior_cmd.dfs_oclass.value)
 
         # Create pool and container upfront for flexibility and so rank stop timing is accurate
-        self.pool = self.get_pool(connect=False)
-        params = {}
-        if self.ior_cmd.dfs_oclass.value:
-            params['oclass'] = self.ior_cmd.dfs_oclass.value
-        if self.ior_cmd.dfs_chunk.value:
-            params['chunk_size'] = self.ior_cmd.dfs_chunk.value
-        self.container = self.get_container(self.pool, create=False, **params)
-        rf_prop = "rd_fac:{}".format(cont_rf)
-        current_properties = self.container.properties.value
-        new_properties = ','.join(filter(None, (current_properties, rf_prop)))
-        self.container.properties.update(new_properties)
-        self.container.create()
+        if container is None:
+            self._create_performance_container(
+                pool, self.ior_cmd.dfs_oclass.value, self.ior_cmd.dfs_chunk.value, cont_rf)
+        else:
+            self.pool = container.pool
+            self.container = container
         self.update_ior_cmd_with_pool(False)
 
+        ior_results = []
         for iteration in range(num_iterations):
             if restart_between_iterations and iteration > 0:
                 self.restart_servers()
 
-            self.log.info("Running IOR write (%s)", str(iteration))
-            self.ior_cmd.flags.update(write_flags)
-            self._run_performance_ior_single(stop_rank_write_s, intercept)
-
-            # Manually stop dfuse after ior write completes
-            self.stop_dfuse()
-
-            # Wait for rebuild if we stopped a rank
-            if stop_rank_write_s:
-                self.pool.wait_for_rebuild_to_end()
-
-            # Wait between write and read
-            self.phase_barrier()
-
-            self.log.info("Running IOR read (%s)", str(iteration))
-            self.ior_cmd.flags.update(read_flags)
-            self._run_performance_ior_single(stop_rank_read_s, intercept)
-
-            # Manually stop dfuse after ior read completes
-            self.stop_dfuse()
-
-            # Wait for rebuild if we stopped a rank
-            if stop_rank_read_s:
-                self.pool.wait_for_rebuild_to_end()
+            ior_results = []
+            if "write" in phases:
+                self.log.info("Running IOR write (%s)", str(iteration))
+                self.ior_cmd.flags.update(write_flags)
+                ior_results.extend(self._run_performance_ior_single(stop_rank_write_s, intercept))
+
+                # Manually stop dfuse after ior write completes
+                self.stop_dfuse()
+
+                # Wait for rebuild if we stopped a rank
+                if stop_rank_write_s:
+                    self.pool.wait_for_rebuild_to_end()
+
+            if "write" in phases and "read" in phases:
+                # Wait between write and read
+                self.phase_barrier()
+
+            if "read" in phases:
+                self.log.info("Running IOR read (%s)", str(iteration))
+                self.ior_cmd.flags.update(read_flags)
+                ior_results.extend(self._run_performance_ior_single(stop_rank_read_s, intercept))
+
+                # Manually stop dfuse after ior read completes
+                self.stop_dfuse()
+
+                # Wait for rebuild if we stopped a rank
+                if stop_rank_read_s:
+                    self.pool.wait_for_rebuild_to_end()
+
+            if record:
+                metrics = {}
+                for result in ior_results:
+                    metrics["{}_bw_max".format(result.operation)] = result.bw_max
+                    metrics["{}_bw_mean".format(result.operation)] = result.bw_mean
+                    metrics["{}_ops_mean".format(result.operation)] = result.ops_mean
+                    if result.latency:
+                        # IOR only reports the mean latency of each iteration, so percentiles
+                        # would not describe the tail latency. Microseconds.
+                        metrics["{}_lat_mean".format(result.operation)] = \
+                            result.latency.get_mean() / 1000
+                self.record_performance(self.ior_cmd.dfs_oclass.value, metrics)
 
         self._log_daos_metrics()
+        return {result.operation: result for result in ior_results}
 
-    def run_performance_mdtest(self, namespace=None, stop_delay=None):
+    def run_performance_mdtest(self, namespace=None, stop_delay=None, flags=None, pool=None,
+                               container=None, record=True):
         """Run an MDTest performance test.
 
         Args:
@@ -431,6 +589,17 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
                 Defaults to None, which uses default MDTest namespace.
             stop_delay (float, optional): fraction of stonewall time after which to stop a
                 rank. Must be between 0 and 1. Defaults to None.
+            flags (str, optional): MDTest flags to use instead of the ones in the yaml, e.g. to
+                run a single phase. Defaults to None.
+            pool (TestPool, optional): pool in which to create the container. Defaults to None,
+                which creates a new pool.
+            container (TestContainer, optional): existing container to use, e.g. from a previous
+                create phase. Defaults to None, which creates a new container.
+            record (bool, optional): whether to record the results with record_performance().
+                Defaults to True.
+
+        Returns:
+            MdtestMetrics: the MDTest results
 
         """
         if stop_delay is not None and (stop_delay < 0 or stop_delay > 1):
@@ -440,6 +609,8 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
             self.mdtest_cmd.namespace = namespace
             self.mdtest_cmd.get_params(self)
             self.set_processes_ppn(namespace)
+        if flags is not None:
+            self.mdtest_cmd.flags.update(flags)
 
         # Performance with POSIX/DFUSE is tricky because we can't just set
         # dfs_dir_oclass and dfs_oclass. This needs more work to get good results on non-DFS.
@@ -467,18 +638,12 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
             oclass_utils.extract_redundancy_factor(self.mdtest_cmd.dfs_dir_oclass.value)])
 
         # Create pool and container upfront so rank stop timing is more accurate
-        self.pool = self.get_pool(connect=False)
-        params = {}
-        if self.mdtest_cmd.dfs_oclass.value:
-            params['oclass'] = self.mdtest_cmd.dfs_oclass.value
-        if self.mdtest_cmd.dfs_chunk.value:
-            params['chunk_size'] = self.mdtest_cmd.dfs_chunk.value
-        self.container = self.get_container(self.pool, create=False, **params)
-        rf_prop = "rd_fac:{}".format(cont_rf)
-        current_properties = self.container.properties.value
-        new_properties = ','.join(filter(None, (current_properties, rf_prop)))
-        self.container.properties.update(new_properties)
-        self.container.create()
+        if container is None:
+            self._create_performance_container(
+                pool, self.mdtest_cmd.dfs_oclass.value, self.mdtest_cmd.dfs_chunk.value, cont_rf)
+        else:
+            self.pool = container.pool
+            self.container = container
 
         # Never let execute_mdtest automatically destroy the container
         self.mdtest_cmd.dfs_destroy.update(False)
@@ -487,6 +652,7 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
         self.subprocess = True
 
         self.log.info("Running MDTEST")
+        metrics_before = self._get_phase_metrics()
         self.execute_mdtest()
         if stop_rank_s:
             time.sleep(stop_rank_s)
@@ -499,6 +665,8 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
             mdtest_metrics = MdtestMetrics(mdtest_output)
             if not mdtest_metrics:
                 self.fail("Failed to get mdtest metrics")
+            mdtest_metrics.daos_metrics = self._log_phase_metrics(
+                "MDTEST {}".format(self.mdtest_cmd.flags.value), metrics_before)
             log_list = []
             if mdtest_metrics.rates.file_creation.max > 0:
                 log_list.append('create_ops: {}'.format(mdtest_metrics.rates.file_creation.max))
@@ -509,6 +677,11 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
             if mdtest_metrics.rates.file_removal.max > 0:
                 log_list.append('remove_ops: {}'.format(mdtest_metrics.rates.file_removal.max))
             self.log_performance(log_list)
+            if record:
+                self.record_performance(
+                    self.mdtest_cmd.dfs_oclass.value,
+                    {name: value for name, value in mdtest_metrics.get_results().items()
+                     if name.startswith("rates.") and not name.endswith(".stddev")})
         except (CommandFailure, TestFail):
             try:
                 self._log_daos_metrics()
@@ -527,3 +700,4 @@ class PerformanceTestBase(IorTestBase, MdtestBase):
             self.pool.wait_for_rebuild_to_end()
 
         self._log_daos_metrics()
+        return mdtest_metrics
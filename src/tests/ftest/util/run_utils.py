@@ -3,9 +3,13 @@
 
   SPDX-License-Identifier: BSD-2-Clause-Patent
 """
+from collections import defaultdict
+from queue import Queue
 from socket import gethostname
+from threading import Thread
 import subprocess   # nosec
 import shlex
+from ClusterShell.Event import EventHandler
 from ClusterShell.NodeSet import NodeSet
 from ClusterShell.Task import task_self
 
@@ -162,6 +166,105 @@ class RemoteCommandResult():
                     log.debug("    %s", line)
 
 
+class RemoteHostResult():
+    # pylint: disable=too-few-public-methods
+    """Stores the command result from a single host."""
+
+    def __init__(self, command, host, returncode, stdout, timeout):
+        """Initialize a RemoteHostResult object.
+
+        Args:
+            command (str): the executed command
+            host (str): the host on which the command was executed
+            returncode (int): the return code of the executed command
+            stdout (list): the result of the executed command split by newlines
+            timeout (bool): indicator for a command timeout
+        """
+        self.command = command
+        self.host = host
+        self.returncode = returncode
+        self.stdout = stdout
+        self.timeout = timeout
+
+    @property
+    def passed(self):
+        """Did the command pass on the host.
+
+        Returns:
+            bool: if the command was successful on the host
+
+        """
+        return self.returncode == 0 and not self.timeout
+
+    def log_output(self, log):
+        """Log the command result.
+
+        Args:
+            log (logger): logger for the messages produced by this method
+
+        """
+        if self.timeout:
+            log.debug("  %s (rc=%s): timed out", self.host, self.returncode)
+        elif len(self.stdout) == 1:
+            log.debug("  %s (rc=%s): %s", self.host, self.returncode, self.stdout[0])
+        else:
+            log.debug("  %s (rc=%s):", self.host, self.returncode)
+            for line in self.stdout:
+                log.debug("    %s", line)
+
+
+class RemoteHostResultHandler(EventHandler):
+    """Queues a RemoteHostResult for each host as soon as the command completes on that host."""
+
+    def __init__(self, command, queue):
+        """Initialize a RemoteHostResultHandler object.
+
+        Args:
+            command (str): the command being executed
+            queue (Queue): queue in which to place each RemoteHostResult
+        """
+        super().__init__()
+        self._command = command
+        self._queue = queue
+        self._stdout = defaultdict(list)
+
+    def ev_read(self, worker, node, sname, msg):
+        """Collect a line of output from a host.
+
+        Args:
+            worker (Worker): the worker running the command
+            node (str): the host producing the output
+            sname (str): the name of the output stream
+            msg (bytes): the line of output
+        """
+        if isinstance(msg, bytes):
+            msg = msg.decode("utf-8", "replace")
+        self._stdout[node].append(msg)
+
+    def ev_hup(self, worker, node, rc):
+        """Queue the result for a host on which the command has completed.
+
+        Args:
+            worker (Worker): the worker running the command
+            node (str): the host on which the command completed
+            rc (int): the return code of the command on the host
+        """
+        self._queue.put(
+            RemoteHostResult(self._command, node, rc, self._stdout.pop(node, []), False))
+
+    def ev_close(self, worker, timedout):
+        """Queue the results for any hosts on which the command timed out.
+
+        Args:
+            worker (Worker): the worker running the command
+            timedout (bool): whether the command timed out on any of the hosts
+        """
+        if timedout:
+            for node in worker.iter_keys_timeout():
+                self._queue.put(
+                    RemoteHostResult(self._command, node, 124, self._stdout.pop(node, []), True))
+
+
 def get_switch_user(user="root"):
     """Get the switch user command for the requested user.
 
@@ -300,7 +403,7 @@ def run_local(log, command, capture_output=True, timeout=None, check=False, verb
     return result
 
 
-def run_remote(log, hosts, command, verbose=True, timeout=120, task_debug=False):
+def run_remote(log, hosts, command, verbose=True, timeout=120, task_debug=False, fanout=None):
     """Run the command on the remote hosts.
 
     Args:
@@ -311,6 +414,8 @@ def run_remote(log, hosts, command, verbose=True, timeout=120, task_debug=False)
         timeout (int, optional): number of seconds to wait for the command to complete.
             Defaults to 120 seconds.
         task_debug (bool, optional): whether to enable debug for the task object. Defaults to False.
+        fanout (int, optional): maximum number of hosts on which to run the command at the same
+            time. Defaults to None which uses the ClusterShell default.
 
     Returns:
         RemoteCommandResult: a grouping of the command results from the same hosts with the same
@@ -322,6 +427,8 @@ def run_remote(log, hosts, command, verbose=True, timeout=120, task_debug=False)
         task.set_info('debug', True)
     # Enable forwarding of the ssh authentication agent connection
     task.set_info("ssh_options", "-oForwardAgent=yes")
+    if fanout is not None:
+        task.set_info("fanout", fanout)
     if verbose:
         log.debug("Running on %s with a %s second timeout: %s", hosts, timeout, command)
     task.run(command=command, nodes=hosts, timeout=timeout)
@@ -331,6 +438,72 @@ def run_remote(log, hosts, command, verbose=True, timeout=120, task_debug=False)
     return results
 
 
+def iter_remote(log, hosts, command, verbose=True, timeout=120, task_debug=False, fanout=None):
+    """Run the command on the remote hosts, yielding the result from each host as it completes.
+
+    Unlike run_remote() the results from the hosts that have completed the command can be processed
+    while the command is still running on other hosts. The timeout applies to each host
+    individually, so a single hung host only delays its own result.
+
+    Note: the command continues to run on the remaining hosts if the caller stops iterating early.
+
+    Args:
+        log (logger): logger for the messages produced by this method
+        hosts (NodeSet): hosts on which to run the command
+        command (str): command from which to obtain the output
+        verbose (bool, optional): log the command output from each host. Defaults to True.
+        timeout (int, optional): number of seconds to wait for the command to complete on each
+            host. Defaults to 120 seconds.
+        task_debug (bool, optional): whether to enable debug for the task object. Defaults to False.
+        fanout (int, optional): maximum number of hosts on which to run the command at the same
+            time. Defaults to None which uses the ClusterShell default.
+
+    Raises:
+        RunException: if there is an error running the command
+
+    Yields:
+        RemoteHostResult: the command result from each host in the order the hosts complete
+
+    """
+    queue = Queue()
+
+    def _run_task():
+        """Run the command in a ClusterShell task dedicated to this thread."""
+        try:
+            task = task_self()
+            if task_debug:
+                task.set_info('debug', True)
+            # Enable forwarding of the ssh authentication agent connection
+            task.set_info("ssh_options", "-oForwardAgent=yes")
+            if fanout is not None:
+                task.set_info("fanout", fanout)
+            task.shell(
+                command, nodes=hosts, handler=RemoteHostResultHandler(command, queue),
+                timeout=timeout)
+            task.run()
+        except Exception as error:      # pylint: disable=broad-except
+            queue.put(error)
+        finally:
+            queue.put(None)
+
+    if verbose:
+        log.debug(
+            "Running on %s with a %s second timeout per host%s: %s", hosts, timeout,
+            f" and a fanout of {fanout}" if fanout is not None else "", command)
+    thread = Thread(target=_run_task, daemon=True)
+    thread.start()
+    while True:
+        result = queue.get()
+        if result is None:
+            break
+        if isinstance(result, Exception):
+            raise RunException(f"Error running '{command}' on {hosts}") from result
+        if verbose:
+            result.log_output(log)
+        yield result
+    thread.join()
+
+
 def command_as_user(command, user):
     """Adjust a command to be ran as another user.
 
@@ -938,24 +938,64 @@ class DaosServerManager(SubprocessManager):
     def get_daos_metrics(self, verbose=False, timeout=60):
         """Get daos_metrics for the server.
 
+        The metrics of every engine are collected concurrently with a single remote command run in
+        parallel on all of the hosts. The output, errors and exit status of each engine's
+        daos_metrics command are reported separately.
+
         Args:
-            verbose (bool, optional): pass verbose to run_pcmd. Defaults to False.
-            timeout (int, optional): pass timeout to each execution ofrun_pcmd. Defaults to 60.
+            verbose (bool, optional): log the command output. Defaults to False.
+            timeout (int, optional): timeout for the remote command. Defaults to 60.
 
         Returns:
-            list: list of pcmd results for each host. See general_utils.run_pcmd for details.
-                [
-                    general_utils.run_pcmd(), # engine 0
-                    general_utils.run_pcmd()  # engine 1
-                ]
+            list: for each engine, a list of dictionaries with the results of the hosts with the
+                same output, with the keys:
+                    "command": the remote command
+                    "hosts": NodeSet of the hosts
+                    "exit_status": exit status of the engine's daos_metrics command or None if
+                        it was not reported, e.g. on a timeout
+                    "interrupted": whether the remote command timed out
+                    "stdout": list of the daos_metrics --csv output lines
+                    "stderr": list of the daos_metrics error lines
 
         """
         engines_per_host = self.get_config_value("engines_per_host") or 1
-        engines = []
         daos_metrics_exe = os.path.join(self.manager.job.command_path, "daos_metrics")
-        for engine in range(engines_per_host):
-            results = run_pcmd(
-                hosts=self._hosts, verbose=verbose, timeout=timeout,
-                command="sudo {} -S {} --csv".format(daos_metrics_exe, engine))
-            engines.append(results)
+        marker = "### daos_metrics engine "
+        command = " ".join([
+            "tmp=$(mktemp -d);",
+            "for engine in $(seq 0 {}); do".format(engines_per_host - 1),
+            "(sudo {} -S $engine --csv > $tmp/$engine 2> $tmp/$engine.err;".format(
+                daos_metrics_exe),
+            "echo $? > $tmp/$engine.rc) &",
+            "done; wait;",
+            "for engine in $(seq 0 {}); do".format(engines_per_host - 1),
+            "echo \"{}$engine stdout $(cat $tmp/$engine.rc)\"; cat $tmp/$engine;".format(marker),
+            "echo \"{}$engine stderr\"; cat $tmp/$engine.err;".format(marker),
+            "done; rm -rf $tmp"])
+        result = run_remote(self.log, self._hosts, command, verbose=verbose, timeout=timeout)
+
+        engines = [[] for _ in range(engines_per_host)]
+        for data in result.output:
+            output = {}
+            exit_status = {}
+            lines = None
+            for line in data.stdout:
+                if line.startswith(marker):
+                    fields = line[len(marker):].split()
+                    engine = int(fields[0])
+                    output.setdefault(engine, {"stdout": [], "stderr": []})
+                    lines = output[engine][fields[1]]
+                    if fields[1] == "stdout" and len(fields) > 2 and fields[2].isdigit():
+                        exit_status[engine] = int(fields[2])
+                elif lines is not None:
+                    lines.append(line)
+            for engine, results in enumerate(engines):
+                results.append({
+                    "command": command,
+                    "hosts": data.hosts,
+                    "exit_status": exit_status.get(engine),
+                    "interrupted": data.timeout,
+                    "stdout": output.get(engine, {}).get("stdout", []),
+                    "stderr": output.get(engine, {}).get("stderr", []),
+                })
         return engines
@@ -211,6 +211,112 @@ def get_reservation_hosts(log, control, reservation):
             f'Unable to obtain hosts from the {reservation} slurm reservation output') from error
 
 
+class SlurmScriptTemplate():
+    """Template of slurm batch scripts sharing a job name, node count and sbatch parameters.
+
+    The fixed part of the script is only rendered once, so that writing many scripts for the same
+    job only requires the output files and the commands of each script.
+    """
+
+    def __init__(self, name, nodecount, sbatch_params=None, prepend_cmds=None,
+                 append_cmds=None):
+        """Initialize a SlurmScriptTemplate object.
+
+        Args:
+            name (str): job name
+            nodecount (int): number of compute nodes to execute on
+            sbatch_params (dict, optional): dictionary containing other less often used
+                parameters to sbatch, e.g. mem:100. The error file may be set for each script
+                when writing it. Defaults to None.
+            prepend_cmds (list, optional): shell commands executed before the commands of each
+                script. Defaults to None.
+            append_cmds (list, optional): shell commands executed after the commands of each
+                script. Defaults to None.
+
+        Raises:
+            SlurmFailed: if missing require parameters for the slurm script
+
+        """
+        if name is None or nodecount is None:
+            raise SlurmFailed("Bad parameters passed for slurm script.")
+        self._head = [
+            "#!/bin/bash", "#",
+            "#SBATCH --job-name={}".format(name),
+            "#SBATCH --nodes={}".format(nodecount),
+            "#SBATCH --distribution=cyclic"]
+        # sbatch parameters, with a None placeholder for the error file unique to each script
+        self._params = []
+        self._error = None
+        for key, value in (sbatch_params or {}).items():
+            if key == "error":
+                self._params.append(None)
+                self._error = value
+            elif value is not None:
+                self._params.append("#SBATCH --{}={}".format(key, value))
+            else:
+                self._params.append("#SBATCH --{}".format(key))
+        self._tail = [
+            "",
+            "echo \"nodes: \" $SLURM_JOB_NODELIST ",
+            "echo \"node count: \" $SLURM_JOB_NUM_NODES ",
+            "echo \"job name: \" $SLURM_JOB_NAME "]
+        self._prepend = list(prepend_cmds or [])
+        self._append = list(append_cmds or [])
+
+    def render(self, output, cmds, uniq, error=None):
+        """Render a script.
+
+        Args:
+            output (str): where to put the output (full path) or None
+            cmds (list): shell commands that are to be executed
+            uniq (str): a unique string to append to the job and log files
+            error (str, optional): where to put the error output, if different from the one in
+                the sbatch parameters. Defaults to None.
+
+        Returns:
+            str: the script contents
+
+        """
+        lines = list(self._head)
+        if output is not None:
+            lines.append("#SBATCH --output={}{}".format(output, uniq))
+        error = error if error is not None else self._error
+        for line in self._params:
+            if line is not None:
+                lines.append(line)
+            elif error is not None:
+                lines.append("#SBATCH --error={}{}".format(error, uniq))
+        lines.extend(self._tail)
+        lines.extend(self._prepend)
+        lines.extend(cmds)
+        lines.extend(self._append)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, output, cmds, uniq=None, error=None):
+        """Write a script.
+
+        Args:
+            path (str): where to write the script file
+            output (str): where to put the output (full path) or None
+            cmds (list): shell commands that are to be executed
+            uniq (str, optional): a unique string to append to the job and log files. Defaults to
+                None, which uses a random number.
+            error (str, optional): where to put the error output, if different from the one in
+                the sbatch parameters. Defaults to None.
+
+        Returns:
+            str: the full path of the script
+
+        """
+        if uniq is None:
+            uniq = random.randint(1, 100000)  # nosec
+        os.makedirs(path, exist_ok=True)
+        scriptfile = path + '/jobscript' + "_" + str(uniq) + ".sh"
+        with open(scriptfile, 'w') as script_file:
+            script_file.write(self.render(output, list(cmds), uniq, error))
+        return scriptfile
+
+
 def write_slurm_script(path, name, output, nodecount, cmds, uniq, sbatch_params=None):
     """Generate a script for submitting a job to slurm.
 
@@ -231,43 +337,9 @@ def write_slurm_script(path, name, output, nodecount, cmds, uniq, sbatch_params=
         str: the full path of the script
 
     """
-    if name is None or nodecount is None or cmds is None:
+    if cmds is None:
         raise SlurmFailed("Bad parameters passed for slurm script.")
-    if uniq is None:
-        uniq = random.randint(1, 100000)  # nosec
-    if not os.path.exists(path):
-        os.makedirs(path)
-    scriptfile = path + '/jobscript' + "_" + str(uniq) + ".sh"
-    with open(scriptfile, 'w') as script_file:
-        # identify what be used to run this script
-        script_file.write("#!/bin/bash\n#\n")
-
-        # write the mandatory parameters
-        script_file.write("#SBATCH --job-name={}\n".format(name))
-        script_file.write("#SBATCH --nodes={}\n".format(nodecount))
-        script_file.write("#SBATCH --distribution=cyclic\n")
-        if output is not None:
-            output = output + str(uniq)
-            script_file.write("#SBATCH --output={}\n".format(output))
-        if sbatch_params:
-            for key, value in list(sbatch_params.items()):
-                if value is not None:
-                    if key == "error":
-                        value = value + str(uniq)
-                    script_file.write("#SBATCH --{}={}\n".format(key, value))
-                else:
-                    script_file.write("#SBATCH --{}\n".format(key))
-        script_file.write("\n")
-
-        # debug
-        script_file.write("echo \"nodes: \" $SLURM_JOB_NODELIST \n")
-        script_file.write("echo \"node count: \" $SLURM_JOB_NUM_NODES \n")
-        script_file.write("echo \"job name: \" $SLURM_JOB_NAME \n")
-
-        for cmd in list(cmds):
-            script_file.write(cmd + "\n")
-        script_file.close()
-    return scriptfile
+    return SlurmScriptTemplate(name, nodecount, sbatch_params).write(path, output, cmds, uniq)
 
 
 def run_slurm_script(log, script, logfile=None):
@@ -319,6 +391,159 @@ def check_slurm_job(log, handle):
     return state
 
 
+class SlurmJobWatcher():
+    """Watch a set of slurm jobs and notify their owners when they finish.
+
+    All of the registered jobs are polled by a single thread with one squeue command per interval.
+    Jobs that are no longer reported by squeue are looked up with sacct. The polling interval is
+    doubled, up to max_interval, every time a poll completes without any job finishing and is
+    reset whenever a job finishes or a new job is registered.
+
+    A poll in which squeue or sacct fails, or which reports no jobs at all, provides no
+    information about the jobs it could not find, e.g. during a transient slurmctld outage. Those
+    jobs stay registered until they are reported or their max_wait is reached.
+    """
+
+    ACTIVE_STATES = ("PENDING", "RUNNING", "COMPLETING", "CONFIGURING")
+
+    def __init__(self, log, interval=5, max_interval=60, squeue="squeue", sacct="sacct"):
+        """Initialize a SlurmJobWatcher object.
+
+        Args:
+            log (logger): logger for the messages produced by this class
+            interval (int, optional): initial time in seconds between polls. Defaults to 5.
+            max_interval (int, optional): maximum time in seconds between polls. Defaults to 60.
+            squeue (str, optional): squeue command. Defaults to "squeue".
+            sacct (str, optional): sacct command. Defaults to "sacct".
+        """
+        self.log = log
+        self.interval = interval
+        self.max_interval = max_interval
+        self.squeue = squeue
+        self.sacct = sacct
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def register(self, handle, test, max_wait=3600):
+        """Start watching a slurm job.
+
+        Args:
+            handle (str): slurm job id
+            test (Test): object with a job_done callback function
+            max_wait (int, optional): maximum time to wait in seconds. Defaults to 3600 (1 hour).
+        """
+        with self._lock:
+            self._jobs[str(handle)] = (test, time.time() + max_wait)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def join(self, timeout=None):
+        """Wait for the watcher thread to exit once all of the jobs are done.
+
+        Args:
+            timeout (int, optional): maximum time in seconds to wait. Defaults to None.
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        """Poll the registered jobs until none are left."""
+        interval = self.interval
+        while True:
+            with self._lock:
+                if not self._jobs:
+                    self._thread = None
+                    return
+                handles = list(self._jobs)
+            self._wakeup.clear()
+
+            states = self.get_job_states(handles)
+            if not any(states.values()):
+                self.log.debug("No slurm job states available for jobs %s", ",".join(handles))
+            finished = 0
+            for handle in handles:
+                state = states.get(handle)
+                with self._lock:
+                    test, deadline = self._jobs[handle]
+                    if state is None or state in self.ACTIVE_STATES:
+                        if time.time() <= deadline:
+                            continue
+                        state = "MAXWAITREACHED"
+                        self.log.error("Job %s has timed out", handle)
+                    del self._jobs[handle]
+                finished += 1
+                self.log.debug(
+                    "FINAL STATE: slurm job %s completed with : %s at %s",
+                    handle, state, time.ctime())
+                with W_LOCK:
+                    test.job_done({"handle": handle, "state": state})
+
+            if finished:
+                interval = self.interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+            if self._wakeup.wait(interval):
+                interval = self.interval
+
+    def get_job_states(self, handles):
+        """Get the state of each of the specified slurm jobs.
+
+        Args:
+            handles (list): slurm job ids
+
+        Returns:
+            dict: slurm JOB_STATE_CODES string indexed by job id. Jobs unknown to both squeue and
+                sacct are UNKNOWN. The state is None if it could not be determined, i.e. if
+                squeue or sacct failed or if neither of them reported any job.
+
+        """
+        states = self._query(
+            [self.squeue, "--noheader", "--states=all", "--format='%i %T'",
+             "--jobs={}".format(",".join(handles))])
+        found = dict(states or {})
+        missing = [handle for handle in handles if handle not in found]
+        if missing:
+            accounting = self._query(
+                [self.sacct, "--noheader", "--parsable2", "--allocations",
+                 "--format=JobID,State", "--jobs={}".format(",".join(missing))])
+            if states is None or accounting is None:
+                states = None
+            found.update(accounting or {})
+        unknown = "UNKNOWN" if states is not None and found else None
+        return {handle: found.get(handle, unknown) for handle in handles}
+
+    def _query(self, command):
+        """Run a slurm command that lists one job id and state per line.
+
+        Args:
+            command (list): command and its arguments
+
+        Returns:
+            dict: job state indexed by job id or None if the command failed
+
+        """
+        states = {}
+        try:
+            result = run_local(self.log, " ".join(command), verbose=False, check=True)
+        except RunException as error:
+            self.log.debug(str(error))
+            return None
+        for line in result.stdout.splitlines():
+            fields = line.replace("|", " ").split()
+            if len(fields) >= 2:
+                # sacct reports cancelled jobs as "CANCELLED by <uid>"
+                states[fields[0]] = fields[1]
+        return states
+
+
+JOB_WATCHER = None
+
+
 def register_for_job_results(handle, test, max_wait=3600):
     """Register a callback for a slurm soak test job.
 
@@ -327,42 +552,11 @@ def register_for_job_results(handle, test, max_wait=3600):
         test (Test): object with a job_done callback function
         max_wait (int, optional): maximum time to wait in seconds. Defaults to 3600 (1 hour).
     """
-    params = {
-        "log": test.log,
-        "handle": handle,
-        "max_wait": max_wait,
-        "test_obj": test
-    }
-    athread = threading.Thread(target=watch_job, kwargs=params)
-    athread.start()
-
-
-def watch_job(log, handle, max_wait, test_obj):
-    """Watch for a slurm job to finish use callback function with the result.
-
-    Args:
-        log (logger): logger for the messages produced by this method
-        handle (str): the slurm job handle
-        max_wait (int): max time in seconds to wait
-        test_obj (Test): whom to notify when its done
-    """
-    wait_time = 0
-    while True:
-        state = check_slurm_job(log, handle)
-        if state in ("PENDING", "RUNNING", "COMPLETING", "CONFIGURING"):
-            if wait_time > max_wait:
-                state = "MAXWAITREACHED"
-                log.error("Job %s has timed out after %s secs", handle, max_wait)
-                break
-            wait_time += 5
-            time.sleep(5)
-        else:
-            break
-
-    log.debug("FINAL STATE: slurm job %s completed with : %s at %s", handle, state, time.ctime())
-    params = {"handle": handle, "state": state}
+    global JOB_WATCHER     # pylint: disable=global-statement
     with W_LOCK:
-        test_obj.job_done(params)
+        if JOB_WATCHER is None:
+            JOB_WATCHER = SlurmJobWatcher(test.log)
+    JOB_WATCHER.register(handle, test, max_wait)
 
 
 def srun_str(hosts, cmd, srun_params=None, timeout=None):
@@ -0,0 +1,186 @@
+"""
+(C) Copyright 2023 Intel Corporation.
+
+SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import random
+import threading
+import time
+
+# Distributions of the time between harasser groups
+HARASSER_TIMING = ("fixed", "random", "poisson")
+
+
+class HarasserScheduler():
+    """Launch groups of overlapping harassers during a soak pass.
+
+    The harassers of a group are launched together, each one stagger seconds after the previous
+    one, so that they overlap, e.g. an exclude during a snapshot during a container create burst.
+    A group is launched once the previous group has completed and a delay has elapsed. The delay
+    is the interval with fixed timing, uniformly distributed between 0 and twice the interval with
+    random timing and exponentially distributed with a mean of the interval, i.e. Poisson
+    arrivals, with poisson timing.
+
+    The start and end time of each harasser is recorded so that its impact on the running jobs
+    can be measured.
+    """
+
+    def __init__(self, log, launch, groups, timing="fixed", interval=600, stagger=0, seed=None):
+        """Initialize a HarasserScheduler object.
+
+        Args:
+            log (logger): logger for the messages produced by this class
+            launch (callable): function launching a harasser by name and returning an error
+                message or None if the harasser passed
+            groups (list): list of the harasser names of each group
+            timing (str, optional): distribution of the delay between groups, one of
+                HARASSER_TIMING. Defaults to "fixed".
+            interval (int, optional): mean delay in seconds between groups. Defaults to 600.
+            stagger (int, optional): delay in seconds between the harassers of a group.
+                Defaults to 0.
+            seed (int, optional): random seed, for a reproducible schedule. Defaults to None.
+        """
+        if timing not in HARASSER_TIMING:
+            raise ValueError("Invalid harasser timing: {}".format(timing))
+        self.log = log
+        self.launch = launch
+        self.groups = [list(group) for group in groups]
+        self.timing = timing
+        self.interval = interval
+        self.stagger = stagger
+        self.windows = {}
+        self.failures = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._index = 0
+        self._next = None
+
+    @property
+    def running(self):
+        """Determine if any harasser of the current group is still running.
+
+        Returns:
+            bool: True if a harasser is running
+
+        """
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def done(self):
+        """Determine if every group has been launched and has completed.
+
+        Returns:
+            bool: True if the schedule is complete
+
+        """
+        return self._index >= len(self.groups) and not self.running
+
+    def get_delay(self):
+        """Get the delay before the next group.
+
+        Returns:
+            float: the delay in seconds
+
+        """
+        if self.timing == "random":
+            return self._random.uniform(0, 2 * self.interval)
+        if self.timing == "poisson":
+            return self._random.expovariate(1 / self.interval) if self.interval else 0
+        return self.interval
+
+    def start(self):
+        """Schedule the first group."""
+        self._next = time.time() + self.get_delay()
+        self.log.info(
+            "<<Harasser schedule: %s groups, %s timing, first in %.0fs>>", len(self.groups),
+            self.timing, self._next - time.time())
+
+    def poll(self):
+        """Launch the next group if it is due.
+
+        This is meant to be called periodically, e.g. while waiting for the soak jobs.
+        """
+        if self._next is None or self._index >= len(self.groups):
+            return
+        if self.running:
+            return
+        if self._threads:
+            # The previous group completed; schedule the next one
+            self._threads = []
+            self._next = time.time() + self.get_delay()
+            self.log.info("<<Next harasser group in %.0fs>>", self._next - time.time())
+            return
+        if time.time() < self._next:
+            return
+        group = self.groups[self._index]
+        self._index += 1
+        self.log.info("<<Launching harasser group %s: %s>>", self._index, ", ".join(group))
+        for position, harasser in enumerate(group):
+            thread = threading.Thread(
+                target=self._run, args=(harasser, position * self.stagger), name=harasser,
+                daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self, harasser, delay):
+        """Launch a harasser and record its time window and status.
+
+        Args:
+            harasser (str): harasser name
+            delay (float): time in seconds to wait before launching the harasser
+        """
+        time.sleep(delay)
+        start = time.time()
+        try:
+            status_msg = self.launch(harasser)
+        except Exception as error:      # pylint: disable=broad-except
+            status_msg = "<<FAILED: harasser {} raised {}>>".format(harasser, error)
+        end = time.time()
+        with self._lock:
+            self.windows.setdefault(harasser, []).append((start, end))
+            if status_msg:
+                self.failures.append(status_msg)
+        self.log.info("<<Harasser %s completed in %.0fs>>", harasser, end - start)
+
+    def join(self):
+        """Wait for the running harassers; groups that have not been launched are skipped."""
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        skipped = self.groups[self._index:]
+        if skipped:
+            self.log.info("<<Skipped harasser groups: %s>>", skipped)
+        self._index = len(self.groups)
+
+
+def get_harasser_scheduler(self, namespace):
+    """Create a harasser scheduler from a declarative test yaml schedule.
+
+    Yaml values, under the namespace:
+        groups (list): list of the harassers of each group, e.g.
+            [[container-create, snapshot, exclude], [reintegrate]]
+        timing (str, optional): fixed, random or poisson. Defaults to fixed.
+        interval (int, optional): mean delay in seconds between groups. Defaults to 600.
+        stagger (int, optional): delay in seconds between the harassers of a group.
+            Defaults to 0.
+        seed (int, optional): random seed. Defaults to None.
+
+    Args:
+        self (obj): soak obj
+        namespace (str): yaml namespace of the schedule
+
+    Returns:
+        HarasserScheduler: the scheduler for a soak pass, launching harassers against the soak
+            pools
+
+    """
+    def launch(harasser):
+        return self.launch_harasser(harasser, self.pool)
+
+    return HarasserScheduler(
+        self.log, launch, self.params.get("groups", namespace, []),
+        self.params.get("timing", namespace, "fixed"),
+        self.params.get("interval", namespace, 600),
+        self.params.get("stagger", namespace, 0),
+        self.params.get("seed", namespace, None))
@@ -0,0 +1,431 @@
+"""
+(C) Copyright 2023 Intel Corporation.
+
+SPDX-License-Identifier: BSD-2-Clause-Patent
+"""
+import csv
+import json
+import os
+import threading
+import time
+
+from exception_utils import CommandFailure
+from run_utils import run_remote
+from telemetry_utils import TelemetryUtils
+
+# Cumulative engine counters summed over every engine and pool
+SAMPLER_TELEMETRY = {
+    "update_bytes": "engine_pool_xferred_update",
+    "fetch_bytes": "engine_pool_xferred_fetch",
+    "update_ops": "engine_pool_ops_update",
+    "fetch_ops": "engine_pool_ops_fetch",
+}
+
+# Count completed IOR iterations (and the MiB they moved) and mdtest phases in the job output.
+# IOR iterations are the 11 column per-iteration result rows ending with the iteration number,
+# i.e. not the "Summary of all tests" rows. mdtest phases are only counted in the "SUMMARY rate"
+# block, as the "SUMMARY time" block lists the same phases.
+SAMPLER_PROGRESS_CMD = (
+    "awk 'FNR == 1 {rate = 0} "
+    "NF == 11 && /^(write|read) +[0-9.]+ / && $11 ~ /^[0-9]+$/ {ior++; mib += $2 * $10} "
+    "/^SUMMARY rate/ {rate = 1; next} /^[^ ]/ {rate = 0} "
+    "rate && /^ +(File|Directory|Tree) (creation|stat|read|removal) +:/ {mdtest++} "
+    "END {print ior + 0, mib + 0, mdtest + 0}' {}/* 2>/dev/null || true")
+
+# Columns whose rate of change is reported by summarize_timeseries()
+SUMMARY_RATES = ("update_bytes", "fetch_bytes", "update_ops", "fetch_ops", "ior_mib", "mdtest")
+
+
+class TimeSeriesSampler():
+    """Periodically sample a set of values into a CSV file.
+
+    Each source is a function returning a dictionary of values for its columns. Rows are buffered
+    and appended to the file in chunks so that a long running sampler only rewrites a small part
+    of the file. Values that a source fails to provide are left empty.
+    """
+
+    def __init__(self, log, path, interval=60, chunk_rows=10):
+        """Initialize a TimeSeriesSampler object.
+
+        Args:
+            log (logger): logger for the messages produced by this class
+            path (str): CSV file in which to record the samples
+            interval (int, optional): time in seconds between samples. Defaults to 60.
+            chunk_rows (int, optional): number of rows to buffer before writing them to the file.
+                Defaults to 10.
+        """
+        self.log = log
+        self.path = path
+        self.interval = interval
+        self.chunk_rows = chunk_rows
+        self.columns = ["time", "elapsed"]
+        self._sources = []
+        self._rows = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_time = None
+
+    def add_source(self, columns, function):
+        """Add a source of sampled values.
+
+        Args:
+            columns (list): names of the columns provided by the function
+            function (callable): function with no arguments returning a dictionary of values
+                indexed by column name
+        """
+        self.columns.extend(columns)
+        self._sources.append(function)
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self._start_time = time.time()
+        with open(self.path, "w", encoding="utf-8") as handle:
+            csv.writer(handle).writerow(self.columns)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and write any buffered rows to the file."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._flush()
+
+    def sample(self):
+        """Record a single row of values from each source."""
+        now = time.time()
+        row = {"time": round(now, 1), "elapsed": round(now - self._start_time, 1)}
+        for function in self._sources:
+            try:
+                row.update(function())
+            except Exception as error:      # pylint: disable=broad-except
+                self.log.debug("Sampler source %s failed: %s", function.__name__, error)
+        self._rows.append([row.get(column, "") for column in self.columns])
+        if len(self._rows) >= self.chunk_rows:
+            self._flush()
+
+    def _run(self):
+        """Sample at the requested interval until stopped."""
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                return
+
+    def _flush(self):
+        """Append the buffered rows to the file."""
+        if not self._rows:
+            return
+        with open(self.path, "a", encoding="utf-8") as handle:
+            csv.writer(handle).writerows(self._rows)
+        self._rows = []
+
+
+def start_soak_sampler(self, path):
+    """Start sampling engine telemetry, pool space and client job progress for a soak pass.
+
+    The sampler is configured with the 'sample_interval' test yaml parameter. A value of 0
+    disables the sampling.
+
+    Args:
+        self (obj): soak obj
+        path (str): CSV file in which to record the samples
+
+    Returns:
+        TimeSeriesSampler: the running sampler or None if sampling is disabled
+
+    """
+    interval = self.params.get("sample_interval", "/run/*", 60)
+    if not interval:
+        return None
+    sampler = TimeSeriesSampler(self.log, path, interval)
+    # The sampler thread uses its own dmg command, as the soak's dmg commands are not thread safe
+    dmg = self.get_dmg_command().copy()
+    dmg.verbose = False
+    telemetry = TelemetryUtils(dmg, self.hostlist_servers)
+    soaktest_dir = self.soaktest_dir
+
+    def telemetry_source():
+        info = telemetry.get_metrics(",".join(SAMPLER_TELEMETRY.values()))
+        values = dict.fromkeys(SAMPLER_TELEMETRY, 0)
+        for host_info in info.values():
+            for column, name in SAMPLER_TELEMETRY.items():
+                for metric in host_info.get(name, {}).get("metrics", []):
+                    values[column] += metric["value"]
+        return values
+
+    def pool_source():
+        values = {"pool_free": 0, "rebuild_busy": 0}
+        for pool in list(self.pool):
+            try:
+                data = dmg.pool_query(pool.identifier)
+            except CommandFailure:
+                continue
+            response = data.get("response") or {}
+            values["pool_free"] += sum(
+                tier["free"] for tier in response.get("tier_stats") or [])
+            if (response.get("rebuild") or {}).get("state") == "busy":
+                values["rebuild_busy"] = 1
+        return values
+
+    def progress_source():
+        values = {"ior": 0, "ior_mib": 0.0, "mdtest": 0}
+        result = run_remote(
+            self.log, self.hostlist_clients, SAMPLER_PROGRESS_CMD.replace("{}", soaktest_dir),
+            verbose=False, timeout=30)
+        for data in result.output:
+            fields = " ".join(data.stdout).split()
+            if len(fields) != 3:
+                continue
+            # Identical output from several hosts is only reported once
+            count = len(data.hosts)
+            values["ior"] += int(fields[0]) * count
+            values["ior_mib"] += float(fields[1]) * count
+            values["mdtest"] += int(fields[2]) * count
+        values["ior_mib"] = round(values["ior_mib"], 1)
+        return values
+
+    sampler.add_source(list(SAMPLER_TELEMETRY), telemetry_source)
+    sampler.add_source(["pool_free", "rebuild_busy"], pool_source)
+    sampler.add_source(["ior", "ior_mib", "mdtest"], progress_source)
+    self.log.info("<<Sampling soak pass %s every %ss to %s>>", self.loop, interval, path)
+    sampler.start()
+    return sampler
+
+
+def read_timeseries(path):
+    """Read a CSV file written by a TimeSeriesSampler.
+
+    Args:
+        path (str): CSV file to read
+
+    Returns:
+        dict: list of values (float or None) indexed by column name
+
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        columns = next(reader, [])
+        data = {column: [] for column in columns}
+        for row in reader:
+            for column, value in zip(columns, row):
+                data[column].append(float(value) if value != "" else None)
+    return data
+
+
+def get_rates(times, values):
+    """Get the rate of change of a cumulative counter.
+
+    Intervals in which the counter decreases, e.g. when an engine restarts, are skipped.
+
+    Args:
+        times (list): sample times
+        values (list): counter value, or None, for each sample time
+
+    Returns:
+        list: (time, rate) tuples for the midpoint of each interval
+
+    """
+    rates = []
+    previous = None
+    for sample_time, value in zip(times, values):
+        if value is None:
+            previous = None
+            continue
+        if previous is not None and sample_time > previous[0] and value >= previous[1]:
+            rates.append(
+                ((sample_time + previous[0]) / 2,
+                 (value - previous[1]) / (sample_time - previous[0])))
+        previous = (sample_time, value)
+    return rates
+
+
+def get_trend(points):
+    """Get the least squares slope of a series.
+
+    Args:
+        points (list): (x, y) tuples
+
+    Returns:
+        float: the slope or None if it cannot be determined
+
+    """
+    if len(points) < 2:
+        return None
+    mean_x = sum(point[0] for point in points) / len(points)
+    mean_y = sum(point[1] for point in points) / len(points)
+    var_x = sum((point[0] - mean_x) ** 2 for point in points)
+    if not var_x:
+        return None
+    return sum((point[0] - mean_x) * (point[1] - mean_y) for point in points) / var_x
+
+
+def get_windows(times, flags):
+    """Get the time windows during which a flag column is set.
+
+    Args:
+        times (list): sample times
+        flags (list): flag value, or None, for each sample time
+
+    Returns:
+        list: (start, end) tuples of each window
+
+    """
+    windows = []
+    start = None
+    for sample_time, flag in zip(times, flags):
+        if flag and start is None:
+            start = sample_time
+        elif not flag and start is not None:
+            windows.append((start, sample_time))
+            start = None
+    if start is not None:
+        windows.append((start, times[-1]))
+    return windows
+
+
+def _mean(values):
+    """Get the mean of a list of values or None if the list is empty."""
+    return sum(values) / len(values) if values else None
+
+
+def get_window_impact(rates, windows):
+    """Get the change of each rate inside a set of time windows.
+
+    Args:
+        rates (dict): (time, rate) tuples from get_rates() indexed by column
+        windows (list): (start, end) tuples of each window
+
+    Returns:
+        dict: the mean rate "outside" and "inside" of the windows and their relative difference,
+            the "impact", indexed by column
+
+    """
+    impact = {}
+    for column, points in rates.items():
+        inside = [rate for when, rate in points
+                  if any(start <= when <= end for start, end in windows)]
+        outside = [rate for when, rate in points
+                   if not any(start <= when <= end for start, end in windows)]
+        before = _mean(outside)
+        during = _mean(inside)
+        if before and during is not None:
+            impact[column] = {
+                "outside": before, "inside": during, "impact": (during - before) / before}
+    return impact
+
+
+def summarize_timeseries(path, threshold=0.1, harassers=None):
+    """Summarize the samples recorded for a soak pass.
+
+    For each cumulative counter the mean rate, its trend (the least squares slope as a fraction of
+    the mean rate per hour) and the change between the first and last third of the pass are
+    reported. The pass is marked as regressed when the rate in the last third is more than
+    threshold lower than in the first third. The mean rates inside and outside of each window in
+    which a pool was rebuilding are reported as the rebuild impact, and likewise for the time
+    windows of each harasser.
+
+    Args:
+        path (str): CSV file written by a TimeSeriesSampler
+        threshold (float, optional): fractional rate drop reported as a regression. Defaults to
+            0.1.
+        harassers (dict, optional): list of the (start, end) times of each run of a harasser
+            indexed by harasser name. Defaults to None.
+
+    Returns:
+        dict: summary of the samples
+
+    """
+    data = read_timeseries(path)
+    times = data.get("elapsed", [])
+    summary = {"samples": len(times), "duration": times[-1] if times else 0, "rates": {},
+               "regressions": [], "rebuild": {}, "harassers": {}}
+
+    rates = {}
+    for column in SUMMARY_RATES:
+        if column not in data:
+            continue
+        rates[column] = get_rates(times, data[column])
+        points = rates[column]
+        mean = _mean([point[1] for point in points])
+        if not mean:
+            continue
+        slope = get_trend(points)
+        third = len(points) // 3
+        change = None
+        if third:
+            first = _mean([point[1] for point in points[:third]])
+            last = _mean([point[1] for point in points[-third:]])
+            if first:
+                change = (last - first) / first
+        summary["rates"][column] = {
+            "mean": mean,
+            "trend": slope * 3600 / mean if slope is not None else None,
+            "change": change}
+        if change is not None and change < -threshold:
+            summary["regressions"].append(column)
+
+    windows = get_windows(times, data.get("rebuild_busy", []))
+    if windows:
+        summary["rebuild"]["windows"] = windows
+        summary["rebuild"].update(get_window_impact(rates, windows))
+
+    if harassers and times:
+        # Harasser windows are absolute times
+        offset = data["time"][0] - times[0]
+        for name, runs in harassers.items():
+            windows = [(start - offset, end - offset) for start, end in runs]
+            summary["harassers"][name] = {"windows": windows}
+            summary["harassers"][name].update(get_window_impact(rates, windows))
+    return summary
+
+
+def log_timeseries_summary(log, summary, path=None):
+    """Log a soak pass time series summary and optionally save it as JSON.
+
+    Args:
+        log (logger): logger for the messages produced by this method
+        summary (dict): output from summarize_timeseries()
+        path (str, optional): JSON file in which to save the summary. Defaults to None.
+    """
+    log.info(
+        "<<Soak pass time series: %s samples over %ss>>", summary["samples"], summary["duration"])
+    for column, info in summary["rates"].items():
+        log.info(
+            "  %-14s mean %14.1f/s  trend %s/h  first->last third %s", column, info["mean"],
+            "{:+.1%}".format(info["trend"]) if info["trend"] is not None else "-",
+            "{:+.1%}".format(info["change"]) if info["change"] is not None else "-")
+    for start, end in summary["rebuild"].get("windows", []):
+        log.info("  rebuild window %ss-%ss", start, end)
+    for column, info in summary["rebuild"].items():
+        if column != "windows":
+            log.info("  %-14s rebuild impact %+.1f%%", column, info["impact"] * 100)
+    for name, harasser in summary.get("harassers", {}).items():
+        for column, info in harasser.items():
+            if column != "windows":
+                log.info("  %-14s %s impact %+.1f%%", column, name, info["impact"] * 100)
+    if summary["regressions"]:
+        log.info("  Rate regressions: %s", ", ".join(summary["regressions"]))
+    if path:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+            handle.write("\n")
+
+
+def stop_soak_sampler(self, sampler, harassers=None):
+    """Stop a soak pass sampler and log a summary of its samples.
+
+    Args:
+        self (obj): soak obj
+        sampler (TimeSeriesSampler): sampler returned by start_soak_sampler()
+        harassers (dict, optional): list of the (start, end) times of each run of a harasser
+            indexed by harasser name. Defaults to None.
+    """
+    if sampler is None:
+        return
+    sampler.stop()
+    summary = summarize_timeseries(sampler.path, harassers=harassers)
+    log_timeseries_summary(
+        self.log, summary, os.path.splitext(sampler.path)[0] + "_summary.json")
@@ -7,12 +7,12 @@ SPDX-License-Identifier: BSD-2-Clause-Patent
 import os
 import time
 from datetime import datetime, timedelta
-import multiprocessing
 import threading
 import random
 from filecmp import cmp
 from getpass import getuser
 import socket
+from concurrent.futures import ThreadPoolExecutor
 
 from apricot import TestWithServers
 from ClusterShell.NodeSet import NodeSet
@@ -26,10 +26,12 @@ from soak_utils import DDHHMMSS_format, add_pools, get_remote_dir, \
     launch_snapshot, launch_exclude_reintegrate, \
     create_ior_cmdline, cleanup_dfuse, create_fio_cmdline, \
     build_job_script, SoakTestError, launch_server_stop_start, get_harassers, \
-    create_racer_cmdline, run_event_check, run_monitor_check, \
+    create_racer_cmdline, run_monitor_check, \
     create_mdtest_cmdline, reserved_file_copy, run_metrics_check, \
     get_journalctl, get_daos_server_logs, create_macsio_cmdline, \
-    create_app_cmdline, display_job_failures
+    create_app_cmdline, display_job_failures, SoakLogHarvester, launch_container_create, H_LOCK
+from soak_perf_utils import start_soak_sampler, stop_soak_sampler
+from soak_harasser_utils import get_harasser_scheduler
 
 
 class SoakTestBase(TestWithServers):
@@ -56,6 +58,7 @@ class SoakTestBase(TestWithServers):
         self.harassers = None
         self.offline_harassers = None
         self.harasser_results = None
+        self.hung_harassers = []
         self.all_failed_jobs = None
         self.username = None
         self.used = None
@@ -71,6 +74,11 @@ class SoakTestBase(TestWithServers):
         self.sudo_cmd = None
         self.slurm_exclude_servers = True
         self.control = get_local_host()
+        self.log_harvester = None
+        self.harasser_schedule = None
+        self.harasser_windows = None
+        self.reuse_containers = False
+        self.job_containers = None
 
     def setUp(self):
         """Define test setup to be done."""
@@ -89,6 +97,10 @@ class SoakTestBase(TestWithServers):
         self.sharedsoaktest_dir = self.sharedsoak_dir + "/pass" + str(self.loop)
         # Initialize dmg cmd
         self.dmg_command = self.get_dmg_command()
+        # Gather the logs of each pass in the background while the next pass runs
+        self.log_harvester = SoakLogHarvester(
+            self, self.params.get("harvest_workers", "/run/*", 4),
+            self.params.get("harvest_timeout", "/run/*", 900))
         # Fail if slurm partition is not defined
         # NOTE: Slurm reservation and partition are created before soak runs.
         # CI uses partition=daos_client and no reservation.
@@ -124,6 +136,9 @@ class SoakTestBase(TestWithServers):
         """
         self.log.info("<<preTearDown Started>> at %s", time.ctime())
         errors = []
+        # wait for the logs of the last pass
+        if self.log_harvester:
+            self.log_harvester.join()
         # clear out any jobs in squeue;
         if self.failed_job_id_list:
             job_id = " ".join([str(job) for job in self.failed_job_id_list])
@@ -199,57 +214,67 @@ class SoakTestBase(TestWithServers):
     def launch_harasser(self, harasser, pool):
         """Launch any harasser tests if defined in yaml.
 
+        Each harasser runs in its own thread with its own dmg command and TestPool objects, as
+        harassers may run at the same time as other harassers and the soak pass sampler.
+
+        A harasser thread cannot be stopped, so one that does not complete within harasser_to
+        keeps running. It is tracked as hung, and no other harasser or soak pass is started while
+        it is still running, as it may still be stopping or starting servers.
+
         Args:
             harasser (str): harasser to launch
             pool (list): list of TestPool obj
 
+        Raises:
+            SoakTestError: if the harasser is not supported, does not complete within
+                harasser_to, or a previously hung harasser is still running
+
         Returns:
             status_msg(str): pass/fail status message
 
         """
+        self.check_hung_harassers()
         # Init the status message
         status_msg = None
-        job = None
-        results = multiprocessing.Queue()
-        args = multiprocessing.Queue()
+        pools = [test_pool.copy() for test_pool in pool]
+        dmg_command = self.dmg_command.copy()
         # Launch harasser
         self.log.info("\n<<<Launch harasser %s>>>\n", harasser)
         if harasser == "snapshot":
             method = launch_snapshot
             name = "SNAPSHOT"
-            params = (self, self.pool[0], name)
-            job = threading.Thread(target=method, args=params, name=name)
+            params = (self, pools[0], name)
+        elif harasser == "container-create":
+            method = launch_container_create
+            name = "CONT_CREATE"
+            params = (self, pools[1], name)
         elif harasser == "exclude":
             method = launch_exclude_reintegrate
             name = "EXCLUDE"
-            params = (self, pool[1], name, results, args)
-            job = multiprocessing.Process(target=method, args=params, name=name)
+            params = (self, pools[1], name, dmg_command)
         elif harasser == "reintegrate":
             method = launch_exclude_reintegrate
             name = "REINTEGRATE"
-            params = (self, pool[1], name, results, args)
-            job = multiprocessing.Process(target=method, args=params, name=name)
+            params = (self, pools[1], name, dmg_command)
         elif harasser == "server-stop":
             method = launch_server_stop_start
             name = "SVR_STOP"
-            params = (self, pool, name, results, args)
-            job = multiprocessing.Process(target=method, args=params, name=name)
+            params = (self, pools, name, dmg_command)
         elif harasser == "server-start":
             method = launch_server_stop_start
             name = "SVR_START"
-            params = (self, pool, name, results, args)
-            job = multiprocessing.Process(target=method, args=params, name=name)
+            params = (self, pools, name, dmg_command)
         elif harasser == "server-reintegrate":
             method = launch_server_stop_start
             name = "SVR_REINTEGRATE"
-            params = (self, pool, name, results, args)
-            job = multiprocessing.Process(target=method, args=params, name=name)
+            params = (self, pools, name, dmg_command)
         else:
             raise SoakTestError(
                 "<<FAILED: Harasser {} is not supported. ".format(
                     harasser))
 
         # start harasser
+        job = threading.Thread(target=method, args=params, name=name, daemon=True)
         job.start()
         timeout = self.params.get("harasser_to", "/run/soak_harassers/*", 30)
         # Wait for harasser job to join
@@ -257,23 +282,35 @@ class SoakTestBase(TestWithServers):
         if job.is_alive():
             self.log.error(
                 "<< ERROR: harasser %s is alive, failed to join>>", job.name)
-            if name not in ["REBUILD", "SNAPSHOT"]:
-                job.terminate()
-                status_msg = "<<FAILED: {} has been terminated.".format(name)
+            with H_LOCK:
+                self.hung_harassers.append(job)
             raise SoakTestError(
                 "<<FAILED: Soak failed while running {} . ".format(name))
-        if name not in ["REBUILD", "SNAPSHOT"]:
-            self.harasser_results = results.get()
-            self.harasser_args = args.get()
         # Check if the completed job passed
-        self.log.info("Harasser results: %s", self.harasser_results)
-        self.log.info("Harasser args: %s", self.harasser_args)
-        if not self.harasser_results[name.upper()]:
+        with H_LOCK:
+            self.log.info("Harasser results: %s", self.harasser_results)
+            self.log.info("Harasser args: %s", self.harasser_args)
+            passed = self.harasser_results.get(name.upper())
+        if not passed:
             status_msg = "<< HARASSER {} FAILED in pass {} at {}>> ".format(
                 name, self.loop, time.ctime())
             self.log.error(status_msg)
         return status_msg
 
+    def check_hung_harassers(self):
+        """Verify that no harasser which failed to complete in time is still running.
+
+        Raises:
+            SoakTestError: if a hung harasser thread is still running
+
+        """
+        with H_LOCK:
+            self.hung_harassers = [job for job in self.hung_harassers if job.is_alive()]
+            hung = [job.name for job in self.hung_harassers]
+        if hung:
+            raise SoakTestError(
+                "<<FAILED: Hung harassers are still running: {}".format(", ".join(hung)))
+
     def harasser_job_done(self, args):
         """Call this function when a job is done.
 
@@ -288,6 +325,9 @@ class SoakTestBase(TestWithServers):
     def job_setup(self, jobs, pool):
         """Create the cmdline needed to launch job.
 
+        The command lines, containers and batch scripts of each job, nodesperjob and taskspernode
+        combination are created in parallel by up to setup_threads threads.
+
         Args:
             jobs(list): list of jobs to run
             pool (obj): TestPool obj
@@ -299,9 +339,9 @@ class SoakTestBase(TestWithServers):
         """
         job_cmdlist = []
         self.log.info("<<Job_Setup %s >> at %s", self.test_name, time.ctime())
+        setup_threads = self.params.get("setup_threads", "/run/*", 8)
+        job_specs = []
         for job in jobs:
-            jobscript = []
-            commands = []
             nodesperjob = self.params.get(
                 "nodesperjob", "/run/" + job + "/*", [1])
             taskspernode = self.params.get(
@@ -316,28 +356,54 @@ class SoakTestBase(TestWithServers):
                         " Job requires {}".format(
                             len(self.hostlist_clients), npj))
                 for ppn in list(taskspernode):
-                    if "ior" in job:
-                        commands = create_ior_cmdline(self, job, pool, ppn, npj)
-                    elif "fio" in job:
-                        commands = create_fio_cmdline(self, job, pool)
-                    elif "mdtest" in job:
-                        commands = create_mdtest_cmdline(
-                            self, job, pool, ppn, npj)
-                    elif "daos_racer" in job:
-                        commands = create_racer_cmdline(self, job)
-                    elif "vpic" in job:
-                        commands = create_app_cmdline(self, job, pool, ppn, npj)
-                    elif "lammps" in job:
-                        commands = create_app_cmdline(self, job, pool, ppn, npj)
-                    elif "macsio" in job:
-                        commands = create_macsio_cmdline(self, job, pool, ppn, npj)
-                    else:
-                        raise SoakTestError(
-                            "<<FAILED: Job {} is not supported. ".format(job))
-                    jobscript = build_job_script(self, commands, job, npj)
-                    job_cmdlist.extend(jobscript)
+                    job_specs.append((job, pool, ppn, npj))
+        # daos_racer creates its own pool, so it is set up before the other jobs
+        for job_spec in job_specs:
+            if "daos_racer" in job_spec[0]:
+                job_cmdlist.extend(self.job_setup_single(*job_spec))
+        with ThreadPoolExecutor(max_workers=setup_threads) as executor:
+            for jobscript in executor.map(
+                    lambda job_spec: self.job_setup_single(*job_spec),
+                    [job_spec for job_spec in job_specs if "daos_racer" not in job_spec[0]]):
+                job_cmdlist.extend(jobscript)
+        self.log.info(
+            "<<Job_Setup %s completed with %s scripts>> at %s", self.test_name, len(job_cmdlist),
+            time.ctime())
         return job_cmdlist
 
+    def job_setup_single(self, job, pool, ppn, npj):
+        """Create the batch scripts of a job for a nodesperjob and taskspernode combination.
+
+        Args:
+            job (str): job to run
+            pool (obj): TestPool obj
+            ppn (int): number of tasks to run on each node
+            npj (int): number of nodes per job
+
+        Returns:
+            list: sbatch scripts that can be launched by slurm job manager
+
+        """
+        if "ior" in job:
+            commands = create_ior_cmdline(self, job, pool, ppn, npj)
+        elif "fio" in job:
+            commands = create_fio_cmdline(self, job, pool)
+        elif "mdtest" in job:
+            commands = create_mdtest_cmdline(
+                self, job, pool, ppn, npj)
+        elif "daos_racer" in job:
+            commands = create_racer_cmdline(self, job)
+        elif "vpic" in job:
+            commands = create_app_cmdline(self, job, pool, ppn, npj)
+        elif "lammps" in job:
+            commands = create_app_cmdline(self, job, pool, ppn, npj)
+        elif "macsio" in job:
+            commands = create_macsio_cmdline(self, job, pool, ppn, npj)
+        else:
+            raise SoakTestError(
+                "<<FAILED: Job {} is not supported. ".format(job))
+        return build_job_script(self, commands, job, npj)
+
     def job_startup(self, job_cmdlist):
         """Submit job batch script.
 
@@ -392,12 +458,20 @@ class SoakTestBase(TestWithServers):
         failed_harasser_msg = None
         harasser_timer = time.time()
         check_time = datetime.now()
-        event_check_messages = []
         since = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         # loop time exists after the first pass; no harassers in the first pass
         if self.harasser_loop_time and self.harassers:
             harasser_interval = self.harasser_loop_time / (
                 len(self.harassers) + 1)
+        # declarative harasser schedule; by default no harassers in the first pass
+        scheduler = None
+        if self.harasser_schedule and self.loop >= self.params.get(
+                "start_pass", self.harasser_schedule, 2):
+            self.harasser_results = {}
+            self.harasser_args = {}
+            scheduler = get_harasser_scheduler(self, self.harasser_schedule)
+            scheduler.start()
+        offline_delay = self.params.get("offline_harasser_delay", "/run/soak_harassers/*", 120)
         # If there is nothing to do; exit
         if job_id_list:
             # wait for all the jobs to finish
@@ -424,20 +498,24 @@ class SoakTestBase(TestWithServers):
                         harasser_timer += harasser_interval
                         failed_harasser_msg = self.launch_harasser(
                             harasser, self.pool)
+                if scheduler:
+                    scheduler.poll()
                 time.sleep(5)
+            if scheduler:
+                # wait for the running harassers and record when they ran
+                scheduler.join()
+                self.all_failed_harassers.extend(scheduler.failures)
+                self.harasser_windows.update(scheduler.windows)
             if time.time() < self.end_time:
                 # Run any offline harassers after first loop
                 if self.offline_harassers and self.loop >= 1:
                     for offline_harasser in self.offline_harassers:
-                        if time.time() + int(180) < self.end_time:
+                        if time.time() + offline_delay + 60 < self.end_time:
                             failed_harasser_msg = self.launch_harasser(
                                 offline_harasser, self.pool)
-                            # wait 2 minutes to issue next harasser
-                            time.sleep(120)
-            # check journalctl for events;
+                            # wait before issuing the next harasser
+                            time.sleep(offline_delay)
             until = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            event_check_messages = run_event_check(self, since, until)
-            self.check_errors.extend(event_check_messages)
             run_monitor_check(self)
             # init harasser list when all jobs are done
             self.harassers = []
@@ -451,11 +529,11 @@ class SoakTestBase(TestWithServers):
                 else:
                     self.log.info(
                         "<< Job %s failed with status %s>>", job, result)
-            # gather all the logfiles for this pass and cleanup test nodes
-            try:
-                get_remote_dir(self, self.soaktest_dir, self.outputsoak_dir, self.hostlist_clients)
-            except SoakTestError as error:
-                self.log.info("Remote copy failed with %s", error)
+            # check journalctl for events, gather all the logfiles for this pass and cleanup
+            # test nodes while the next pass runs
+            self.log_harvester.submit(
+                self.loop, self.soaktest_dir, self.sharedsoaktest_dir, self.outputsoak_dir,
+                self.hostlist_clients, since, until)
             self.soak_results = {}
         return job_id_list
 
@@ -496,19 +574,27 @@ class SoakTestBase(TestWithServers):
         os.makedirs(self.sharedsoaktest_dir, exist_ok=True)
         # Create local test log directory for this pass
         os.makedirs(self.soaktest_dir)
-        # create the batch scripts
+        # create the batch scripts; containers are only shared by the jobs of this pass
+        self.job_containers = {}
         job_script_list = self.job_setup(jobs, pools)
         # randomize job list
         random.seed(4)
         random.shuffle(job_script_list)
-        # Gather the job_ids
-        job_id_list = self.job_startup(job_script_list)
-        # Initialize the failed_job_list to job_list so that any
-        # unexpected failures will clear the squeue in tearDown
-        self.failed_job_id_list = job_id_list
-
-        # Wait for jobs to finish and cancel/kill jobs if necessary
-        self.failed_job_id_list = self.job_completion(job_id_list)
+        # Record engine, pool and job progress samples for this pass
+        self.harasser_windows = {}
+        sampler = start_soak_sampler(
+            self, os.path.join(outputsoaktest_dir, "pass{}_timeseries.csv".format(self.loop)))
+        try:
+            # Gather the job_ids
+            job_id_list = self.job_startup(job_script_list)
+            # Initialize the failed_job_list to job_list so that any
+            # unexpected failures will clear the squeue in tearDown
+            self.failed_job_id_list = job_id_list
+
+            # Wait for jobs to finish and cancel/kill jobs if necessary
+            self.failed_job_id_list = self.job_completion(job_id_list)
+        finally:
+            stop_soak_sampler(self, sampler, self.harasser_windows)
         # Log the failing job ID
         if self.failed_job_id_list:
             self.log.info(
@@ -544,6 +630,8 @@ class SoakTestBase(TestWithServers):
         single_test_pool = self.params.get(
             "single_test_pool", test_param + "*", True)
         harassers = self.params.get("harasserlist", test_param + "*")
+        self.harasser_schedule = self.params.get("harasser_schedule", test_param + "*")
+        self.reuse_containers = self.params.get("reuse_containers", test_param + "*", False)
         job_list = self.params.get("joblist", test_param + "*")
         resv_bytes = self.params.get("resv_bytes", test_param + "*", 500000000)
         ignore_soak_errors = self.params.get("ignore_soak_errors", test_param + "*", False)
@@ -599,6 +687,11 @@ class SoakTestBase(TestWithServers):
         self.end_time = self.start_time + self.test_timeout
         self.log.info("<<START %s >> at %s", self.test_name, time.ctime())
         while time.time() < self.end_time:
+            # Do not start a new pass while a hung harasser may still be changing the system
+            try:
+                self.check_hung_harassers()
+            except SoakTestError as error:
+                self.fail(error)
             # Start new pass
             start_loop_time = time.time()
             self.log.info(
@@ -10,6 +10,7 @@ import time
 import random
 import threading
 import re
+from concurrent.futures import ThreadPoolExecutor
 from ior_utils import IorCommand
 from fio_utils import FioCommand
 from mdtest_utils import MdtestCommand
@@ -21,6 +22,7 @@ from general_utils import get_host_data, get_random_string, \
     run_command, DaosTestError, pcmd, get_random_bytes, \
     run_pcmd, list_to_str, get_log_file
 from command_utils_base import EnvironmentVariables
+from exception_utils import CommandFailure
 import slurm_utils
 from daos_utils import DaosCommand
 from test_utils_container import TestContainer
@@ -30,6 +32,7 @@ from pydaos.raw import DaosSnapshot, DaosApiError
 from macsio_util import MacsioCommand
 from oclass_utils import extract_redundancy_factor
 from duns_utils import format_path
+from run_utils import run_remote
 
 H_LOCK = threading.Lock()
 
@@ -74,24 +77,74 @@ def add_containers(self, pool, oclass=None, path="/run/container/*"):
         pool: pool to create container
         oclass: object class of container
 
+    Returns:
+        TestContainer: the new container, which is also added to self.container
 
     """
     rd_fac = None
     # Create a container and add it to the overall list of containers
-    self.container.append(
-        TestContainer(pool, daos_command=self.get_daos_command()))
-    self.container[-1].namespace = path
-    self.container[-1].get_params(self)
+    container = TestContainer(pool, daos_command=self.get_daos_command())
+    with H_LOCK:
+        self.container.append(container)
+    container.namespace = path
+    container.get_params(self)
     # include rd_fac based on the class
     if oclass:
-        self.container[-1].oclass.update(oclass)
+        container.oclass.update(oclass)
         redundancy_factor = extract_redundancy_factor(oclass)
         rd_fac = 'rd_fac:{}'.format(str(redundancy_factor))
-    properties = self.container[-1].properties.value
+    properties = container.properties.value
     cont_properties = (",").join(filter(None, [properties, rd_fac]))
     if cont_properties is not None:
-        self.container[-1].properties.update(cont_properties)
-    self.container[-1].create()
+        container.properties.update(cont_properties)
+    container.create()
+    return container
+
+
+def get_job_container(self, pool, oclass=None, path="/run/container/*"):
+    """Get a container for a job.
+
+    When self.reuse_containers is set, jobs using the same pool, object class and container
+    parameters share a single container for the pass. Otherwise a new container is created.
+
+    Args:
+        self (obj): soak obj
+        pool (obj): TestPool obj
+        oclass (str, optional): object class of container. Defaults to None.
+        path (str, optional): container yaml namespace. Defaults to "/run/container/*".
+
+    Returns:
+        TestContainer: the container
+
+    """
+    if not self.reuse_containers:
+        return add_containers(self, pool, oclass, path)
+    key = (pool.identifier, oclass, path)
+    with H_LOCK:
+        if key not in self.job_containers:
+            self.job_containers[key] = {"lock": threading.Lock(), "container": None}
+        entry = self.job_containers[key]
+    # Only the first job creates the container; compatible jobs wait for it
+    with entry["lock"]:
+        if entry["container"] is None:
+            entry["container"] = add_containers(self, pool, oclass, path)
+    return entry["container"]
+
+
+def get_unique_string(self):
+    """Get a random string not used by any other job script or dfuse mount point.
+
+    Args:
+        self (obj): soak obj
+
+    Returns:
+        str: the unique string, which is added to self.used
+
+    """
+    with H_LOCK:
+        unique = get_random_string(5, self.used)
+        self.used.append(unique)
+    return unique
 
 
 def reserved_file_copy(self, file, pool, container, num_bytes=None, cmd="read"):
@@ -206,6 +259,74 @@ def get_remote_dir(self, source_dir, dest_dir, host_list, shared_dir=None,
                     "<<FAILED: Soak logfiles removal failed>>: {}".format(directory)) from error
 
 
+def sync_remote_dir(self, source_dir, shared_dir, dest_dir, host_list, workers=4, timeout=300,
+                    rm_remote=True):
+    """Incrementally copy a remote soak log directory from each client to the local dest dir.
+
+    The clients are copied over ssh rather than with srun, so the copy does not wait for a slurm
+    allocation behind the jobs of the next pass. At most workers clients are copied at the same
+    time, and rsync only transfers the files that are new or have changed since the last copy.
+    The directories of the clients that could not be copied are kept so that the copy can be
+    retried.
+
+    Args:
+        self (obj): soak obj
+        source_dir (str): source directory on each client
+        shared_dir (str): shared directory through which the files are copied
+        dest_dir (str): destination directory
+        host_list (list): list of hosts
+        workers (int, optional): maximum number of clients copied at the same time.
+            Defaults to 4.
+        timeout (int, optional): timeout for the copy of all of the clients. Defaults to 300.
+        rm_remote (bool, optional): whether to remove the source and shared directories after
+            the copy. Defaults to True.
+
+    Raises:
+        SoakTestError: if there is an error copying or removing the logs on the local host
+
+    Returns:
+        NodeSet: the clients whose logs were not copied
+
+    """
+    command = "/usr/bin/rsync -avtr --min-size=1B {0} {1}/..".format(source_dir, shared_dir)
+    result = run_remote(
+        self.log, NodeSet.fromlist(host_list), command, verbose=False, timeout=timeout,
+        fanout=workers)
+    if result.failed_hosts:
+        self.log.info(
+            "<<Soak remote logfiles not copied from clients>>: %s", result.failed_hosts)
+
+    # copy the local logs and the logs in the shared dir to avocado dir
+    for directory in [source_dir, shared_dir]:
+        if not os.path.exists(directory):
+            continue
+        command = "/usr/bin/rsync -a {0} \'{1}\'".format(directory, dest_dir)
+        try:
+            run_command(command, timeout=timeout)
+        except DaosTestError as error:
+            raise SoakTestError(
+                "<<FAILED: Soak logfiles not copied from shared area>>: {}".format(
+                    directory)) from error
+
+    if rm_remote and result.passed_hosts:
+        # remove the remote soak logs for this pass from the clients that were copied
+        command = "/usr/bin/rm -rf {0}".format(source_dir)
+        if not run_remote(
+                self.log, result.passed_hosts, command, verbose=False, timeout=timeout,
+                fanout=workers).passed:
+            self.log.info(
+                "<<Soak logfiles removal failed>>: %s on %s", source_dir, result.passed_hosts)
+        # remove the local log for this pass
+        for directory in [source_dir, shared_dir]:
+            command = "/usr/bin/rm -rf {0}".format(directory)
+            try:
+                run_command(command, timeout=30)
+            except DaosTestError as error:
+                raise SoakTestError(
+                    "<<FAILED: Soak logfiles removal failed>>: {}".format(directory)) from error
+    return result.failed_hosts
+
+
 def write_logfile(data, name, destination):
     """Write data to the local destination file.
 
@@ -508,15 +629,58 @@ def launch_snapshot(self, pool, name):
         "<<<PASS %s: %s completed at %s>>>\n", self.loop, name, time.ctime())
 
 
-def launch_exclude_reintegrate(self, pool, name, results, args):
+def launch_container_create(self, pool, name):
+    """Create and destroy a burst of containers in a pool.
+
+    Args:
+        self (obj): soak obj
+        pool (obj): TestPool obj
+        name (str): harasser
+
+    """
+    count = self.params.get("cont_create_count", "/run/soak_harassers/*", 50)
+    threads = self.params.get("cont_create_threads", "/run/soak_harassers/*", 8)
+    self.log.info(
+        "<<<PASS %s: %s of %s containers started at %s>>>", self.loop, name, count, time.ctime())
+
+    def create_destroy(index):
+        """Create and destroy a single container.
+
+        Args:
+            index (int): container number
+
+        Returns:
+            bool: whether the container was created and destroyed
+
+        """
+        container = TestContainer(pool, daos_command=self.get_daos_command())
+        container.namespace = "/run/container_reserved/*"
+        container.get_params(self)
+        try:
+            container.create()
+            container.destroy()
+        except (CommandFailure, TestFail, DaosApiError) as error:
+            self.log.error("Container %s create/destroy failed: %s", index, error)
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        status = all(list(executor.map(create_destroy, range(count))))
+    params = {"name": name, "status": status, "vars": {"count": count}}
+    with H_LOCK:
+        self.harasser_job_done(params)
+    self.log.info(
+        "<<<PASS %s: %s completed at %s>>>\n", self.loop, name, time.ctime())
+
+
+def launch_exclude_reintegrate(self, pool, name, dmg_command):
     """Launch the dmg cmd to exclude a rank in a pool.
 
     Args:
         self (obj): soak obj
         pool (obj): TestPool obj
         name (str): name of dmg subcommand
-        results (queue): multiprocessing queue
-        args (queue): multiprocessing queue
+        dmg_command (DmgCommand): dmg command used only by this harasser
     """
     status = False
     params = {}
@@ -573,25 +737,21 @@ def launch_exclude_reintegrate(self, pool, name, results, args):
               "vars": {"rank": rank, "tgt_idx": tgt_idx}}
     if not status:
         self.log.error("<<< %s failed - check logs for failure data>>>", name)
-    self.dmg_command.system_query()
-    self.harasser_job_done(params)
-    results.put(self.harasser_results)
-    args.put(self.harasser_args)
-    self.log.info("Harasser results: %s", self.harasser_results)
-    self.log.info("Harasser args: %s", self.harasser_args)
+    dmg_command.system_query()
+    with H_LOCK:
+        self.harasser_job_done(params)
     self.log.info(
         "<<<PASS %s: %s completed at %s>>>\n", self.loop, name, time.ctime())
 
 
-def launch_server_stop_start(self, pools, name, results, args):
+def launch_server_stop_start(self, pools, name, dmg_command):
     """Launch dmg server stop/start.
 
     Args:
         self (obj): soak obj
         pools (list): list of TestPool obj
         name (str): name of dmg subcommand
-        results (queue): multiprocessing queue
-        args (queue): multiprocessing queue
+        dmg_command (DmgCommand): dmg command used only by this harasser
 
     """
     status = True
@@ -629,7 +789,7 @@ def launch_server_stop_start(self, pools, name, results, args):
         if status:
             # Shutdown the server
             try:
-                self.dmg_command.system_stop(force=True, ranks=rank)
+                dmg_command.system_stop(force=True, ranks=rank)
             except TestFail as error:
                 self.log.error("<<<FAILED:dmg system stop failed", exc_info=error)
                 status = False
@@ -645,7 +805,7 @@ def launch_server_stop_start(self, pools, name, results, args):
             self.log.info("<<<PASS %s: %s started on rank %s at %s>>>\n",
                           self.loop, name, rank, time.ctime())
             try:
-                self.dmg_command.system_start(ranks=rank)
+                dmg_command.system_start(ranks=rank)
                 status = True
             except TestFail as error:
                 self.log.error(
@@ -662,14 +822,14 @@ def launch_server_stop_start(self, pools, name, results, args):
             self.log.info("<<<PASS %s: %s started on rank %s at %s>>>\n",
                           self.loop, name, rank, time.ctime())
             try:
-                self.dmg_command.system_start(ranks=rank)
+                dmg_command.system_start(ranks=rank)
                 status = True
             except TestFail as error:
                 self.log.error(
                     "<<<FAILED:dmg system start failed", exc_info=error)
                 status = False
             for pool in pools:
-                self.dmg_command.pool_query(pool.uuid)
+                dmg_command.pool_query(pool.uuid)
             if status:
                 # Wait ~ 30 sec before issuing the reintegrate
                 time.sleep(30)
@@ -700,12 +860,9 @@ def launch_server_stop_start(self, pools, name, results, args):
               "vars": {"rank": rank}}
     if not status:
         self.log.error("<<< %s failed - check logs for failure data>>>", name)
-    self.dmg_command.system_query()
-    self.harasser_job_done(params)
-    results.put(self.harasser_results)
-    args.put(self.harasser_args)
-    self.log.info("Harasser results: %s", self.harasser_results)
-    self.log.info("Harasser args: %s", self.harasser_args)
+    dmg_command.system_query()
+    with H_LOCK:
+        self.harasser_job_done(params)
     self.log.info(
         "<<<PASS %s: %s completed at %s>>>\n", self.loop, name, time.ctime())
 
@@ -756,8 +913,7 @@ def start_dfuse(self, pool, container, name=None, job_spec=None):
     dfuse.bind_cores = self.params.get("cores", dfuse.namespace, None)
     dfuse.get_params(self)
     # update dfuse params; mountpoint for each container
-    unique = get_random_string(5, self.used)
-    self.used.append(unique)
+    unique = get_unique_string(self)
     mount_dir = dfuse.mount_dir.value + unique
     dfuse.update_params(mount_dir=mount_dir, pool=pool.identifier, cont=container.uuid)
     dfuse_log = os.path.join(
@@ -890,15 +1046,22 @@ def create_ior_cmdline(self, job_spec, pool, ppn, nodesperjob):
                     else:
                         ior_cmd.dfs_oclass.update(o_type)
                         ior_cmd.dfs_dir_oclass.update(o_type)
-                    if ior_cmd.api.value == "DFS":
-                        ior_cmd.test_file.update(
-                            os.path.join("/", "testfile"))
-                    add_containers(self, pool, o_type)
-                    ior_cmd.set_daos_params(
-                        self.server_group, pool, self.container[-1].uuid)
                     log_name = "{}_{}_{}_{}_{}_{}_{}_{}".format(
                         job_spec, api, b_size, t_size,
                         o_type, nodesperjob * ppn, nodesperjob, ppn)
+                    # jobs sharing a container each need their own file
+                    test_file = "testfile"
+                    if self.reuse_containers:
+                        test_file = "testfile_" + log_name
+                        if ior_cmd.test_file.value:
+                            ior_cmd.test_file.update(
+                                ior_cmd.test_file.value + "_" + log_name)
+                    if ior_cmd.api.value == "DFS":
+                        ior_cmd.test_file.update(
+                            os.path.join("/", test_file))
+                    container = get_job_container(self, pool, o_type)
+                    ior_cmd.set_daos_params(
+                        self.server_group, pool, container.uuid)
                     daos_log = os.path.join(
                         self.soaktest_dir, self.test_name + "_" + log_name
                         + "_`hostname -s`_${SLURM_JOB_ID}_daos.log")
@@ -907,10 +1070,10 @@ def create_ior_cmdline(self, job_spec, pool, ppn, nodesperjob):
                     # include dfuse cmdlines
                     if api in ["HDF5-VOL", "POSIX"]:
                         dfuse, dfuse_start_cmdlist = start_dfuse(
-                            self, pool, self.container[-1], name=log_name, job_spec=job_spec)
+                            self, pool, container, name=log_name, job_spec=job_spec)
                         sbatch_cmds.extend(dfuse_start_cmdlist)
                         ior_cmd.test_file.update(
-                            os.path.join(dfuse.mount_dir.value, "testfile"))
+                            os.path.join(dfuse.mount_dir.value, test_file))
                     mpirun_cmd = Mpirun(ior_cmd, mpi_type=self.mpi_module)
                     mpirun_cmd.get_params(self)
                     # add envs if api is HDF5-VOL
@@ -956,12 +1119,12 @@ def create_macsio_cmdline(self, job_spec, pool, ppn, nodesperjob):
     # update macsio cmdline for each additional MACsio obj
     for api in api_list:
         for o_type in oclass_list:
-            add_containers(self, pool, o_type)
+            container = add_containers(self, pool, o_type)
             macsio = MacsioCommand()
             macsio.namespace = macsio_params
             macsio.daos_pool = pool.uuid
             macsio.daos_svcl = list_to_str(pool.svc_ranks)
-            macsio.daos_cont = self.container[-1].uuid
+            macsio.daos_cont = container.uuid
             macsio.get_params(self)
             log_name = "{}_{}_{}_{}_{}_{}".format(
                 job_spec, api, o_type, nodesperjob * ppn, nodesperjob, ppn)
@@ -986,7 +1149,7 @@ def create_macsio_cmdline(self, job_spec, pool, ppn, nodesperjob):
             if api in ["HDF5-VOL"]:
                 # include dfuse cmdlines
                 dfuse, dfuse_start_cmdlist = start_dfuse(
-                    self, pool, self.container[-1], name=log_name, job_spec=job_spec)
+                    self, pool, container, name=log_name, job_spec=job_spec)
                 sbatch_cmds.extend(dfuse_start_cmdlist)
                 # add envs for HDF5-VOL
                 env["HDF5_VOL_CONNECTOR"] = "daos"
@@ -1062,14 +1225,17 @@ def create_mdtest_cmdline(self, job_spec, pool, ppn, nodesperjob):
                                 mdtest_cmd.dfs_dir_oclass.update("RP_2G1")
                             else:
                                 mdtest_cmd.dfs_dir_oclass.update("SX")
-                        add_containers(self, pool, oclass)
+                        container = get_job_container(self, pool, oclass)
                         mdtest_cmd.set_daos_params(
-                            self.server_group, pool,
-                            self.container[-1].uuid)
+                            self.server_group, pool, container.uuid)
                         log_name = "{}_{}_{}_{}_{}_{}_{}_{}_{}".format(
                             job_spec, api, write_bytes, read_bytes, depth,
                             oclass, nodesperjob * ppn, nodesperjob,
                             ppn)
+                        # jobs sharing a container each need their own directory
+                        if self.reuse_containers:
+                            mdtest_cmd.test_dir.update(
+                                os.path.join(mdtest_cmd.test_dir.value or "/", log_name))
                         daos_log = os.path.join(
                             self.soaktest_dir, self.test_name + "_" + log_name
                             + "_`hostname -s`_${SLURM_JOB_ID}_daos.log")
@@ -1080,10 +1246,12 @@ def create_mdtest_cmdline(self, job_spec, pool, ppn, nodesperjob):
 
                         if api in ["POSIX"]:
                             dfuse, dfuse_start_cmdlist = start_dfuse(
-                                self, pool, self.container[-1], name=log_name, job_spec=job_spec)
+                                self, pool, container, name=log_name, job_spec=job_spec)
                             sbatch_cmds.extend(dfuse_start_cmdlist)
-                            mdtest_cmd.test_dir.update(
-                                dfuse.mount_dir.value)
+                            test_dir = dfuse.mount_dir.value
+                            if self.reuse_containers:
+                                test_dir = os.path.join(test_dir, log_name)
+                            mdtest_cmd.test_dir.update(test_dir)
                         mpirun_cmd = Mpirun(mdtest_cmd, mpi_type=self.mpi_module)
                         mpirun_cmd.get_params(self)
                         mpirun_cmd.assign_processes(nodesperjob * ppn)
@@ -1114,14 +1282,14 @@ def create_racer_cmdline(self, job_spec):
     commands = []
     # daos_racer needs its own pool; does not run using jobs pool
     add_pools(self, ["pool_racer"])
-    add_containers(self, self.pool[-1], "SX")
+    container = add_containers(self, self.pool[-1], "SX")
     racer_namespace = os.path.join(os.sep, "run", job_spec, "*")
     daos_racer = DaosRacerCommand(
         self.bin, self.hostlist_clients[0])
     daos_racer.namespace = racer_namespace
     daos_racer.get_params(self)
     daos_racer.pool_uuid.update(self.pool[-1].uuid)
-    daos_racer.cont_uuid.update(self.container[-1].uuid)
+    daos_racer.cont_uuid.update(container.uuid)
     racer_log = os.path.join(
         self.soaktest_dir,
         self.test_name + "_" + job_spec + "_`hostname -s`_"
@@ -1185,16 +1353,16 @@ def create_fio_cmdline(self, job_spec, pool):
                     if fio_cmd.api.value == "POSIX":
                         # Connect to the pool, create container
                         # and then start dfuse
-                        add_containers(self, pool, o_type)
+                        container = add_containers(self, pool, o_type)
                         daos_cmd = DaosCommand(self.bin)
                         daos_cmd.container_set_attr(pool.uuid,
-                                                    self.container[-1].uuid,
+                                                    container.uuid,
                                                     'dfuse-direct-io-disable',
                                                     'on')
                         log_name = "{}_{}_{}_{}_{}".format(
                             job_spec, blocksize, size, rw, o_type)
                         dfuse, cmds = start_dfuse(
-                            self, pool, self.container[-1], name=log_name, job_spec=job_spec)
+                            self, pool, container, name=log_name, job_spec=job_spec)
                     # Update the FIO cmdline
                     fio_cmd.update(
                         "global", "directory",
@@ -1241,14 +1409,14 @@ def create_app_cmdline(self, job_spec, pool, ppn, nodesperjob):
 
     oclass_list = self.params.get("oclass", app_params)
     for oclass in oclass_list:
-        add_containers(self, pool, oclass)
+        container = add_containers(self, pool, oclass)
         sbatch_cmds = ["module purge", "module load {}".format(self.mpi_module)]
         log_name = "{}_{}_{}_{}_{}".format(
             job_spec, oclass, nodesperjob * ppn, nodesperjob, ppn)
         # include dfuse cmdlines
         if posix:
             dfuse, dfuse_start_cmdlist = start_dfuse(
-                self, pool, self.container[-1], name=log_name, job_spec=job_spec)
+                self, pool, container, name=log_name, job_spec=job_spec)
             sbatch_cmds.extend(dfuse_start_cmdlist)
         # allow apps that use an mpi other than default (self.mpi_module)
         if mpi_module != self.mpi_module:
@@ -1258,7 +1426,7 @@ def create_app_cmdline(self, job_spec, pool, ppn, nodesperjob):
         if "mpich" in mpi_module:
             # Pass pool and container information to the commands
             env = EnvironmentVariables()
-            env["DAOS_UNS_PREFIX"] = "daos://{}/{}/".format(pool.uuid, self.container[-1].uuid)
+            env["DAOS_UNS_PREFIX"] = "daos://{}/{}/".format(pool.uuid, container.uuid)
             mpirun_cmd.assign_environment(env, True)
         mpirun_cmd.assign_processes(nodesperjob * ppn)
         mpirun_cmd.ppn.update(ppn)
@@ -1305,6 +1473,18 @@ def build_job_script(self, commands, job, nodesperjob):
                    "daos pool query {} ".format(self.pool[0].uuid),
                    "echo Job_End_Time `date \\+\"%Y-%m-%d %T\"`"]
     exit_cmd = ["exit $status"]
+    sbatch = {
+        "time": str(job_timeout) + ":00",
+        "exclude": str(self.slurm_exclude_nodes),
+        "error": None,
+        "export": "ALL",
+        "exclusive": None
+    }
+    # include the cluster specific params
+    sbatch.update(self.srun_params)
+    # The scripts of this job only differ by their commands and output files
+    template = slurm_utils.SlurmScriptTemplate(
+        job, nodesperjob, sbatch, prepend_cmds, append_cmds + exit_cmd)
     # Create the sbatch script for each list of cmdlines
     for cmd, log_name in commands:
         if isinstance(cmd, str):
@@ -1312,23 +1492,113 @@ def build_job_script(self, commands, job, nodesperjob):
         output = os.path.join(
             self.soaktest_dir, self.test_name + "_" + log_name + "_%N_" + "%j_")
         error = os.path.join(str(output) + "ERROR_")
-        sbatch = {
-            "time": str(job_timeout) + ":00",
-            "exclude": str(self.slurm_exclude_nodes),
-            "error": str(error),
-            "export": "ALL",
-            "exclusive": None
-        }
-        # include the cluster specific params
-        sbatch.update(self.srun_params)
-        unique = get_random_string(5, self.used)
-        script = slurm_utils.write_slurm_script(
-            self.soaktest_dir, job, output, nodesperjob,
-            prepend_cmds + cmd + append_cmds + exit_cmd, unique, sbatch)
+        unique = get_unique_string(self)
+        script = template.write(self.soaktest_dir, output, cmd, unique, error)
         script_list.append(script)
-        self.used.append(unique)
     return script_list
 
 
+class SoakLogHarvester():
+    """Gather the logs and system log events of each soak pass in the background.
+
+    The harvest of a pass runs while the jobs of the next pass are set up and queued. Passes are
+    harvested one at a time, in order. The clients whose logs could not be copied are retried
+    once every pass has been harvested.
+    """
+
+    def __init__(self, test, workers=4, timeout=900):
+        """Initialize a SoakLogHarvester object.
+
+        Args:
+            test (obj): soak obj
+            workers (int, optional): maximum number of clients copied at the same time.
+                Defaults to 4.
+            timeout (int, optional): timeout for the copy of the logs of a pass. Defaults to 900.
+        """
+        self.test = test
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._futures = []
+        self._failed = []
+
+    def submit(self, loop, source_dir, shared_dir, dest_dir, host_list, since, until):
+        """Start gathering the logs of a pass.
+
+        Args:
+            loop (int): soak pass
+            source_dir (str): pass log directory on each client
+            shared_dir (str): pass shared log directory
+            dest_dir (str): destination directory
+            host_list (list): list of client hosts
+            since (str): start time of the system log events to check
+            until (str): end time of the system log events to check
+        """
+        self.test.log.info("<<Harvesting pass %s logs in the background>>", loop)
+        self._futures.append(self._executor.submit(
+            self._harvest, loop, source_dir, shared_dir, dest_dir, list(host_list), since, until))
+
+    def _harvest(self, loop, source_dir, shared_dir, dest_dir, host_list, since, until):
+        """Check the system log events and gather the logs of a pass.
+
+        Args:
+            loop (int): soak pass
+            source_dir (str): pass log directory on each client
+            shared_dir (str): pass shared log directory
+            dest_dir (str): destination directory
+            host_list (list): list of client hosts
+            since (str): start time of the system log events to check
+            until (str): end time of the system log events to check
+        """
+        start = time.time()
+        events = run_event_check(self.test, since, until)
+        with H_LOCK:
+            self.test.check_errors.extend(events)
+        self._sync(loop, source_dir, shared_dir, dest_dir, host_list)
+        self.test.log.info(
+            "<<Pass %s logs harvested in %s>>", loop, DDHHMMSS_format(time.time() - start))
+
+    def _sync(self, loop, source_dir, shared_dir, dest_dir, host_list):
+        """Copy the logs of a pass, recording the clients that need to be retried.
+
+        Args:
+            loop (int): soak pass
+            source_dir (str): pass log directory on each client
+            shared_dir (str): pass shared log directory
+            dest_dir (str): destination directory
+            host_list (list): list of client hosts
+
+        Returns:
+            bool: whether the logs of every client were copied
+
+        """
+        try:
+            failed = sync_remote_dir(
+                self.test, source_dir, shared_dir, dest_dir, host_list, self.workers,
+                self.timeout)
+        except SoakTestError as error:
+            self.test.log.info("Remote copy failed with %s", error)
+            failed = NodeSet.fromlist(host_list)
+        if failed:
+            self._failed.append((loop, source_dir, shared_dir, dest_dir, list(failed)))
+        return not failed
+
+    def join(self):
+        """Wait for every submitted pass to be harvested and retry the failed copies."""
+        for future in self._futures:
+            try:
+                future.result()
+            except Exception as error:     # pylint: disable=broad-except
+                self.test.log.info("Log harvest failed with %s", error)
+        self._futures = []
+        retries = self._failed
+        self._failed = []
+        for loop, source_dir, shared_dir, dest_dir, host_list in retries:
+            self.test.log.info("<<Retrying the pass %s log copy from %s>>", loop, host_list)
+            self._sync(loop, source_dir, shared_dir, dest_dir, host_list)
+        for loop, _, _, _, host_list in self._failed:
+            self.test.log.error("<<Pass %s logs not copied from %s>>", loop, host_list)
+
+
 class SoakTestError(Exception):
     """Soak exception class."""
@@ -4,10 +4,10 @@
   SPDX-License-Identifier: BSD-2-Clause-Patent
 """
 # pylint: disable=too-many-lines
+import copy
 import os
 from time import sleep, time
 import ctypes
-import json
 
 from avocado import fail_on, TestFail
 from pydaos.raw import (DaosApiError, DaosPool, c_uuid_to_str, daos_cref)
@@ -156,6 +156,121 @@ def time_pool_create(log, number, pool):
     return duration
 
 
+class RebuildTracker():
+    """Track the progress of a pool rebuild over a series of pool query samples."""
+
+    def __init__(self, stall_samples=10):
+        """Initialize a RebuildTracker object.
+
+        Args:
+            stall_samples (int, optional): number of consecutive samples without any object or
+                record progress after which the rebuild is considered stalled. Defaults to 10.
+        """
+        self.stall_samples = stall_samples
+        self.samples = []
+        self.total_objects = None
+
+    def reset(self):
+        """Clear all of the collected samples."""
+        self.samples = []
+        self.total_objects = None
+
+    def add_sample(self, objects, records, timestamp=None):
+        """Add a rebuild progress sample.
+
+        Args:
+            objects (int): number of objects rebuilt so far
+            records (int): number of records rebuilt so far
+            timestamp (float, optional): time of the sample. Defaults to None which uses the
+                current time.
+        """
+        if timestamp is None:
+            timestamp = time()
+        self.samples.append((timestamp, objects or 0, records or 0))
+
+    @property
+    def duration(self):
+        """Get the number of seconds between the first and last samples.
+
+        Returns:
+            float: the number of seconds covered by the samples
+
+        """
+        if len(self.samples) < 2:
+            return 0.0
+        return self.samples[-1][0] - self.samples[0][0]
+
+    def get_rates(self, window=None):
+        """Get the object and record rebuild rates.
+
+        Args:
+            window (int, optional): number of most recent samples to use in computing the rates.
+                Defaults to None which uses all of the samples.
+
+        Returns:
+            tuple: the objects per second and records per second rates (float, float)
+
+        """
+        samples = self.samples if window is None else self.samples[-max(window, 2):]
+        if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+            return 0.0, 0.0
+        elapsed = samples[-1][0] - samples[0][0]
+        return (
+            (samples[-1][1] - samples[0][1]) / elapsed,
+            (samples[-1][2] - samples[0][2]) / elapsed)
+
+    def get_eta(self, window=None):
+        """Get the estimated number of seconds until the rebuild completes.
+
+        Requires the total_objects attribute to be set with the number of objects to rebuild.
+
+        Args:
+            window (int, optional): number of most recent samples to use in computing the rebuild
+                rate. Defaults to None which uses all of the samples.
+
+        Returns:
+            float: estimated number of seconds remaining or None if it cannot be determined
+
+        """
+        if not self.samples or self.total_objects is None:
+            return None
+        obj_rate = self.get_rates(window)[0]
+        if obj_rate <= 0:
+            return None
+        return max(self.total_objects - self.samples[-1][1], 0) / obj_rate
+
+    def is_stalled(self):
+        """Determine if the rebuild has made no progress over the last stall_samples samples.
+
+        Returns:
+            bool: True if neither the object nor record counts have changed
+
+        """
+        if not self.stall_samples or len(self.samples) <= self.stall_samples:
+            return False
+        recent = self.samples[-(self.stall_samples + 1):]
+        return recent[0][1:] == recent[-1][1:]
+
+    def get_summary(self):
+        """Get a summary of the rebuild progress.
+
+        Returns:
+            dict: the rebuild progress summary
+
+        """
+        obj_rate, rec_rate = self.get_rates()
+        return {
+            "samples": len(self.samples),
+            "duration": round(self.duration, 1),
+            "objects": self.samples[-1][1] if self.samples else 0,
+            "records": self.samples[-1][2] if self.samples else 0,
+            "objects_per_sec": round(obj_rate, 2),
+            "records_per_sec": round(rec_rate, 2),
+            "eta": self.get_eta(),
+            "stalled": self.is_stalled(),
+        }
+
+
 class TestPool(TestDaosApiBase):
     # pylint: disable=too-many-public-methods,too-many-instance-attributes
     """A class for functional testing of DaosPools objects."""
@@ -199,6 +314,7 @@ class TestPool(TestDaosApiBase):
         self.prop_value = BasicParameter(None)      # value of property
         self.properties = BasicParameter(None)      # string of cs name:value
         self.rebuild_timeout = BasicParameter(None)
+        self.rebuild_stall_samples = BasicParameter(None, 10)
         self.pool_query_timeout = BasicParameter(None)
         self.acl_file = BasicParameter(None)
         self.label = BasicParameter(None, "TestLabel")
@@ -234,6 +350,7 @@ class TestPool(TestDaosApiBase):
 
         # Current rebuild data used when determining if pool rebuild is running or complete
         self._rebuild_data = {}
+        self.rebuild_tracker = RebuildTracker()
         self._reset_rebuild_data()
 
     def __str__(self):
@@ -304,6 +421,23 @@ class TestPool(TestDaosApiBase):
             identifier = self.label.value
         return identifier
 
+    def copy(self):
+        """Get a copy of this object for the same pool that can be used at the same time.
+
+        The copy shares the pool handle and parameters, but has its own dmg command, query data
+        and rebuild tracking, e.g. to query or modify the pool from another thread.
+
+        Returns:
+            TestPool: the copy of this object
+
+        """
+        pool = copy.copy(self)
+        pool.dmg = self.dmg.copy()
+        pool.query_data = {}
+        pool.rebuild_tracker = RebuildTracker()
+        pool._reset_rebuild_data()
+        return pool
+
     @property
     def dmg(self):
         """Get the DmgCommand object.
@@ -620,7 +754,7 @@ class TestPool(TestDaosApiBase):
             self.dmg.pool_get_prop(self.identifier, prop_name)
 
             if self.dmg.result.exit_status == 0:
-                prop_value = json.loads(self.dmg.result.stdout)['response'][0]['value']
+                prop_value = self.dmg.json_result['response'][0]['value']
 
         return prop_value
 
@@ -1196,7 +1330,11 @@ class TestPool(TestDaosApiBase):
             "status": None,
             "check": None,
             "version_increase": False,
+            "objects": None,
+            "records": None,
         }
+        self.rebuild_tracker.reset()
+        self.rebuild_tracker.stall_samples = self.rebuild_stall_samples.value
         self.log.info("%s query rebuild data reset: %s", str(self), self._rebuild_data)
 
     def _update_rebuild_data(self, verbose=True):
@@ -1229,6 +1367,12 @@ class TestPool(TestDaosApiBase):
         except (CommandFailure, ValueError) as error:
             self.log.error("Unable to detect the current pool rebuild status: %s", error)
             self._rebuild_data["status"] = None
+        for key in ("objects", "records"):
+            try:
+                self._rebuild_data[key] = int(
+                    self._get_query_data_keys("response", "rebuild", key))
+            except (CommandFailure, ValueError):
+                self._rebuild_data[key] = None
 
         # Keep track of any map version increases
         if self._rebuild_data["version"] is not None and previous_data["version"] is not None:
@@ -1253,9 +1397,34 @@ class TestPool(TestDaosApiBase):
             # Otherwise rebuild has yet to start
             self._rebuild_data["check"] = "not yet started"
 
+        # Record the rebuild progress while rebuild is running and its final values
+        if self._rebuild_data["check"] == "running" and self.rebuild_tracker.total_objects is None:
+            self.rebuild_tracker.total_objects = self._get_rebuild_total_objects()
+        if self._rebuild_data["check"] in ("running", "completed"):
+            self.rebuild_tracker.add_sample(
+                self._rebuild_data["objects"], self._rebuild_data["records"])
+
         if verbose:
             self.log.info("%s query rebuild data: %s", str(self), self._rebuild_data)
 
+    def _get_rebuild_total_objects(self):
+        """Get the number of objects to be rebuilt from the pool info.
+
+        Only available when the pool is connected through the API.
+
+        Returns:
+            int: number of objects to be rebuilt or None if it cannot be determined
+
+        """
+        if not self.pool or not self.connected:
+            return None
+        try:
+            self.pool.pool_query()
+            return int(self.pool.pool_info.pi_rebuild_st.rs_toberb_obj_nr) or None
+        except (DaosApiError, AttributeError, TypeError, ValueError) as error:
+            self.log.debug("Unable to detect the number of objects to rebuild: %s", error)
+            return None
+
     def _wait_for_rebuild(self, expected, interval=1):
         """Wait for the rebuild to start or end.
 
@@ -1282,6 +1451,8 @@ class TestPool(TestDaosApiBase):
         self._update_rebuild_data()
         while self._rebuild_data["check"] not in expected_set:
             self.log.info("  Rebuild is %s ...", self._rebuild_data["check"])
+            if self._rebuild_data["check"] == "running":
+                self._log_rebuild_progress()
             if self.rebuild_timeout.value is not None:
                 if time() - start > self.rebuild_timeout.value:
                     raise DaosTestError(
@@ -1293,6 +1464,25 @@ class TestPool(TestDaosApiBase):
 
         self.log.info("Wait for rebuild complete: rebuild %s", self._rebuild_data["check"])
 
+    def _log_rebuild_progress(self):
+        """Log the current rebuild rates and estimated completion time.
+
+        A warning is logged if no rebuild progress has been detected over the last
+        'pool/rebuild_stall_samples' pool queries.
+        """
+        obj_rate, rec_rate = self.rebuild_tracker.get_rates(self.rebuild_tracker.stall_samples)
+        eta = self.rebuild_tracker.get_eta(self.rebuild_tracker.stall_samples)
+        self.log.info(
+            "  Rebuild progress: %s objects (%.1f/s), %s records (%.1f/s), ETA: %s",
+            self._rebuild_data["objects"], obj_rate, self._rebuild_data["records"], rec_rate,
+            "{:.1f} sec".format(eta) if eta is not None else "unknown")
+        if self.rebuild_tracker.is_stalled():
+            self.log.warning(
+                "  Rebuild STALL detected: no progress over the last %s pool queries (%.1f sec)",
+                self.rebuild_tracker.stall_samples,
+                self.rebuild_tracker.samples[-1][0]
+                - self.rebuild_tracker.samples[-(self.rebuild_tracker.stall_samples + 1)][0])
+
     def has_rebuild_started(self, verbose=True):
         """Determine if rebuild has started.
 
@@ -1353,9 +1543,17 @@ class TestPool(TestDaosApiBase):
             operation (str): Type of operation to print in the log.
             interval (int): Interval (sec) to call pool query to check the rebuild status.
                 Defaults to 1.
+
+        Returns:
+            dict: the rebuild progress summary, including the rebuild rates
+
         """
         start = time()
         self.wait_for_rebuild_to_start(interval=interval)
         self.wait_for_rebuild_to_end(interval=interval)
         duration = time() - start
+        summary = self.rebuild_tracker.get_summary()
+        summary["total_duration"] = round(duration, 1)
         self.log.info("%s duration: %.1f sec", operation, duration)
+        self.log.info("%s rebuild progress summary: %s", operation, summary)
+        return summary
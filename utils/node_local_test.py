@@ -10,6 +10,7 @@ the client with fault injection of D_ALLOC() usage.
 
 # pylint: disable=too-many-lines
 
+import io
 import os
 from os.path import join
 import sys
@@ -21,14 +22,20 @@ import signal
 import pprint
 import stat
 import errno
+import shutil
 import argparse
+import hashlib
+import selectors
 import threading
 import functools
 import traceback
+import contextlib
 import subprocess  # nosec
+import multiprocessing
+import concurrent.futures
 import tempfile
 import pickle  # nosec
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import xattr
 import junit_xml
 import tabulate
@@ -86,6 +93,9 @@ class NLTConf():
         self.agent_dir = None
         self.wf = None
         self.args = None
+        self.fi_journal = None
+        self.valgrind_selector = None
+        self.log_checker = None
         self.max_log_size = None
         self.valgrind_errors = False
         self.log_timer = CulmTimer()
@@ -102,9 +112,11 @@ class NLTConf():
             os.makedirs(self.tmp_dir)
 
         self._compress_procs = []
+        self._valgrind_xml_files = []
 
     def __del__(self):
         self.flush_bz2()
+        self.flush_valgrind_xml()
         os.rmdir(self.dfuse_parent_dir)
 
     def set_wf(self, wf):
@@ -147,6 +159,24 @@ class NLTConf():
         self._compress_procs = []
         self.compress_timer.stop()
 
+    def add_valgrind_xml(self, xml_file, src_dir):
+        """Queue a valgrind xml file for conversion by flush_valgrind_xml()"""
+        self._valgrind_xml_files.append((xml_file, src_dir))
+
+    def flush_valgrind_xml(self):
+        """Convert all queued valgrind xml files
+
+        The files are only read by Jenkins after the run completes, so rather than converting
+        each one as the command exits do them all in parallel at the end.
+        """
+        pending = self._valgrind_xml_files
+        self._valgrind_xml_files = []
+        if not pending:
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda args: convert_valgrind_xml(*args), pending))
+        print(f'Converted {len(pending)} valgrind xml files')
+
 
 class CulmTimer():
     """Class to keep track of elapsed time so we know where to focus performance tuning"""
@@ -1010,6 +1040,90 @@ def il_cmd(dfuse, cmd, check_read=True, check_write=True, check_fstat=True):
     return ret
 
 
+def convert_valgrind_xml(xml_file, src_dir, block_size=1024 * 1024):
+    """Remove the src dir prefix from a valgrind xml file
+
+    The file is processed in blocks rather than line by line, keeping back enough of the end of
+    each block that a path split between blocks is still replaced.  The output is saved as
+    xml_file with an additional .xml suffix and the input removed.
+    """
+    keep = len(src_dir) - 1
+    with open(xml_file, 'r') as fd:
+        with open(f'{xml_file}.xml', 'w') as ofd:
+            tail = ''
+            for block in iter(functools.partial(fd.read, block_size), ''):
+                block = (tail + block).replace(src_dir, '')
+                if keep:
+                    tail = block[-keep:]
+                    block = block[:-keep]
+                ofd.write(block)
+            ofd.write(tail.replace(src_dir, ''))
+    os.unlink(xml_file)
+
+
+class ValgrindSelector():
+    """Decide which commands to run under valgrind
+
+    With a sample fraction below one only that fraction of invocations are run under valgrind,
+    spread evenly across the run.  With a state file only binaries which have changed since the
+    last run without valgrind errors are checked.  A binary is considered changed if it, or any
+    of the DAOS libraries it links against, has changed.
+    """
+
+    def __init__(self, conf, sample=1.0, state_file=None):
+        self.conf = conf
+        self.sample = sample
+        self.state_file = state_file
+        self._count = 0
+        self._selected = 0
+        self._hashes = {}
+        self._checked = set()
+        self._clean_hashes = {}
+        if state_file and os.path.exists(state_file):
+            with open(state_file, 'r') as fd:
+                self._clean_hashes = json.load(fd)
+
+    def _get_hash(self, binary):
+        """Return a hash of a binary and the DAOS libraries it uses"""
+        if binary in self._hashes:
+            return self._hashes[binary]
+        files = [binary]
+        rc = subprocess.run(['ldd', binary], stdout=subprocess.PIPE, check=False)
+        for line in rc.stdout.decode('utf-8').splitlines():
+            fields = line.split()
+            if len(fields) > 2 and fields[1] == '=>' and fields[2].startswith(self.conf['PREFIX']):
+                files.append(os.path.realpath(fields[2]))
+        hasher = hashlib.sha256()
+        for fname in sorted(set(files)):
+            with open(fname, 'rb') as fd:
+                for block in iter(functools.partial(fd.read, 1024 * 1024), b''):
+                    hasher.update(block)
+        self._hashes[binary] = hasher.hexdigest()
+        return self._hashes[binary]
+
+    def is_selected(self, binary):
+        """Return True if this invocation of binary should be run under valgrind"""
+        if self.state_file and self._clean_hashes.get(binary) == self._get_hash(binary):
+            return False
+
+        self._count += 1
+        if int(self._count * self.sample) == int((self._count - 1) * self.sample):
+            return False
+        self._selected += 1
+        self._checked.add(binary)
+        return True
+
+    def save(self):
+        """Record the binaries checked as clean if there were no valgrind errors"""
+        print(f'Valgrind used for {self._selected} of {self._count} selectable commands')
+        if not self.state_file or self.conf.valgrind_errors:
+            return
+        for binary in self._checked:
+            self._clean_hashes[binary] = self._get_hash(binary)
+        with open(self.state_file, 'w') as fd:
+            json.dump(self._clean_hashes, fd, indent=2)
+
+
 class ValgrindHelper():
     """Class for running valgrind commands
 
@@ -1062,18 +1176,16 @@ class ValgrindHelper():
         cmd.extend(['--xml=yes', f'--xml-file={self._xml_file}'])
         return cmd
 
+    def select(self, binary):
+        """Disable valgrind unless this invocation of binary is selected to be checked"""
+        if self.use_valgrind and self.conf.valgrind_selector:
+            self.use_valgrind = self.conf.valgrind_selector.is_selected(binary)
+
     def convert_xml(self):
-        """Modify the xml file"""
+        """Queue the xml file to be modified at the end of the run"""
         if not self.use_valgrind:
             return
-        with open(self._xml_file, 'r') as fd:
-            with open(f'{self._xml_file}.xml', 'w') as ofd:
-                for line in fd:
-                    if self.src_dir in line:
-                        ofd.write(line.replace(self.src_dir, ''))
-                    else:
-                        ofd.write(line)
-        os.unlink(self._xml_file)
+        self.conf.add_valgrind_xml(self._xml_file, self.src_dir)
 
 
 class DFuse():
@@ -1148,6 +1260,8 @@ class DFuse():
         if not self.use_valgrind:
             self.valgrind.use_valgrind = False
 
+        self.valgrind.select(dfuse_bin)
+
         if self.cores:
             cmd = ['numactl', '--physcpubind', f'0-{self.cores - 1}']
         else:
@@ -1256,7 +1370,7 @@ class DFuse():
             fatal_errors = True
             run_leak_test = False
         self._sp = None
-        log_test(self.conf, self.log_file, show_memleaks=run_leak_test)
+        check_log(self.conf, self.log_file, show_memleaks=run_leak_test)
 
         # Finally, modify the valgrind xml file to remove the
         # prefix to the src dir.
@@ -1265,12 +1379,22 @@ class DFuse():
         self._daos.remove_fuse(self)
         return fatal_errors
 
+    def is_running(self):
+        """Return True if the dfuse process is running and the mount point responds"""
+        if not self._sp or self._sp.poll() is not None:
+            return False
+        try:
+            os.stat(self.dir)
+        except OSError:
+            return False
+        return True
+
     def wait_for_exit(self):
         """Wait for dfuse to exit"""
         ret = self._sp.wait()
         print(f'rc from dfuse {ret}')
         self._sp = None
-        log_test(self.conf, self.log_file)
+        check_log(self.conf, self.log_file)
 
         # Finally, modify the valgrind xml file to remove the
         # prefix to the src dir.
@@ -1362,6 +1486,8 @@ def run_daos_cmd(conf,
     if not valgrind:
         valgrind_hdl.use_valgrind = False
 
+    valgrind_hdl.select(join(conf['PREFIX'], 'bin', 'daos'))
+
     exec_cmd = valgrind_hdl.get_cmd_prefix()
     dcr.valgrind = list(exec_cmd)
     daos_cmd = [join(conf['PREFIX'], 'bin', 'daos')]
@@ -1404,7 +1530,7 @@ def run_daos_cmd(conf,
     if rc.returncode < 0:
         show_memleaks = False
 
-    rc.fi_loc = log_test(conf, log_name, show_memleaks=show_memleaks)
+    check_log(conf, log_name, show_memleaks=show_memleaks)
     valgrind_hdl.convert_xml()
     # If there are valgrind errors here then mark them for later reporting but
     # do not abort.  This allows a full-test run to report all valgrind issues
@@ -1520,11 +1646,128 @@ def check_dfs_tool_output(output, oclass, csize):
     return True
 
 
+class DFuseLease():
+    """A directory in a shared dfuse instance, leased to a single test
+
+    Attributes not defined here are those of the shared DFuse object, with the exception of dir
+    which is the leased directory.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, mount_pool, dfuse, container, name):
+        self.mount_pool = mount_pool
+        self.dfuse = dfuse
+        self.container = container
+        self.released = False
+        self.dir = join(dfuse.dir, name)
+        os.mkdir(self.dir)
+
+    def __getattr__(self, name):
+        return getattr(self.dfuse, name)
+
+    def stop(self):
+        """Return the dfuse instance to the pool"""
+        if self.released:
+            return False
+        self.released = True
+        return self.mount_pool.release(self)
+
+
+class DFuseMountPool():
+    """Pool of running dfuse instances which are shared between posix tests
+
+    Starting dfuse and creating a container for every test takes a significant part of the time
+    taken by the posix tests, so instead tests which do not need their own container are each
+    given a directory in one of a small number of dfuse instances, which are started on first
+    use.  When a test completes then its directory is removed, and the instance is returned to
+    the pool if it is still running, otherwise it is stopped and the container destroyed.
+    """
+
+    def __init__(self, server, conf, pool):
+        self.server = server
+        self.conf = conf
+        self.pool = pool
+        self._idle = {True: [], False: []}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def lease(self, name, caching):
+        """Return a DFuseLease for a test, starting a new dfuse instance if none are idle"""
+        with self._lock:
+            if self._idle[caching]:
+                (dfuse, container) = self._idle[caching].pop()
+                return DFuseLease(self, dfuse, container, name)
+            self._count += 1
+            container = f'nlt_shared_{self._count}'
+
+        create_cont(self.conf, self.pool.id(), ctype="POSIX", valgrind=False, log_check=False,
+                    label=container)
+        dfuse = DFuse(self.server,
+                      self.conf,
+                      caching=caching,
+                      pool=self.pool.dfuse_mount_name(),
+                      container=container)
+        dfuse.start(v_hint=container)
+        return DFuseLease(self, dfuse, container, name)
+
+    def release(self, lease):
+        """Return a leased instance to the pool, after checking it's still usable
+
+        Returns:
+            bool: True if the instance was stopped and reported fatal errors.
+        """
+        healthy = lease.dfuse.is_running()
+        if healthy:
+            try:
+                shutil.rmtree(lease.dir)
+            except OSError as error:
+                print(f'Failed to remove {lease.dir}: {error}')
+                healthy = False
+
+        if healthy:
+            with self._lock:
+                self._idle[lease.dfuse.caching].append((lease.dfuse, lease.container))
+            return False
+
+        print(f'Discarding shared dfuse instance {lease.dfuse}')
+        return self._stop(lease.dfuse, lease.container)
+
+    def _stop(self, dfuse, container):
+        """Stop a dfuse instance and destroy its container"""
+        fatal_errors = dfuse.stop()
+        destroy_container(self.conf, self.pool.id(), container, valgrind=False, log_check=False)
+        return fatal_errors
+
+    def close(self):
+        """Stop all idle dfuse instances
+
+        Returns:
+            bool: True if any instance reported fatal errors.
+        """
+        fatal_errors = False
+        for idle in self._idle.values():
+            while idle:
+                if self._stop(*idle.pop()):
+                    fatal_errors = True
+        return fatal_errors
+
+
+def exclusive_dfuse(method):
+    """Decorator function to prevent a @needs_dfuse test from using a shared dfuse instance
+
+    For tests which need the dfuse mount to be the root of their own container.
+    """
+    method.shared_dfuse = False
+    return method
+
+
 def needs_dfuse(method):
     """Decorator function for starting dfuse under posix_tests class
 
     Runs every test twice, once with caching enabled, and once with
-    caching disabled.
+    caching disabled.  If the tests are using shared dfuse instances then
+    the test is run in a directory of one of those, see DFuseMountPool.
     """
     @functools.wraps(method)
     def _helper(self):
@@ -1535,12 +1778,17 @@ def needs_dfuse(method):
         else:
             caching = False
 
-        self.dfuse = DFuse(self.server,
-                           self.conf,
-                           caching=caching,
-                           pool=self.pool.dfuse_mount_name(),
-                           container=self.container_label)
-        self.dfuse.start(v_hint=self.test_name)
+        if self.mount_pool and _helper.shared_dfuse:
+            self.dfuse = self.mount_pool.lease(self.test_name, caching)
+            self.container = self.dfuse.container
+            self.container_label = self.dfuse.container
+        else:
+            self.dfuse = DFuse(self.server,
+                               self.conf,
+                               caching=caching,
+                               pool=self.pool.dfuse_mount_name(),
+                               container=self.container_label)
+            self.dfuse.start(v_hint=self.test_name)
         try:
             rc = method(self)
         finally:
@@ -1548,6 +1796,7 @@ def needs_dfuse(method):
                 self.fatal_errors = True
         return rc
 
+    _helper.shared_dfuse = True
     return _helper
 
 
@@ -1641,6 +1890,8 @@ class PosixTests():
         self.container_label = None
         self.dfuse = None
         self.fatal_errors = False
+        # DFuseMountPool to use for @needs_dfuse tests, if set.
+        self.mount_pool = None
 
         # Ability to invoke each method multiple times, call_index is set to
         # 0 for each test method, if the method requires invoking a second time
@@ -1790,6 +2041,7 @@ class PosixTests():
             print(f'_{data}_')
             assert data == 'hello'
 
+    @exclusive_dfuse
     @needs_dfuse
     def test_cont_info(self):
         """Check that daos container info and fs get-attr works on container roots"""
@@ -2230,6 +2482,10 @@ class PosixTests():
         print(stbuf)
         assert stbuf.st_ino < 100
         print(os.listdir(path))
+        # Destroy the container so it is not left in a shared dfuse directory.
+        cmd = ['cont', 'destroy', '--path', path]
+        rc = run_daos_cmd(self.conf, cmd)
+        assert rc.returncode == 0, rc
 
     @needs_dfuse
     def test_uns_link(self):
@@ -2266,6 +2522,7 @@ class PosixTests():
         cmd = ['cont', 'destroy', '--path', path]
         rc = run_daos_cmd(self.conf, cmd)
 
+    @exclusive_dfuse
     @needs_dfuse
     def test_rename_clobber(self):
         """Test that rename clobbers files correctly
@@ -2431,6 +2688,7 @@ class PosixTests():
 
         _go(self.dfuse.dir)
 
+    @exclusive_dfuse
     @needs_dfuse
     def test_complex_unlink(self):
         """Test that unlink clears file data correctly.
@@ -2569,6 +2827,7 @@ class PosixTests():
         if dfuse.stop():
             self.fatal_errors = True
 
+    @exclusive_dfuse
     @needs_dfuse
     def test_complex_rename(self):
         """Test for rename semantics
@@ -3096,18 +3355,56 @@ class NltStderrWrapper():
         sys.stderr = self._stderr
 
 
+def load_test_durations(filename):
+    """Return the durations of tests from previous runs, if known"""
+    if not filename or not os.path.exists(filename):
+        return {}
+    try:
+        with open(filename, 'r') as fd:
+            return json.load(fd)
+    except ValueError:
+        print(f'Ignoring invalid test durations file {filename}')
+        return {}
+
+
+def save_test_durations(filename, durations, history):
+    """Save the durations of tests, averaged with previous runs to smooth out noise"""
+    if not filename:
+        return
+    for (name, duration) in durations.items():
+        if name in history:
+            history[name] = (history[name] + duration) / 2
+        else:
+            history[name] = duration
+    if os.path.dirname(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w') as fd:
+        json.dump(history, fd, indent=2, sort_keys=True)
+
+
 def run_posix_tests(server, conf, test=None):
     """Run one or all posix tests
 
     Create a new container per test, to ensure that every test is
     isolated from others.
+
+    When running all tests they are started longest first, using the durations recorded by
+    previous runs, from a pool of --posix-workers worker threads.  Each worker takes
+    the next test as soon as it is free so the total time should be close to that of the longest
+    test.
     """
 
     def _run_test(ptl=None, function=None, test_cb=None):
         ptl.call_index = 0
+        ptl.mount_pool = mount_pool
+        # Tests using a shared dfuse instance use its container rather than creating one.
+        shared = mount_pool is not None and getattr(test_cb, 'shared_dfuse', False)
+        test_start = time.time()
         while True:
             ptl.needs_more = False
             ptl.test_name = function
+            if conf.log_checker:
+                conf.log_checker.set_test(function)
             start = time.time()
             out_wrapper.sprint(f'Calling {function}')
             print(f'Calling {function}')
@@ -3116,18 +3413,21 @@ def run_posix_tests(server, conf, test=None):
             # performance impact.  There are other tests that run with valgrind enabled so this
             # should not reduce coverage.
             try:
-                ptl.container = create_cont(conf,
-                                            pool.id(),
-                                            ctype="POSIX",
-                                            valgrind=False,
-                                            log_check=False,
-                                            label=function)
-                ptl.container_label = function
-                test_cb()
-                destroy_container(conf, pool.id(),
-                                  ptl.container_label,
-                                  valgrind=False,
-                                  log_check=False)
+                if shared:
+                    test_cb()
+                else:
+                    ptl.container = create_cont(conf,
+                                                pool.id(),
+                                                ctype="POSIX",
+                                                valgrind=False,
+                                                log_check=False,
+                                                label=function)
+                    ptl.container_label = function
+                    test_cb()
+                    destroy_container(conf, pool.id(),
+                                      ptl.container_label,
+                                      valgrind=False,
+                                      log_check=False)
                 ptl.container = None
             except Exception as inst:
                 trace = ''.join(traceback.format_tb(inst.__traceback__))
@@ -3152,15 +3452,38 @@ def run_posix_tests(server, conf, test=None):
                 break
             ptl.call_index = ptl.call_index + 1
 
+        durations[function] = time.time() - test_start
+
         if ptl.fatal_errors:
             pto.fatal_errors = True
 
+    def _worker():
+        while True:
+            try:
+                (ptl, function, test_cb) = pending.popleft()
+            except IndexError:
+                return
+            try:
+                _run_test(ptl=ptl, test_cb=test_cb, function=function)
+            except Exception:  # pylint: disable=broad-except
+                # The failure has been recorded against the test, so report it and carry on.
+                traceback.print_exc()
+
     server.get_test_pool()
     pool = server.test_pool
 
     out_wrapper = NltStdoutWrapper()
     err_wrapper = NltStderrWrapper()
 
+    durations = {}
+
+    mount_pool = None
+    if conf.args.shared_dfuse:
+        mount_pool = DFuseMountPool(server, conf, pool)
+
+    # Tests to be run by the worker threads
+    pending = deque()
+
     pto = PosixTests(server, conf, pool=pool)
     if test:
         function = f'test_{test}'
@@ -3169,14 +3492,13 @@ def run_posix_tests(server, conf, test=None):
         _run_test(ptl=pto, test_cb=obj, function=function)
     else:
 
-        threads = []
-
+        # Tests known to be slow, used to order tests with no recorded duration.
         slow_tests = ['test_readdir_25', 'test_uns_basic', 'test_daos_fs_tool']
 
-        tests = dir(pto)
-        tests.sort(key=lambda x: x not in slow_tests)
+        history = load_test_durations(conf.args.test_durations)
 
-        for function in tests:
+        tests = []
+        for function in dir(pto):
             if not function.startswith('test_'):
                 continue
 
@@ -3184,30 +3506,41 @@ def run_posix_tests(server, conf, test=None):
             obj = getattr(ptl, function)
             if not callable(obj):
                 continue
-
-            thread = threading.Thread(None,
-                                      target=_run_test,
-                                      name=f'test {function}',
-                                      kwargs={'ptl': ptl, 'test_cb': obj, 'function': function},
+            tests.append((ptl, function, obj))
+
+        # Start the longest tests first.  Tests without a recorded duration are assumed to be as
+        # long as the longest known test so they are not left until the end.
+        default_duration = max(history.values(), default=0)
+        pending.extend(
+            sorted(tests, key=lambda x: (-history.get(x[1], default_duration),
+                                         x[1] not in slow_tests)))
+
+        num_workers = min(len(pending), conf.args.posix_workers)
+        expected = max([history.get(x[1], 0) for x in pending], default=0)
+        print(f'Running {len(pending)} tests using {num_workers} threads, expected time '
+              f'{expected:.1f} seconds')
+
+        # The worker threads are daemon threads so that their output is captured rather than
+        # printed, see NltStdoutWrapper.
+        start = time.time()
+        threads = []
+        for idx in range(num_workers):
+            thread = threading.Thread(None, target=_worker, name=f'posix worker {idx}',
                                       daemon=True)
             thread.start()
             threads.append(thread)
 
-            # Limit the number of concurrent tests, but poll all active threads so there's no
-            # expectation for them to complete in order.  At the minute we only have a handful of
-            # long-running tests which dominate the time, so whilst a higher value here would
-            # work there's no benefit in rushing to finish the quicker tests.  The long-running
-            # tests are started first.
-            while len(threads) > 5:
-                for thread_id in threads:
-                    thread_id.join(timeout=0)
-                    if thread_id.is_alive():
-                        continue
-                    threads.remove(thread_id)
-
         for thread_id in threads:
             thread_id.join()
 
+        elapsed = time.time() - start
+        print(f'Tests completed in {elapsed:.1f} seconds, longest test took '
+              f'{max(durations.values(), default=0):.1f} seconds')
+        save_test_durations(conf.args.test_durations, durations, history)
+
+    if mount_pool and mount_pool.close():
+        pto.fatal_errors = True
+
     # Now check for running dfuse instances, there should be none at this point as all tests have
     # completed.  It's not possible to do this check as each test finishes due to the fact that
     # the tests are running in parallel.  We could revise this so there's a dfuse method on
@@ -3378,7 +3711,10 @@ def log_test(conf,
     # process to compress it in parallel with the log tracing.
     conf.compress_file(filename)
 
-    lto = nlt_lt.LogTest(log_iter, quiet=quiet)
+    # Record which functions logged as part of checking the log, rather than making a second pass.
+    functions = nlt_lt.FunctionTracker()
+
+    lto = nlt_lt.LogTest(log_iter, quiet=quiet, analyzers=[functions])
 
     lto.hide_fi_calls = skip_fi
 
@@ -3393,19 +3729,13 @@ def log_test(conf,
         if not lto.fi_triggered:
             raise NLTestNoFi
 
-    functions = set()
-
-    if check_read or check_write or check_fstat:
-        for line in log_iter.new_iter():
-            functions.add(line.function)
-
-    if check_read and 'dfuse_read' not in functions:
+    if check_read and 'dfuse_read' not in functions.functions:
         raise NLTestNoFunction('dfuse_read')
 
-    if check_write and 'dfuse_write' not in functions:
+    if check_write and 'dfuse_write' not in functions.functions:
         raise NLTestNoFunction('dfuse_write')
 
-    if check_fstat and 'dfuse___fxstat' not in functions:
+    if check_fstat and 'dfuse___fxstat' not in functions.functions:
         raise NLTestNoFunction('dfuse___fxstat')
 
     if conf.max_log_size and fstat.st_size > conf.max_log_size:
@@ -3415,6 +3745,205 @@ def log_test(conf,
     return lto.fi_location
 
 
+def check_log(conf, filename, **kwargs):
+    """Check a log file, in the background if there is a LogCheckService running
+
+    Should only be used where the result of log_test() is not needed, as None is returned if the
+    check is done in the background.
+    """
+    if conf.log_checker:
+        conf.log_checker.submit(filename, **kwargs)
+        return None
+    return log_test(conf, filename, **kwargs)
+
+
+class LogLineRecord():
+    """Copy of the parts of a log line used by WarningsFactory, which can be pickled"""
+
+    def __init__(self, line):
+        self.filename = line.filename
+        self.lineno = line.lineno
+        self.pid = line.pid
+        self._msg = line.get_msg()
+        self._anon_msg = line.get_anon_msg()
+
+    def get_msg(self):
+        """Return the log message"""
+        return self._msg
+
+    def get_anon_msg(self):
+        """Return the log message without pointer values"""
+        return self._anon_msg
+
+
+class LogCheckRecorder():
+    """Stand-in for WarningsFactory in log check workers, which records warnings to be reported
+    by the main process"""
+
+    def __init__(self):
+        self.warnings = []
+
+    def add(self, line, sev, message, cat=None, mtype=None):
+        """Record a warning"""
+        self.warnings.append((LogLineRecord(line), sev, message, cat, mtype))
+
+    def reset_pending(self):
+        """Nothing to do as warnings are not explained in workers"""
+
+
+class LogCheckConf():
+    """Subset of NLTConf used by log_test() in log check workers"""
+
+    def __init__(self, max_log_size):
+        self.max_log_size = max_log_size
+        self.log_timer = CulmTimer()
+        self._compress_procs = []
+
+    def compress_file(self, filename):
+        """Compress a file in the background"""
+        # pylint: disable=consider-using-with
+        self._compress_procs.append(subprocess.Popen(['bzip2', '--best', filename]))
+
+    def flush_bz2(self):
+        """Wait for all bzip2 subprocess to finish"""
+        for proc in self._compress_procs:
+            proc.wait()
+        self._compress_procs = []
+
+
+log_check_conf = None  # pylint: disable=invalid-name
+
+
+def _log_check_init(path, max_log_size):
+    """Initialize a log check worker process"""
+    global nlt_lp  # pylint: disable=invalid-name
+    global nlt_lt  # pylint: disable=invalid-name
+    global log_check_conf  # pylint: disable=invalid-name
+
+    sys.path = path
+    nlt_lp = __import__('cart_logparse')
+    nlt_lt = __import__('cart_logtest')
+    log_check_conf = LogCheckConf(max_log_size)
+
+
+def _log_check_worker(filename, kwargs):
+    """Run log_test() on a file in a log check worker process
+
+    Returns:
+        dict: the output, warnings and any error from checking the file, and the time taken.
+    """
+    recorder = LogCheckRecorder()
+    nlt_lt.wf = recorder
+    result = {'error': None, 'trace': None}
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            log_test(log_check_conf, filename, **kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            result['error'] = repr(error)
+            result['trace'] = traceback.format_exc()
+    log_check_conf.flush_bz2()
+    result['output'] = output.getvalue()
+    result['warnings'] = recorder.warnings
+    result['elapsed'] = log_check_conf.log_timer.total
+    log_check_conf.log_timer.total = 0
+    return result
+
+
+class LogCheckService():
+    """Check log files in the background using a pool of worker processes
+
+    Log files are checked as they are submitted, concurrently with the tests which produced
+    them, and the results recorded against the test which was running in the submitting thread,
+    see set_test().  Warnings are added to the WarningsFactory as each result is collected, and
+    any errors are added as failed test cases.
+    """
+
+    def __init__(self, conf, jobs):
+        self.conf = conf
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_log_check_init,
+            initargs=(list(sys.path), conf.max_log_size))
+        self._pending = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.results = {}
+        self.errors = False
+
+    def set_test(self, name):
+        """Set the name of the test which logs submitted from this thread belong to"""
+        self._local.test = name
+
+    def submit(self, filename, **kwargs):
+        """Queue a log file to be checked"""
+        test = getattr(self._local, 'test', 'nlt')
+        future = self._executor.submit(_log_check_worker, filename, kwargs)
+        with self._lock:
+            self._pending.append((test, filename, future))
+        self.poll()
+
+    def poll(self):
+        """Report the results of any completed checks"""
+        with self._lock:
+            done = [entry for entry in self._pending if entry[2].done()]
+            for entry in done:
+                self._pending.remove(entry)
+                self._report(*entry)
+
+    def _report(self, test, filename, future):
+        """Report the result of checking a single file"""
+        try:
+            result = future.result()
+        except Exception as error:  # pylint: disable=broad-except
+            result = {'error': repr(error), 'trace': None, 'output': '', 'warnings': [],
+                      'elapsed': 0}
+
+        self.conf.log_timer.total += result['elapsed']
+        summary = self.results.setdefault(test, {'files': 0, 'warnings': 0, 'errors': 0})
+        summary['files'] += 1
+        summary['warnings'] += len(result['warnings'])
+
+        if result['warnings'] or result['error']:
+            print(f'Log check of {filename} for {test}')
+            print(result['output'])
+
+        for (line, sev, message, cat, mtype) in result['warnings']:
+            self.conf.wf.add(line, sev, message, cat=cat, mtype=mtype)
+
+        if result['error']:
+            summary['errors'] += 1
+            self.errors = True
+            self.conf.wf.add_test_case(f'{test} log check',
+                                       failure=f"{result['error']} checking {filename}",
+                                       output=result['trace'],
+                                       test_class='logs')
+
+    def close(self):
+        """Wait for all checks to complete and report the results
+
+        Returns:
+            bool: True if checking any log file failed.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+        for (test, filename, future) in pending:
+            concurrent.futures.wait([future])
+            with self._lock:
+                self._report(test, filename, future)
+        self._executor.shutdown()
+
+        table = [[test, summary['files'], summary['warnings'], summary['errors']]
+                 for (test, summary) in sorted(self.results.items())
+                 if summary['warnings'] or summary['errors']]
+        print(f'Checked logs for {len(self.results)} tests in the background')
+        if table:
+            print(tabulate.tabulate(table, headers=['test', 'files', 'warnings', 'errors']))
+        return self.errors
+
+
 def set_server_fi(server):
     """Run the client code to set server params"""
     # pylint: disable=consider-using-with
@@ -3475,7 +4004,7 @@ def set_server_fi(server):
                         check=False)
     print(rc)
     valgrind_hdl.convert_xml()
-    log_test(server.conf, log_file.name)
+    check_log(server.conf, log_file.name)
     assert rc.returncode == 0
     return False  # fatal_errors
 
@@ -3668,69 +4197,226 @@ def run_in_fg(server, conf, args):
         pass
 
 
-def check_readdir_perf(server, conf):
-    """Check and report on readdir performance
+# Number of times to repeat each readdir measurement in the metadata benchmark.
+PERF_REPETITIONS = 5
 
-    Loop over number of files, measuring the time taken to
-    populate a directory, and to read the directory contents,
-    measure both files and directories as contents, and
-    readdir both with and without stat, restarting dfuse
-    between each test to avoid cache effects.
+# Time after which the metadata benchmark stops increasing the directory size.
+PERF_TIME_LIMIT = 5 * 60
 
-    Continue testing until five minutes have passed, and print
-    a table of results.
-    """
-    headers = ['count', 'create\ndirs', 'create\nfiles']
-    headers.extend(['dirs', 'files', 'dirs\nwith stat', 'files\nwith stat'])
-    headers.extend(['caching\n1st', 'caching\n2nd'])
+# Fractional increase in median latency which is reported as a regression.
+PERF_THRESHOLD = 0.2
 
-    results = []
+# Number of threads used to populate directories for the metadata benchmark.
+PERF_POPULATE_THREADS = 16
 
-    def make_dirs(parent, count):
-        """Populate the test directory"""
-        print(f'Populating to {count}')
-        dir_dir = join(parent, f'dirs.{count}.in')
-        t_dir = join(parent, f'dirs.{count}')
-        file_dir = join(parent, f'files.{count}.in')
-        t_file = join(parent, f'files.{count}')
+# Label of the container used by the metadata benchmark, which is kept so that directories
+# populated by one run can be re-used by the next.
+PERF_CONTAINER = 'nlt_readdir_perf'
 
-        start_all = time.time()
-        if not os.path.exists(t_dir):
+
+def populate_dir(parent, count, create, threads=PERF_POPULATE_THREADS):
+    """Create entries in a directory from a pool of threads
+
+    Entries are named after their index, and any which already exist are left in place, so
+    that a partially populated directory can be completed.
+
+    Args:
+        parent (str): directory to populate
+        count (int): number of entries to create
+        create (callable): function to create an entry given its path
+        threads (int, optional): number of threads to use
+    """
+    def _populate(indexes):
+        for idx in indexes:
             try:
-                os.mkdir(dir_dir)
+                create(join(parent, str(idx)))
             except FileExistsError:
                 pass
-            for idx in range(count):
-                try:
-                    os.mkdir(join(dir_dir, str(idx)))
-                except FileExistsError:
-                    pass
-            dir_time = time.time() - start_all
-            print(f'Creating {count} dirs took {dir_time:.2f}')
-            os.rename(dir_dir, t_dir)
 
-        if not os.path.exists(t_file):
+    threads = max(1, min(threads, count))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        # Consume the results so that any exception from a worker is raised here.
+        list(executor.map(_populate, [range(idx, count, threads) for idx in range(threads)]))
+
+
+def create_file(path):
+    """Create an empty file"""
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY))
+
+
+def get_percentiles(samples):
+    """Return summary statistics for a list of timings
+
+    Args:
+        samples (list): timings in seconds
+
+    Returns:
+        dict: the sample count along with min, mean, percentiles and max of the samples.
+    """
+    samples = sorted(samples)
+
+    def _percentile(pct):
+        return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+    return {'samples': len(samples),
+            'min': samples[0],
+            'mean': sum(samples) / len(samples),
+            'p50': _percentile(50),
+            'p90': _percentile(90),
+            'p99': _percentile(99),
+            'max': samples[-1]}
+
+
+def time_readdir(path, with_stat=False, repetitions=PERF_REPETITIONS):
+    """Time reading a directory, optionally calling stat on every entry
+
+    os.scandir() is used so the timings are of the getdents() calls and stat calls themselves
+    without the overhead of starting a process.
+
+    Returns:
+        dict: statistics of the time taken to read the entire directory.
+    """
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if with_stat:
+                    entry.stat(follow_symlinks=False)
+        times.append(time.perf_counter() - start)
+    return get_percentiles(times)
+
+
+def time_metadata_ops(parent, count):
+    """Time individual create, lookup, rename and unlink operations
+
+    Args:
+        parent (str): directory to operate in, which should not exist
+        count (int): number of files to operate on
+
+    Returns:
+        dict: statistics of the per-operation latency for each phase.
+    """
+    if os.path.exists(parent):
+        # Left over from an interrupted run.
+        for fname in os.listdir(parent):
+            os.unlink(join(parent, fname))
+        os.rmdir(parent)
+    os.mkdir(parent)
+    names = [join(parent, str(idx)) for idx in range(count)]
+    new_names = [join(parent, f'{idx}.renamed') for idx in range(count)]
+
+    def _create(name):
+        os.close(os.open(name, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+
+    phases = (('create', _create, names),
+              ('lookup', os.stat, names),
+              ('rename', lambda name: os.rename(name, f'{name}.renamed'), names),
+              ('unlink', os.unlink, new_names))
+
+    results = {}
+    for (phase, func, items) in phases:
+        times = []
+        for item in items:
+            start = time.perf_counter()
+            func(item)
+            times.append(time.perf_counter() - start)
+        results[phase] = get_percentiles(times)
+    os.rmdir(parent)
+    return results
+
+
+def compare_perf_results(results, baseline, threshold=PERF_THRESHOLD):
+    """Compare metadata benchmark results against a baseline
+
+    Args:
+        results (dict): results from check_readdir_perf()
+        baseline (dict): results from a previous run
+        threshold (float): fractional increase in the median which is considered a regression
+
+    Returns:
+        list: a description of each regression found.
+    """
+    regressions = []
+    for (count, phases) in results['results'].items():
+        base_phases = baseline.get('results', {}).get(count, {})
+        for (phase, stats) in phases.items():
+            base_stats = base_phases.get(phase)
+            if not isinstance(stats, dict) or not isinstance(base_stats, dict):
+                continue
+            if stats['p50'] > base_stats['p50'] * (1 + threshold):
+                regressions.append(f"{phase} with {count} entries: median "
+                                   f"{stats['p50'] * 1000:.3f}ms, baseline "
+                                   f"{base_stats['p50'] * 1000:.3f}ms")
+    return regressions
+
+
+def check_readdir_perf(server, conf):
+    """Check and report on readdir and metadata performance
+
+    Loop over number of files, measuring the time taken to populate a directory, and to read
+    the directory contents, measure both files and directories as contents, and readdir both
+    with and without stat.  Readdir is repeated a number of times on an uncached dfuse instance,
+    then timed twice with caching enabled to show the effect of populating the cache, and
+    reading from the cache.  The latency of individual create, lookup, rename and unlink calls is
+    also measured for each directory size.
+
+    Directories are populated in parallel, and kept in a labelled container so that later runs
+    against the same pool only need to populate sizes which have not been created before.
+
+    Continue testing until five minutes have passed, print a table of median times, save the
+    results to a JSON file and if a baseline is given then report any regressions against it.
+    """
+    results = {'timestamp': time.time(),
+               'repetitions': PERF_REPETITIONS,
+               'results': {}}
+
+    def make_dirs(parent, count):
+        """Populate the test directories, unless they exist from a previous run"""
+        print(f'Populating to {count}')
+        row = {'create_dirs': None, 'create_files': None}
+
+        for (name, create) in (('dirs', os.mkdir), ('files', create_file)):
+            t_dir = join(parent, f'{name}.{count}')
+            if os.path.exists(t_dir):
+                print(f'Re-using {count} {name} from a previous run')
+                continue
+            in_dir = f'{t_dir}.in'
             try:
-                os.mkdir(file_dir)
+                os.mkdir(in_dir)
             except FileExistsError:
                 pass
             start = time.time()
-            for idx in range(count):
-                with open(join(file_dir, str(idx)), 'w'):
-                    pass
-            file_time = time.time() - start
-            print(f'Creating {count} files took {file_time:.2f}')
-            os.rename(file_dir, t_file)
+            populate_dir(in_dir, count, create)
+            elapsed = time.time() - start
+            print(f'Creating {count} {name} took {elapsed:.2f}')
+            row[f'create_{name}'] = elapsed
+            # The directory is only renamed once complete, so its presence marks it as usable.
+            os.rename(in_dir, t_dir)
 
-        return [dir_time, file_time]
+        return row
 
     def print_results():
-        """Display the results"""
-        print(tabulate.tabulate(results, headers=headers, floatfmt=".2f"))
+        """Display the median time of each phase, in milliseconds"""
+        phases = []
+        for row in results['results'].values():
+            for (phase, stats) in row.items():
+                if isinstance(stats, dict) and phase not in phases:
+                    phases.append(phase)
+        headers = ['count'] + [phase.replace('_', '\n') for phase in phases]
+        table = []
+        for (count, row) in results['results'].items():
+            table.append([count] + [row[phase]['p50'] * 1000 if phase in row else None
+                                    for phase in phases])
+        print('Median times in milliseconds')
+        print(tabulate.tabulate(table, headers=headers, floatfmt=".3f"))
 
     pool = server.get_test_pool()
 
-    container = str(uuid.uuid4())
+    if conf.args.perf_no_cache:
+        container = str(uuid.uuid4())
+    else:
+        container = PERF_CONTAINER
 
     dfuse = DFuse(server, conf, pool=pool)
 
@@ -3741,100 +4427,79 @@ def check_readdir_perf(server, conf):
     try:
         os.mkdir(parent)
     except FileExistsError:
-        pass
-    create_times = make_dirs(parent, count)
+        print(f'Re-using container {container}')
     dfuse.stop()
 
+    # The uncached instance is used for all populating and metadata timings, and is only
+    # restarted for the cached measurements.
+    dfuse = DFuse(server, conf, pool=pool, container=container, caching=False)
+    dfuse.start()
+
     all_start = time.time()
 
     while True:
 
-        row = [count]
-        row.extend(create_times)
-        dfuse = DFuse(server, conf, pool=pool, container=container,
-                      caching=False)
+        row = make_dirs(dfuse.dir, count)
         dir_dir = join(dfuse.dir, f'dirs.{count}')
         file_dir = join(dfuse.dir, f'files.{count}')
-        dfuse.start()
-        start = time.time()
-        subprocess.run(['/bin/ls', dir_dir], stdout=subprocess.PIPE, check=True)
-        elapsed = time.time() - start
-        print(f'processed {count} dirs in {elapsed:.2f} seconds')
-        row.append(elapsed)
-        dfuse.stop()
-        dfuse = DFuse(server, conf, pool=pool, container=container,
-                      caching=False)
-        dfuse.start()
-        start = time.time()
-        subprocess.run(['/bin/ls', file_dir], stdout=subprocess.PIPE,
-                       check=True)
-        elapsed = time.time() - start
-        print(f'processed {count} dirs in {elapsed:.2f} seconds')
-        row.append(elapsed)
-        dfuse.stop()
 
-        dfuse = DFuse(server, conf, pool=pool, container=container,
-                      caching=False)
-        dfuse.start()
-        start = time.time()
-        subprocess.run(['/bin/ls', '-t', dir_dir], stdout=subprocess.PIPE,
-                       check=True)
-        elapsed = time.time() - start
-        print(f'processed {count} dirs in {elapsed:.2f} seconds')
-        row.append(elapsed)
-        dfuse.stop()
-        dfuse = DFuse(server, conf, pool=pool, container=container,
-                      caching=False)
-        dfuse.start()
-        start = time.time()
-        # Use sort by time here so ls calls stat, if you run ls -l then it will
-        # also call getxattr twice which skews the figures.
-        subprocess.run(['/bin/ls', '-t', file_dir], stdout=subprocess.PIPE,
-                       check=True)
-        elapsed = time.time() - start
-        print(f'processed {count} dirs in {elapsed:.2f} seconds')
-        row.append(elapsed)
-        dfuse.stop()
+        row['readdir_dirs'] = time_readdir(dir_dir)
+        row['readdir_files'] = time_readdir(file_dir)
+        row['readdir_stat_dirs'] = time_readdir(dir_dir, with_stat=True)
+        row['readdir_stat_files'] = time_readdir(file_dir, with_stat=True)
+        row.update(time_metadata_ops(join(dfuse.dir, f'ops.{count}'), count))
+        print(f"processed {count} files in {row['readdir_stat_files']['p50']:.2f} seconds")
 
         # Test with caching enabled.  Check the file directory, and do it twice
         # without restarting, to see the effect of populating the cache, and
         # reading from the cache.
-        dfuse = DFuse(server,
-                      conf,
-                      pool=pool,
-                      container=container,
-                      caching=True)
-        dfuse.start()
-        start = time.time()
-        subprocess.run(['/bin/ls', '-t', file_dir], stdout=subprocess.PIPE,
-                       check=True)
-        elapsed = time.time() - start
-        print(f'processed {count} dirs in {elapsed:.2f} seconds')
-        row.append(elapsed)
-        start = time.time()
-        subprocess.run(['/bin/ls', '-t', file_dir], stdout=subprocess.PIPE,
-                       check=True)
-        elapsed = time.time() - start
-        print(f'processed {count} dirs in {elapsed:.2f} seconds')
-        row.append(elapsed)
-        results.append(row)
+        cached_dfuse = DFuse(server,
+                             conf,
+                             pool=pool,
+                             container=container,
+                             caching=True)
+        cached_dfuse.start()
+        cached_dir = join(cached_dfuse.dir, f'files.{count}')
+        row['cached_first'] = time_readdir(cached_dir, with_stat=True, repetitions=1)
+        row['cached_second'] = time_readdir(cached_dir, with_stat=True, repetitions=1)
+        cached_dfuse.stop()
+
+        results['results'][str(count)] = row
 
         elapsed = time.time() - all_start
-        if elapsed > 5 * 60:
-            dfuse.stop()
+        if elapsed > PERF_TIME_LIMIT:
             break
 
         print_results()
         count *= 2
-        create_times = make_dirs(dfuse.dir, count)
-        dfuse.stop()
 
-    run_daos_cmd(conf, ['container',
-                        'destroy',
-                        pool,
-                        container])
+    dfuse.stop()
+
+    if conf.args.perf_no_cache:
+        run_daos_cmd(conf, ['container',
+                            'destroy',
+                            pool,
+                            container])
     print_results()
 
+    output = conf.args.perf_output
+    with open(output, 'w') as fd:
+        json.dump(results, fd, indent=2)
+    print(f'Saved metadata benchmark results to {output}')
+
+    if not conf.args.perf_baseline:
+        return
+
+    with open(conf.args.perf_baseline, 'r') as fd:
+        baseline = json.load(fd)
+    regressions = compare_perf_results(results, baseline, conf.args.perf_threshold)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    if regressions:
+        conf.wf.add_test_case('metadata_perf', failure='\n'.join(regressions), test_class='perf')
+    else:
+        conf.wf.add_test_case('metadata_perf', test_class='perf')
+
 
 def test_pydaos_kv(server, conf):
     """Test the KV interface"""
@@ -3920,6 +4585,116 @@ def test_pydaos_kv(server, conf):
 #
 
 
+# Memory to leave free on the node when deciding whether to start more fault injection tests.
+FI_MIN_MEM_AVAILABLE = 2 * 1024 * 1024 * 1024
+
+# Maximum time to block waiting for a fault injection test before re-checking node load.
+FI_WAIT_TIMEOUT = 10
+
+
+def get_mem_info():
+    """Return memory usage of the node from /proc/meminfo
+
+    Returns:
+        dict: memory values in bytes, or None if they could not be read.
+    """
+    mem_info = {}
+    try:
+        with open('/proc/meminfo', 'r') as fd:
+            for line in fd:
+                fields = line.split()
+                if len(fields) == 3 and fields[2] == 'kB':
+                    mem_info[fields[0].rstrip(':')] = int(fields[1]) * 1024
+    except OSError:
+        return None
+    if 'MemTotal' not in mem_info or 'MemAvailable' not in mem_info:
+        return None
+    return mem_info
+
+
+def get_build_hash(conf):
+    """Return a hash of the installed DAOS binaries and libraries
+
+    Used to detect if fault injection results recorded previously are still valid.
+    """
+    hasher = hashlib.sha256()
+    for sub_dir in ('bin', 'lib64'):
+        dir_name = join(conf['PREFIX'], sub_dir)
+        if not os.path.isdir(dir_name):
+            continue
+        for fname in sorted(os.listdir(dir_name)):
+            full_path = join(dir_name, fname)
+            if os.path.islink(full_path) or not os.path.isfile(full_path):
+                continue
+            hasher.update(fname.encode('utf-8'))
+            with open(full_path, 'rb') as fd:
+                for block in iter(functools.partial(fd.read, 1024 * 1024), b''):
+                    hasher.update(block)
+    return hasher.hexdigest()
+
+
+class FaultInjectionJournal():
+    """Record of fault injection results
+
+    Each result is appended to the journal file as a line of JSON as soon as it is known, so the
+    journal is valid even if the run is interrupted.  Journals from different shards can be merged
+    by concatenating the files.  Locations which have passed against the same build are skipped
+    when the journal is re-used.
+    """
+
+    def __init__(self, filename, build_hash, shard=None):
+        self.filename = filename
+        self.build_hash = build_hash
+        self.shard = shard
+        self._passed = {}
+        self.skipped = 0
+        self._load()
+
+    def _load(self):
+        """Load the results for this build from an existing journal"""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r') as fd:
+            for line in fd:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line may be incomplete if a previous run was killed.
+                    continue
+                if entry.get('build') != self.build_hash:
+                    continue
+                passed = self._passed.setdefault(entry['test'], set())
+                if entry['status'] == 'pass':
+                    passed.add(entry['fid'])
+                else:
+                    passed.discard(entry['fid'])
+        print(f'Loaded {sum(len(fids) for fids in self._passed.values())} passing fault '
+              f'injection locations from {self.filename}')
+
+    def has_passed(self, test, fid):
+        """Return True if the location has previously passed for this build"""
+        return fid in self._passed.get(test, ())
+
+    def add(self, test, fid, status):
+        """Append a result to the journal
+
+        Args:
+            test (str): description of the fault injection test
+            fid (int): fault injection location
+            status (str): one of 'pass', 'fail' or 'no_fault'
+        """
+        entry = {'test': test,
+                 'fid': fid,
+                 'status': status,
+                 'build': self.build_hash,
+                 'shard': self.shard,
+                 'time': time.time()}
+        with open(self.filename, 'a') as fd:
+            fd.write(json.dumps(entry) + '\n')
+        if status == 'pass':
+            self._passed.setdefault(test, set()).add(fid)
+
+
 class AllocFailTestRun():
     """Class to run a fault injection command with a single fault"""
 
@@ -3944,6 +4719,10 @@ class AllocFailTestRun():
         self.fi_loc = None
         self.fault_injected = None
         self.loc = loc
+        # Number of issues reported against this run.
+        self.issues = None
+        # File descriptor for the process, used to wait for completion.
+        self.pidfd = None
 
         if loc:
             prefix = f'dnt_{loc:04d}_'
@@ -4011,6 +4790,23 @@ class AllocFailTestRun():
                                     stdout=subprocess.PIPE,
                                     stderr=subprocess.PIPE)
 
+        # A pidfd becomes readable when the process exits, which allows the caller to block
+        # until any of a number of tests complete.  Not all kernels/pythons support this.
+        if hasattr(os, 'pidfd_open'):
+            try:
+                self.pidfd = os.pidfd_open(self._sp.pid)
+            except OSError:
+                self.pidfd = None
+
+    def kill(self):
+        """Kill the command if it's still running, without checking the result"""
+        if self.returncode is None:
+            self._sp.kill()
+            self._sp.wait()
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
+
     def has_finished(self):
         """Check if the command has completed"""
         if self.returncode is not None:
@@ -4029,8 +4825,19 @@ class AllocFailTestRun():
 
         self._post(self._sp.wait())
 
+    def _get_issue_count(self):
+        """Return the number of issues reported so far against the test"""
+        wfs = {id(self.aft.wf): self.aft.wf, id(self.aft.conf.wf): self.aft.conf.wf}
+        return sum(len(wf.issues) for wf in wfs.values())
+
     def _post(self, rc):
-        """Helper function, called once after command is complete.
+        """Helper function, called once after command is complete."""
+        issues = self._get_issue_count()
+        self._check_result(rc)
+        self.issues = self._get_issue_count() - issues
+
+    def _check_result(self, rc):
+        """Check the result of the command.
 
         This is where all the checks are performed.
         """
@@ -4040,6 +4847,9 @@ class AllocFailTestRun():
         # Put in a new-line.
         print()
         self.returncode = rc
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
         self.stdout = self._sp.stdout.read()
         self.stderr = self._sp.stderr.read()
 
@@ -4168,6 +4978,16 @@ class AllocFailTest():
         self.wf = conf.wf
         # Instruct the fault injection code to skip daos_init().
         self.skip_daos_init = True
+        # First fault injection location to test, allows resuming an interrupted run.
+        self.start_fid = 2
+        if conf.args and conf.args.fi_start:
+            self.start_fid = conf.args.fi_start.get(desc, self.start_fid)
+        # Split the fault injection locations across shards as (index, count), where this shard
+        # tests every count'th location starting from index.
+        self.shard = (1, 1)
+        if conf.args and conf.args.fi_shard:
+            self.shard = conf.args.fi_shard
+        self.journal = conf.fi_journal
         log_dir = f'dnt_fi_{self.description}_logs'
         if conf.tmp_dir:
             self.log_dir = join(conf.tmp_dir, log_dir)
@@ -4197,15 +5017,12 @@ class AllocFailTest():
         # pylint: disable-next=no-member
         num_cores = len(os.sched_getaffinity(0))
 
-        if num_cores < 20:
-            max_child = 1
-        else:
-            max_child = int(num_cores / 4 * 3)
-
-        print(f'Maximum number of spawned tests will be {max_child}')
+        print(f'Maximum number of spawned tests will be {self._get_max_child(num_cores, 0)}')
 
         active = []
-        fid = 2
+        (shard_index, shard_count) = self.shard
+        fid = self.start_fid
+        fid += (shard_index - 1 - (fid - 2)) % shard_count
         max_count = 0
         finished = False
 
@@ -4214,37 +5031,70 @@ class AllocFailTest():
 
         fatal_errors = False
 
+        if shard_count > 1:
+            print(f'Testing shard {shard_index} of {shard_count}')
+        if fid != 2:
+            print(f'Resuming from fault injection location {fid}')
+
+        sel = selectors.DefaultSelector()
+
         # Now run all iterations in parallel up to max_child.  Iterations will be launched
         # in order but may not finish in order, rather they are processed in the order they
         # finish.  After each repetition completes then check for re-launch new processes
         # to keep the pipeline full.
-        while not finished or active:
-
-            if not finished:
-                while len(active) < max_child:
-                    active.append(self._run_cmd(fid))
-                    fid += 1
-
-                    if len(active) > max_count:
-                        max_count = len(active)
-
-            # Now complete as many as have finished.
+        try:
+            while not finished or active:
+
+                if not finished:
+                    max_child = self._get_max_child(num_cores, len(active))
+                    while len(active) < max_child:
+                        if self.journal and self.journal.has_passed(self.description, fid):
+                            self.journal.skipped += 1
+                            fid += shard_count
+                            continue
+                        ret = self._run_cmd(fid)
+                        active.append(ret)
+                        if ret.pidfd is not None:
+                            sel.register(ret.pidfd, selectors.EVENT_READ, ret)
+                        fid += shard_count
+
+                        if len(active) > max_count:
+                            max_count = len(active)
+
+                # Now complete as many as have finished.
+                for ret in self._wait_for_children(sel, active):
+                    active.remove(ret)
+                    print(ret)
+                    if ret.returncode < 0:
+                        fatal_errors = True
+                        to_rerun.append(ret.loc)
+
+                    if self.journal:
+                        if not ret.fault_injected:
+                            status = 'no_fault'
+                        elif ret.returncode < 0 or ret.issues:
+                            status = 'fail'
+                        else:
+                            status = 'pass'
+                        self.journal.add(self.description, ret.loc, status)
+
+                    if not ret.fault_injected:
+                        print('Fault injection did not trigger, stopping')
+                        finished = True
+        except KeyboardInterrupt:
+            resume_fid = min([ret.loc for ret in active] + [fid])
             for ret in active:
-                if not ret.has_finished():
-                    continue
-                active.remove(ret)
-                print(ret)
-                if ret.returncode < 0:
-                    fatal_errors = True
-                    to_rerun.append(ret.loc)
-
-                if not ret.fault_injected:
-                    print('Fault injection did not trigger, stopping')
-                    finished = True
-                break
+                ret.kill()
+            print(f'Interrupted, resume with --fi-start {self.description}={resume_fid}')
+            raise
+        finally:
+            sel.close()
 
         print(f'Completed, fid {fid}')
         print(f'Max in flight {max_count}')
+        if self.journal and self.journal.skipped:
+            print(f'Skipped {self.journal.skipped} locations which passed previously')
+            self.journal.skipped = 0
         if to_rerun:
             print(f'Number of indexes to re-run {len(to_rerun)}')
 
@@ -4255,6 +5105,57 @@ class AllocFailTest():
 
         return fatal_errors
 
+    @staticmethod
+    def _get_max_child(num_cores, in_flight):
+        """Return the number of tests that should be running concurrently.
+
+        The limit tracks the spare capacity of the node rather than being fixed, so that idle
+        nodes are used fully but fewer tests are started if the node is loaded or short of memory.
+        The load average lags behind starting processes, so tests already in flight are assumed
+        to account for at least that much load.
+        """
+        limit = max(1, int(num_cores / 4 * 3))
+
+        try:
+            load = os.getloadavg()[0]
+        except OSError:
+            return limit
+
+        target = in_flight + int(num_cores - max(load, in_flight))
+
+        mem_info = get_mem_info()
+        if mem_info:
+            reserve = max(FI_MIN_MEM_AVAILABLE, mem_info['MemTotal'] / 10)
+            if mem_info['MemAvailable'] < reserve:
+                target = min(target, in_flight)
+
+        return max(1, min(limit, target))
+
+    @staticmethod
+    def _wait_for_children(sel, active):
+        """Wait for at least one of the active tests to complete.
+
+        Block on the process file descriptors if they are available, otherwise fall back to
+        polling with a short delay.
+
+        Returns:
+            list: the tests which have completed.
+        """
+        if all(ret.pidfd is not None for ret in active):
+            for key, _ in sel.select(timeout=FI_WAIT_TIMEOUT):
+                sel.unregister(key.fileobj)
+        else:
+            time.sleep(0.1)
+
+        completed = []
+        for ret in active:
+            # Tests still registered with the selector have not signalled completion.
+            if ret.pidfd is not None and ret.pidfd in sel.get_map():
+                continue
+            if ret.has_finished():
+                completed.append(ret)
+        return completed
+
     def _run_cmd(self, loc, valgrind=False):
         """Run the test with fault injection enabled"""
         cmd_env = get_base_env()
@@ -4638,6 +5539,17 @@ def run(wf, args):
     conf.set_args(args)
     setup_log_test(conf)
 
+    if args.fi_journal:
+        conf.fi_journal = FaultInjectionJournal(args.fi_journal, get_build_hash(conf),
+                                                shard=args.fi_shard)
+
+    if args.log_check_jobs:
+        conf.log_checker = LogCheckService(conf, args.log_check_jobs)
+
+    if args.memcheck_sample < 1 or args.memcheck_state:
+        conf.valgrind_selector = ValgrindSelector(conf, sample=args.memcheck_sample,
+                                                  state_file=args.memcheck_state)
+
     fi_test = False
     fi_test_dfuse = False
 
@@ -4757,8 +5669,14 @@ def run(wf, args):
         wf.add_test_case('Errors', 'Valgrind errors encountered')
         print("Valgrind errors detected during execution")
 
+    if conf.log_checker:
+        fatal_errors.add_result(conf.log_checker.close())
+
     wf_server.close()
     conf.flush_bz2()
+    conf.flush_valgrind_xml()
+    if conf.valgrind_selector:
+        conf.valgrind_selector.save()
     print(f'Total time in log analysis: {conf.log_timer.total:.2f} seconds')
     print(f'Total time in log compression: {conf.compress_timer.total:.2f} seconds')
     return fatal_errors
@@ -4775,15 +5693,44 @@ def main():
     parser.add_argument('--dfuse-debug', default=None)
     parser.add_argument('--class-name', default=None, help='class name to use for junit')
     parser.add_argument('--memcheck', default='some', choices=['yes', 'no', 'some'])
+    parser.add_argument('--memcheck-sample', type=float, default=1.0,
+                        help='Fraction of daos and dfuse invocations to run under valgrind')
+    parser.add_argument('--memcheck-state', default=None,
+                        help='File recording binaries with no valgrind errors, only binaries '
+                             'which have changed since are run under valgrind')
     parser.add_argument('--server-valgrind', action='store_true')
     parser.add_argument('--multi-user', action='store_true')
     parser.add_argument('--no-root', action='store_true')
     parser.add_argument('--max-log-size', default=None)
+    parser.add_argument('--log-check-jobs', type=int, default=0,
+                        help='Number of processes to check logs in the background, by default '
+                             'each log is checked as it is produced')
     parser.add_argument('--engine-count', type=int, default=1, help='Number of daos engines to run')
     parser.add_argument('--dfuse-dir', default='/tmp', help='parent directory for all dfuse mounts')
     parser.add_argument('--perf-check', action='store_true')
+    parser.add_argument('--perf-output', default='nlt-perf.json',
+                        help='File to save the --perf-check results to')
+    parser.add_argument('--perf-baseline', default=None,
+                        help='Results of a previous --perf-check run to compare against')
+    parser.add_argument('--perf-threshold', type=float, default=PERF_THRESHOLD,
+                        help='Fractional increase in median latency to report as a regression')
+    parser.add_argument('--perf-no-cache', action='store_true',
+                        help='Populate a new container for --perf-check rather than re-using one')
     parser.add_argument('--dtx', action='store_true')
     parser.add_argument('--test', help="Use '--test list' for list")
+    parser.add_argument('--test-durations', default=join('nlt_logs', 'nlt-test-durations.json'),
+                        help='File to record posix test durations in, used to order tests')
+    parser.add_argument('--posix-workers', type=int, default=5,
+                        help='Number of posix tests to run in parallel')
+    parser.add_argument('--shared-dfuse', action='store_true',
+                        help='Run posix tests in directories of shared dfuse instances')
+    parser.add_argument('--fi-start', action='append', metavar='TEST=FID',
+                        help='Fault injection location to resume the named test from')
+    parser.add_argument('--fi-shard', metavar='I/N',
+                        help='Only test every Nth fault injection location, starting from the Ith')
+    parser.add_argument('--fi-journal', default=None,
+                        help='File to record fault injection results in, locations which passed '
+                             'previously against the same build are skipped')
     parser.add_argument('mode', nargs='*')
     args = parser.parse_args()
 
@@ -4802,6 +5749,31 @@ def main():
         print('Cannot use mode and test')
         sys.exit(1)
 
+    if args.fi_start:
+        fi_start = {}
+        for resume in args.fi_start:
+            try:
+                (desc, fid) = resume.rsplit('=', 1)
+                fi_start[desc] = int(fid)
+            except ValueError:
+                print(f'Invalid --fi-start value {resume}, expected TEST=FID')
+                sys.exit(1)
+        args.fi_start = fi_start
+
+    if args.fi_shard:
+        try:
+            (index, count) = args.fi_shard.split('/')
+            args.fi_shard = (int(index), int(count))
+        except ValueError:
+            args.fi_shard = None
+        if not args.fi_shard or not 1 <= args.fi_shard[0] <= args.fi_shard[1]:
+            print('Invalid --fi-shard value, expected I/N with 1 <= I <= N')
+            sys.exit(1)
+
+    if args.posix_workers < 1:
+        print('Invalid --posix-workers value, expected at least 1')
+        sys.exit(1)
+
     if args.test == 'list':
         tests = []
         for method in dir(PosixTests):